@@ -1,7 +1,61 @@
+import fs from "fs";
+import path from "path";
 import type { NextConfig } from "next";
 
+// 分包旁邊有預先壓縮好的 .gz（一定有）與 .br（建置環境裝了 brotli 才有），
+// 依 Accept-Encoding 改送壓縮檔並加上 Content-Encoding，瀏覽器 fetch 時會自動解壓
+const BANK_CHUNK = "/bank/:hash([0-9a-f]{16}).json";
+
+function bankHasBrotli(): boolean {
+  try {
+    const manifest = JSON.parse(fs.readFileSync(path.join(process.cwd(), "public", "bank", "manifest.json"), "utf-8"));
+    return manifest.chunks.length > 0 && manifest.chunks.every((c: { brotliBytes?: number }) => c.brotliBytes);
+  } catch {
+    return false;
+  }
+}
+
+const encodings = [...(bankHasBrotli() ? [{ name: "br", ext: "br" }] : []), { name: "gzip", ext: "gz" }];
+
 const nextConfig: NextConfig = {
-  /* config options here */
+  // 題庫分包檔名是內容雜湊（scripts/build-bank-bundles.py），內容不變檔名就不變，可永久快取
+  async headers() {
+    return [
+      {
+        source: "/bank/:file([0-9a-f]{16}\\.json.*)",
+        headers: [{ key: "Cache-Control", value: "public, max-age=31536000, immutable" }],
+      },
+      {
+        source: "/bank/manifest.json",
+        headers: [{ key: "Cache-Control", value: "public, max-age=0, must-revalidate" }],
+      },
+      {
+        source: BANK_CHUNK,
+        headers: [{ key: "Vary", value: "Accept-Encoding" }],
+      },
+      // 後面的規則覆蓋前面的：同時接受 br 與 gzip 時標成 br，與下方 rewrites 的優先順序一致
+      ...[...encodings].reverse().map(({ name }) => ({
+        source: BANK_CHUNK,
+        has: [{ type: "header" as const, key: "accept-encoding", value: `.*\\b${name}\\b.*` }],
+        headers: [
+          { key: "Content-Encoding", value: name },
+          { key: "Content-Type", value: "application/json; charset=utf-8" },
+        ],
+      })),
+    ];
+  },
+  async rewrites() {
+    return {
+      // 在讀取 public/ 之前改寫，否則會直接送出未壓縮的 .json
+      beforeFiles: encodings.map(({ name, ext }) => ({
+        source: BANK_CHUNK,
+        has: [{ type: "header" as const, key: "accept-encoding", value: `.*\\b${name}\\b.*` }],
+        destination: `/bank/:hash.json.${ext}`,
+      })),
+      afterFiles: [],
+      fallback: [],
+    };
+  },
 };
 
 export default nextConfig;
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+答題記錄分析 - 串流讀取 answers 表匯出檔，計算每題正確率與作答時間
+
+用法：
+  python3 scripts/analyze-answers.py answers.csv
+  python3 scripts/analyze-answers.py answers.jsonl --users-output user-stats.jsonl
+  python3 scripts/analyze-answers.py export.db --table answers
+
+作答時間以「秒」為單位（answers.time_spent），每題只保留時間直方圖，
+因此中位數 / P90 為精確值，記憶體只跟題數有關，跟答題筆數無關。
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter, defaultdict
+
+from bank_io import SCRIPTS_DIR, load_bank
+from export_reader import DEFAULT_CHUNK_SIZE, iter_chunks, to_bool, to_int
+
+# 超過此秒數的作答時間視為掛機，以上限計入
+MAX_TIME_SPENT = 3600
+
+
+def quantile(hist, q):
+    """由 {秒數: 次數} 直方圖取分位數（nearest-rank）"""
+    total = sum(hist.values())
+    if total == 0:
+        return None
+    rank = max(1, -(-total * q // 1))  # ceil(total * q)
+    seen = 0
+    for t in sorted(hist):
+        seen += hist[t]
+        if seen >= rank:
+            return t
+    return None
+
+
+class Rollup:
+    """單一分組的累計：答題數、答對數、時間直方圖"""
+
+    __slots__ = ("answered", "correct", "times")
+
+    def __init__(self):
+        self.answered = 0
+        self.correct = 0
+        self.times = Counter()
+
+    def to_dict(self):
+        return {
+            "answered": self.answered,
+            "correct": self.correct,
+            "accuracy": round(self.correct / self.answered * 100, 1) if self.answered else 0,
+            "medianTime": quantile(self.times, 0.5),
+            "p90Time": quantile(self.times, 0.9),
+        }
+
+
+def aggregate_chunk(chunk):
+    """先在批次內分組計數，再一次合併回總表（減少逐列更新大字典的次數）"""
+    by_question = Counter()
+    correct_by_question = Counter()
+    times_by_question = defaultdict(Counter)
+    by_user = Counter()
+    correct_by_user = Counter()
+    time_by_user = Counter()
+
+    for row in chunk:
+        qid = row.get("question_id")
+        if not qid:
+            continue
+        user = row.get("user_id") or ""
+        ok = to_bool(row.get("is_correct"))
+        spent = min(to_int(row.get("time_spent")), MAX_TIME_SPENT)
+
+        by_question[qid] += 1
+        times_by_question[qid][spent] += 1
+        by_user[user] += 1
+        time_by_user[user] += spent
+        if ok:
+            correct_by_question[qid] += 1
+            correct_by_user[user] += 1
+
+    return by_question, correct_by_question, times_by_question, by_user, correct_by_user, time_by_user
+
+
+def analyze(path, table="answers", chunk_size=DEFAULT_CHUNK_SIZE):
+    categories = {q["id"]: q.get("category", "未分類") for q in load_bank()}
+
+    questions = defaultdict(Rollup)
+    category_stats = defaultdict(Rollup)
+    users = defaultdict(lambda: [0, 0, 0])  # 答題數, 答對數, 總秒數
+    total = 0
+
+    for chunk in iter_chunks(path, table, chunk_size):
+        total += len(chunk)
+        by_q, correct_q, times_q, by_u, correct_u, time_u = aggregate_chunk(chunk)
+
+        for qid, n in by_q.items():
+            cat = categories.get(qid, "未知題目")
+            for r in (questions[qid], category_stats[cat]):
+                r.answered += n
+                r.correct += correct_q[qid]
+                r.times.update(times_q[qid])
+
+        for user, n in by_u.items():
+            u = users[user]
+            u[0] += n
+            u[1] += correct_u[user]
+            u[2] += time_u[user]
+
+        print(f"  已處理 {total:,} 筆...")
+
+    return total, questions, category_stats, users
+
+
+def main():
+    parser = argparse.ArgumentParser(description="串流分析 answers 表匯出檔")
+    parser.add_argument("input", help="answers 匯出檔（.csv / .jsonl / .db）")
+    parser.add_argument("--table", default="answers", help="SQLite 表名（預設 answers）")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--output", default=os.path.join(SCRIPTS_DIR, "answer-stats.json"))
+    parser.add_argument("--users-output", help="每位使用者統計（JSONL，可選）")
+    args = parser.parse_args()
+
+    started = time.time()
+    print(f"讀取 {args.input}...")
+    total, questions, category_stats, users = analyze(args.input, args.table, args.chunk_size)
+
+    report = {
+        "generatedAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source": os.path.basename(args.input),
+        "totalAnswers": total,
+        "totalUsers": len(users),
+        "questions": {qid: r.to_dict() for qid, r in sorted(questions.items())},
+        "categories": {cat: r.to_dict() for cat, r in sorted(category_stats.items(), key=lambda x: -x[1].answered)},
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.users_output:
+        with open(args.users_output, "w", encoding="utf-8") as f:
+            for user, (n, correct, spent) in users.items():
+                f.write(json.dumps({
+                    "userId": user,
+                    "answered": n,
+                    "correct": correct,
+                    "accuracy": round(correct / n * 100, 1),
+                    "avgTime": round(spent / n, 1),
+                }, ensure_ascii=False) + "\n")
+
+    print(f"\n總答題數: {total:,}")
+    print(f"題目數: {len(questions)}，使用者數: {len(users)}")
+    print("\n正確率最低的題型:")
+    for cat, r in sorted(category_stats.items(), key=lambda x: x[1].correct / x[1].answered)[:10]:
+        d = r.to_dict()
+        print(f"  {cat}: {d['accuracy']}%（{r.answered} 筆，中位數 {d['medianTime']} 秒）")
+    print(f"\n已儲存到 {args.output}（{time.time() - started:.1f} 秒）")
+
+
+if __name__ == "__main__":
+    main()
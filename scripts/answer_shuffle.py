@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+生成時打亂選項順序 - 取代事後整檔重寫的 shuffle-answers.js
+
+用法（在生成腳本中，逐題套用）：
+  from answer_shuffle import AnswerShuffler
+  shuffle = AnswerShuffler(seed="ps-batch")
+  for q in generated:
+      q = shuffle(q)
+
+正確答案放在「目前被用最少次」的位置（同次數時隨機挑），
+因此一批題目中 A/B/C/D 的正確答案數最多只差 1，不會整批都是 A。
+隨機來源以 seed + 題幹為種子，同一批題目每次執行結果都相同。
+"""
+
+import random
+from collections import Counter
+
+
+class AnswerShuffler:
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.positions = Counter()
+
+    def __call__(self, question):
+        """回傳打亂後的新題目（不修改傳入的 dict，模板可重複使用）"""
+        options = question["options"]
+        answer = question["answer"]
+        n = len(options)
+        if n < 2:
+            return dict(question)
+
+        rng = random.Random(f"{self.seed}:{question.get('content', '')}")
+        least = min(self.positions[i] for i in range(n))
+        target = rng.choice([i for i in range(n) if self.positions[i] == least])
+
+        others = [o for i, o in enumerate(options) if i != answer]
+        rng.shuffle(others)
+        others.insert(target, options[answer])
+
+        self.positions[target] += 1
+        return dict(question, options=others, answer=target)
+
+    def distribution(self):
+        """各位置當正確答案的次數，如 {"A": 3, "B": 3, "C": 2, "D": 3}"""
+        return {chr(ord("A") + i): n for i, n in sorted(self.positions.items())}
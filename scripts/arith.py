@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+四則運算題自動驗算 - 解析「計算：… = ?」的算式，以分數精確求值並找出正確選項
+
+用法：
+  python3 scripts/arith.py eval "4又2/3 ÷ 1又1/6"
+  python3 scripts/arith.py check               # 驗算題庫中所有計算題
+  python3 scripts/arith.py check --templates   # 一併驗算 generate-balanced-questions.py 的模板
+  python3 scripts/arith.py check --fix         # 答案索引標錯且能唯一找到正確選項時，直接改正
+
+支援：+ - × ÷ * /、括號（含全形）、負數、絕對值 |x|、分數（3/4）、帶分數（1又5/12）、
+小數、次方（² ³ ¹⁰⁰ ^），以及「1+2+3+...+100」這類等差數列求和。
+「3/4」這類數字寫法視為一個分數（比 ÷ 優先），所以 2/3 ÷ 1/2 = 4/3。
+分數與 × ÷ 中間沒有空白、緊接著數字（如「1/2×3」）時，可能是 1/(2×3) 也可能是 (1/2)×3，
+視為無法判斷（unparsed），不據此改答案或丟題；有空白的「1/4 × 2」照一般分數處理。
+算式的語法樹與求值結果都有快取，題庫中重複出現的算式 / 選項只解析一次。
+"""
+
+import argparse
+import os
+import re
+import time
+from fractions import Fraction
+from functools import lru_cache
+
+from bank_io import BANK_FILES, data_path, load_questions, load_script, save_questions
+from numeric import format_number
+
+EXPRESSION_RE = re.compile(r"^計算[：:]?\s*(.+?)\s*[=＝]\s*[?？]")
+TOKEN_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<mixed>\d+又\d+/\d+)"
+    r"|(?P<fraction>\d+/\d+)"
+    r"|(?P<number>\d+(?:\.\d+)?)"
+    r"|(?P<power>[⁰¹²³⁴⁵⁶⁷⁸⁹]+)"
+    r"|(?P<op>[-+×÷*/^()|])"
+    r")"
+)
+NORMALIZE = str.maketrans({"（": "(", "）": ")", "−": "-", "－": "-", "＋": "+", "＊": "*", "／": "/", "·": "×"})
+# 分數緊接乘除號與數字：「1/1×2」可能是 1/(1×2)
+AMBIGUOUS_RE = re.compile(r"\d/\d+[×÷*/]\d")
+SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹", "0123456789")
+# 等差數列求和：1+2+3+...+100、1+3+5+7+...+99
+SERIES_RE = re.compile(r"^(\d+)\s*\+\s*(\d+)(?:\s*\+\s*\d+)*\s*\+\s*(?:\.{3}|…+)\s*\+\s*(\d+)$")
+
+
+def tokenize(text):
+    text = text.translate(NORMALIZE).strip()
+    ambiguous = AMBIGUOUS_RE.search(text)
+    if ambiguous:
+        raise ValueError(f"分數與乘除相連，無法判斷運算順序：{ambiguous.group()}")
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        m = TOKEN_RE.match(text, pos)
+        if not m:
+            raise ValueError(f"無法解析：{text[pos:pos + 10]}")
+        pos = m.end()
+        if m.group("mixed"):
+            whole, frac = m.group("mixed").split("又")
+            num, den = frac.split("/")
+            tokens.append(("num", int(whole) + Fraction(int(num), int(den))))
+        elif m.group("fraction"):
+            num, den = m.group("fraction").split("/")
+            tokens.append(("num", Fraction(int(num), int(den))))
+        elif m.group("number"):
+            tokens.append(("num", Fraction(m.group("number"))))
+        elif m.group("power"):
+            tokens.append(("pow", int(m.group("power").translate(SUPERSCRIPTS))))
+        else:
+            tokens.append(("op", m.group("op")))
+    return tokens
+
+
+class Parser:
+    """遞迴下降：expr = term (+|- term)*；term = unary (×|÷ unary)*；unary = -unary | power"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, op):
+        if self.peek() == ("op", op):
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self):
+        tree = self.expr()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"多餘的符號：{self.peek()[1]}")
+        return tree
+
+    def expr(self):
+        tree = self.term()
+        while True:
+            if self.take("+"):
+                tree = ("+", tree, self.term())
+            elif self.take("-"):
+                tree = ("-", tree, self.term())
+            else:
+                return tree
+
+    def term(self):
+        tree = self.unary()
+        while True:
+            if self.take("×") or self.take("*"):
+                tree = ("×", tree, self.unary())
+            elif self.take("÷") or self.take("/"):
+                tree = ("÷", tree, self.unary())
+            else:
+                return tree
+
+    def unary(self):
+        if self.take("-"):
+            return ("neg", self.unary())
+        if self.take("+"):
+            return self.unary()
+        return self.power()
+
+    def power(self):
+        tree = self.atom()
+        while True:
+            kind, value = self.peek()
+            if kind == "pow":
+                self.pos += 1
+                tree = ("^", tree, ("num", Fraction(value)))
+            elif self.take("^"):
+                tree = ("^", tree, self.unary())
+            else:
+                return tree
+
+    def atom(self):
+        kind, value = self.peek()
+        if kind == "num":
+            self.pos += 1
+            return ("num", value)
+        if self.take("("):
+            tree = self.expr()
+            if not self.take(")"):
+                raise ValueError("括號未閉合")
+            return tree
+        if self.take("|"):
+            tree = self.expr()
+            if not self.take("|"):
+                raise ValueError("絕對值符號未閉合")
+            return ("abs", tree)
+        raise ValueError(f"預期數字，遇到 {value!r}")
+
+
+def series_tree(first, second, last):
+    """等差數列 first, second, ..., last 的和（以項數 × (首項 + 末項) ÷ 2 表示）"""
+    step = second - first
+    if step <= 0 or (last - first) % step:
+        raise ValueError("不是等差數列")
+    count = (last - first) // step + 1
+    return ("÷", ("×", ("num", Fraction(count)), ("num", Fraction(first + last))), ("num", Fraction(2)))
+
+
+@lru_cache(maxsize=None)
+def parse(text):
+    """算式文字 → 語法樹（巢狀 tuple）"""
+    series = SERIES_RE.match(text.strip())
+    if series:
+        return series_tree(*map(int, series.groups()))
+    return Parser(tokenize(text)).parse()
+
+
+@lru_cache(maxsize=None)
+def evaluate_tree(tree):
+    op = tree[0]
+    if op == "num":
+        return tree[1]
+    if op == "neg":
+        return -evaluate_tree(tree[1])
+    if op == "abs":
+        return abs(evaluate_tree(tree[1]))
+    a, b = evaluate_tree(tree[1]), evaluate_tree(tree[2])
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "×":
+        return a * b
+    if op == "÷":
+        return a / b
+    if b.denominator != 1:
+        raise ValueError("只支援整數次方")
+    return a ** int(b)
+
+
+def evaluate(text):
+    """算式文字 → Fraction；無法解析或除以 0 時回傳 None"""
+    try:
+        return evaluate_tree(parse(text))
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def option_value(option):
+    """選項的數值（「2又5/8」「-22」「0.9」），忽略後面的括號說明"""
+    return evaluate(re.sub(r"\s*[（(][^)）]*[)）]\s*$", "", option)) if option else None
+
+
+def expression_of(question):
+    m = EXPRESSION_RE.match(question.get("content", ""))
+    return m.group(1) if m else None
+
+
+def check_question(q):
+    """回傳 (狀態, 正確選項索引；ambiguous 時為同值選項的索引串)；狀態：ok / wrong-answer / no-correct-option / ambiguous / unparsed / skip"""
+    expression = expression_of(q)
+    if expression is None:
+        return "skip", None
+    value = evaluate(expression)
+    if value is None:
+        return "unparsed", None
+    matches = [i for i, option in enumerate(q.get("options", [])) if option_value(option) == value]
+    if not matches:
+        return "no-correct-option", None
+    if len(matches) > 1:
+        return "ambiguous", matches
+    return ("ok" if matches[0] == q.get("answer") else "wrong-answer"), matches[0]
+
+
+def template_questions():
+    """generate-balanced-questions.py 的模板（附上年級-難度鍵當作 ID）"""
+    templates = load_script("generate-balanced-questions.py").QUESTION_TEMPLATES
+    return [
+        dict(t, id=f"template:{key}#{i}")
+        for key, items in templates.items()
+        for i, t in enumerate(items)
+    ]
+
+
+def run_check(args):
+    started = time.time()
+    sources = [(name, load_questions(data_path(name))) for name in BANK_FILES if os.path.exists(data_path(name))]
+    if args.templates:
+        sources.append(("generate-balanced-questions.py", template_questions()))
+
+    counts = {}
+    problems = []
+    for name, questions in sources:
+        fixed = 0
+        for q in questions:
+            status, located = check_question(q)
+            counts[status] = counts.get(status, 0) + 1
+            if status in ("ok", "skip"):
+                continue
+            problems.append((name, q, status, located))
+            if args.fix and status == "wrong-answer" and name in BANK_FILES:
+                q["answer"] = located
+                fixed += 1
+        if fixed:
+            save_questions(data_path(name), questions)
+            print(f"  已修正 {name} 中 {fixed} 題的答案索引")
+
+    checked = sum(n for status, n in counts.items() if status != "skip")
+    print(f"計算題 {checked} 題（{time.time() - started:.2f} 秒，不重複算式 {parse.cache_info().currsize} 個）")
+    print(f"  ✅ 正確: {counts.get('ok', 0)}")
+    print(f"  ❌ 答案索引錯誤: {counts.get('wrong-answer', 0)}")
+    print(f"  ❌ 沒有正確選項: {counts.get('no-correct-option', 0)}")
+    print(f"  ⚠️ 多個選項同值: {counts.get('ambiguous', 0)}")
+    print(f"  ⏭️ 無法解析: {counts.get('unparsed', 0)}")
+    for name, q, status, located in problems:
+        value = evaluate(expression_of(q))
+        shown = format_number(value) if value is not None else "?"
+        if status == "ambiguous":
+            hint = "，同值選項 " + "、".join(chr(ord("A") + i) for i in located)
+        elif located is not None:
+            hint = f"，正確選項 {chr(ord('A') + located)}"
+        else:
+            hint = ""
+        print(f"  [{status}] {q['id']}（{name}）{q['content']} → {shown}{hint}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="四則運算題自動驗算")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_eval = sub.add_parser("eval", help="計算一個算式")
+    p_eval.add_argument("expression")
+    p_check = sub.add_parser("check", help="驗算題庫中的計算題")
+    p_check.add_argument("--templates", action="store_true", help="一併驗算 generate-balanced-questions.py 的模板")
+    p_check.add_argument("--fix", action="store_true", help="把標錯的答案索引改成正確選項")
+    args = parser.parse_args()
+
+    if args.command == "eval":
+        value = evaluate(args.expression)
+        print("無法解析" if value is None else format_number(value))
+        return
+    run_check(args)
+
+
+if __name__ == "__main__":
+    main()
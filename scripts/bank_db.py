@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+題庫 SQLite 索引 - 把所有題庫檔同步成一個有索引的 SQLite 資料庫，統計與查詢不必每次重讀 JSON
+
+用法：
+  python3 scripts/bank_db.py sync                                   # 增量同步到 scripts/bank.db
+  python3 scripts/bank_db.py count --grade 6 --difficulty hard --category 濃度問題 --no-explanation
+  python3 scripts/bank_db.py search 鹽水濃度 --grade 6
+  python3 scripts/bank_db.py report                                 # qa-analysis.py 的統計，改用索引查詢
+  python3 scripts/bank_db.py sql "SELECT source, COUNT(*) FROM questions GROUP BY source"
+
+在其他腳本中：
+  from bank_db import connect
+  conn = connect()          # 會先增量同步
+  conn.execute("SELECT id FROM questions WHERE grade = 6 AND category = ?", ("濃度問題",))
+
+同步方式：檔案的修改時間與大小沒變就整個略過；有變時逐題比對雜湊，只更新 / 刪除變動的題目。
+content / explanation 的全文索引是 FTS5（trigram 斷詞，外部內容表），由觸發器跟著 questions 表更新；
+SQLite 沒有 FTS5 時不建全文索引，search 改用 LIKE。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from bank_io import BANK_FILES, SCRIPTS_DIR, data_path, load_questions
+
+DB_PATH = os.path.join(SCRIPTS_DIR, "bank.db")
+# trigram 斷詞至少要 3 個字才能用 MATCH，較短的詞改用 LIKE
+FTS_MIN_QUERY = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+  id TEXT PRIMARY KEY,
+  file TEXT NOT NULL,
+  position INTEGER NOT NULL,
+  grade INTEGER,
+  category TEXT,
+  difficulty TEXT,
+  source TEXT,
+  content TEXT,
+  explanation TEXT,
+  options TEXT,
+  answer INTEGER,
+  data TEXT NOT NULL,
+  hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_questions_grade ON questions (grade);
+CREATE INDEX IF NOT EXISTS idx_questions_category ON questions (category);
+CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions (difficulty);
+CREATE INDEX IF NOT EXISTS idx_questions_source ON questions (source);
+CREATE INDEX IF NOT EXISTS idx_questions_file ON questions (file);
+CREATE TABLE IF NOT EXISTS files (
+  name TEXT PRIMARY KEY,
+  mtime_ns INTEGER NOT NULL,
+  size INTEGER NOT NULL
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+  content, explanation, content='questions', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS questions_ai AFTER INSERT ON questions BEGIN
+  INSERT INTO questions_fts (rowid, content, explanation) VALUES (new.rowid, new.content, new.explanation);
+END;
+CREATE TRIGGER IF NOT EXISTS questions_ad AFTER DELETE ON questions BEGIN
+  INSERT INTO questions_fts (questions_fts, rowid, content, explanation)
+  VALUES ('delete', old.rowid, old.content, old.explanation);
+END;
+CREATE TRIGGER IF NOT EXISTS questions_au AFTER UPDATE ON questions BEGIN
+  INSERT INTO questions_fts (questions_fts, rowid, content, explanation)
+  VALUES ('delete', old.rowid, old.content, old.explanation);
+  INSERT INTO questions_fts (rowid, content, explanation) VALUES (new.rowid, new.content, new.explanation);
+END;
+"""
+
+COLUMNS = ["id", "file", "position", "grade", "category", "difficulty", "source",
+           "content", "explanation", "options", "answer", "data", "hash"]
+
+
+def has_fts5(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts5_probe USING fts5(x, tokenize='trigram')")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def row_of(q, name, position):
+    data = json.dumps(q, ensure_ascii=False)
+    return (
+        q["id"], name, position, q.get("grade"), q.get("category"), q.get("difficulty"), q.get("source"),
+        q.get("content"), q.get("explanation"), json.dumps(q.get("options", []), ensure_ascii=False),
+        q.get("answer"), data, hashlib.sha1(data.encode("utf-8")).hexdigest(),
+    )
+
+
+def sync(conn, files=BANK_FILES):
+    """增量同步，回傳 {"files": 重讀的檔案數, "upserted": 更新題數, "deleted": 刪除題數}"""
+    stats = {"files": 0, "upserted": 0, "deleted": 0}
+    for name in files:
+        path = data_path(name)
+        if not os.path.exists(path):
+            stats["deleted"] += conn.execute("DELETE FROM questions WHERE file = ?", (name,)).rowcount
+            conn.execute("DELETE FROM files WHERE name = ?", (name,))
+            continue
+        st = os.stat(path)
+        known = conn.execute("SELECT mtime_ns, size FROM files WHERE name = ?", (name,)).fetchone()
+        if known == (st.st_mtime_ns, st.st_size):
+            continue
+
+        stats["files"] += 1
+        old = dict(conn.execute("SELECT id, hash FROM questions WHERE file = ?", (name,)))
+        seen = set()
+        changed = []
+        for position, q in enumerate(load_questions(path)):
+            if q["id"] in seen:
+                continue
+            seen.add(q["id"])
+            row = row_of(q, name, position)
+            if old.get(q["id"]) != row[-1]:
+                changed.append(row)
+            else:
+                conn.execute("UPDATE questions SET position = ? WHERE id = ? AND position != ?", (position, q["id"], position))
+        # 題目從別的檔案搬過來時 id 已存在，用 UPSERT 改成新檔案
+        conn.executemany(
+            f"INSERT INTO questions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+            f"ON CONFLICT (id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in COLUMNS[1:])}",
+            changed,
+        )
+        gone = [(qid,) for qid in old if qid not in seen]
+        conn.executemany("DELETE FROM questions WHERE id = ? AND file = ?", [(qid, name) for (qid,) in gone])
+        conn.execute(
+            "INSERT OR REPLACE INTO files (name, mtime_ns, size) VALUES (?, ?, ?)",
+            (name, st.st_mtime_ns, st.st_size),
+        )
+        stats["upserted"] += len(changed)
+        stats["deleted"] += len(gone)
+    conn.commit()
+    return stats
+
+
+def connect(path=DB_PATH, update=True):
+    """開啟資料庫（第一次會建表），update=True 時先增量同步"""
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    if has_fts5(conn):
+        conn.executescript(FTS_SCHEMA)
+    if update:
+        sync(conn)
+    return conn
+
+
+def has_fts_table(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'questions_fts'").fetchone() is not None
+
+
+def filters(args):
+    """命令列篩選條件 → (WHERE 子句, 參數)"""
+    clauses, params = [], []
+    for column in ("grade", "category", "difficulty", "source"):
+        value = getattr(args, column, None)
+        if value is not None:
+            clauses.append(f"q.{column} = ?")
+            params.append(value)
+    if getattr(args, "no_explanation", False):
+        clauses.append("(q.explanation IS NULL OR TRIM(q.explanation) = '')")
+    return clauses, params
+
+
+def search(conn, terms, clauses=(), params=(), limit=None):
+    """題目或詳解包含所有詞的題目 [(id, content)]"""
+    clauses, params = list(clauses), list(params)
+    use_fts = has_fts_table(conn)
+    match = [t for t in terms if use_fts and len(t) >= FTS_MIN_QUERY]
+    for t in terms:
+        if t not in match:
+            clauses.append("(q.content LIKE ? OR q.explanation LIKE ?)")
+            params += [f"%{t}%", f"%{t}%"]
+    sql = "SELECT q.id, q.content FROM questions q"
+    if match:
+        sql += " JOIN questions_fts f ON f.rowid = q.rowid"
+        clauses.insert(0, "questions_fts MATCH ?")
+        params.insert(0, " AND ".join('"' + t.replace('"', '""') + '"' for t in match))
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY q.file, q.position"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return conn.execute(sql, params).fetchall()
+
+
+def report(conn):
+    """qa-analysis.py 的題目統計與品質檢查"""
+    total = conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+    print(f"總題數: {total}")
+    for grade, n in conn.execute("SELECT grade, COUNT(*) FROM questions GROUP BY grade ORDER BY grade"):
+        print(f"  {grade} 年級: {n} 題")
+    print("難度分布:")
+    for d, n in conn.execute("SELECT difficulty, COUNT(*) AS n FROM questions GROUP BY difficulty ORDER BY n DESC"):
+        print(f"  {d}: {n} ({n / total * 100:.1f}%)")
+    n_categories = conn.execute("SELECT COUNT(DISTINCT category) FROM questions").fetchone()[0]
+    print(f"題型 {n_categories} 種，前 15 名:")
+    for c, n in conn.execute("SELECT category, COUNT(*) AS n FROM questions GROUP BY category ORDER BY n DESC LIMIT 15"):
+        print(f"  {c}: {n}")
+
+    checks = [
+        ("空選項", "EXISTS (SELECT 1 FROM json_each(q.options) WHERE TRIM(value) = '')"),
+        ("答案超出範圍", "q.answer IS NULL OR q.answer < 0 OR q.answer >= json_array_length(q.options)"),
+        ("重複選項", "(SELECT COUNT(DISTINCT value) FROM json_each(q.options)) < json_array_length(q.options)"),
+        ("題目過短(<10字)", "LENGTH(q.content) < 10"),
+        ("缺少詳解", "q.explanation IS NULL OR TRIM(q.explanation) = ''"),
+    ]
+    print("品質檢查:")
+    for label, condition in checks:
+        n = conn.execute(f"SELECT COUNT(*) FROM questions q WHERE {condition}").fetchone()[0]
+        print(f"  {label}: {n}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="題庫 SQLite 索引")
+    parser.add_argument("--db", default=DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("sync", help="增量同步題庫")
+    for name, help_text in (("count", "依條件計數"), ("search", "全文搜尋")):
+        p = sub.add_parser(name, help=help_text)
+        if name == "search":
+            p.add_argument("terms", nargs="+")
+            p.add_argument("--limit", type=int, default=20)
+        p.add_argument("--grade", type=int)
+        p.add_argument("--category")
+        p.add_argument("--difficulty")
+        p.add_argument("--source")
+        p.add_argument("--no-explanation", action="store_true", help="只算沒有詳解的題目")
+    sub.add_parser("report", help="題目統計與品質檢查")
+    p_sql = sub.add_parser("sql", help="執行一段 SQL")
+    p_sql.add_argument("query")
+    args = parser.parse_args()
+
+    started = time.time()
+    conn = connect(args.db, update=False)
+    stats = sync(conn)
+    synced = time.time()
+    if args.command == "sync":
+        total = conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+        fts = "有" if has_fts_table(conn) else "無（SQLite 不支援 FTS5）"
+        print(f"重讀 {stats['files']} 個檔案，更新 {stats['upserted']} 題、刪除 {stats['deleted']} 題（{synced - started:.2f} 秒）")
+        print(f"資料庫共 {total} 題，全文索引：{fts}")
+    elif args.command == "count":
+        clauses, params = filters(args)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        n = conn.execute(f"SELECT COUNT(*) FROM questions q{where}", params).fetchone()[0]
+        print(f"{n} 題（查詢 {(time.time() - synced) * 1000:.1f} ms）")
+    elif args.command == "search":
+        clauses, params = filters(args)
+        rows = search(conn, args.terms, clauses, params, args.limit)
+        for qid, content in rows:
+            print(f"  {qid}: {content[:60]}")
+        print(f"{len(rows)} 題（查詢 {(time.time() - synced) * 1000:.1f} ms）")
+    elif args.command == "report":
+        report(conn)
+        print(f"（查詢 {(time.time() - synced) * 1000:.1f} ms）")
+    else:
+        cur = conn.execute(args.query)
+        if cur.description:
+            print("\t".join(d[0] for d in cur.description))
+        for row in cur:
+            print("\t".join("" if v is None else str(v) for v in row))
+        conn.commit()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
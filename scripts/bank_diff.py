@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+題庫版本差異 - 以 ID 與內容雜湊比對兩個版本，輸出精簡的變更集（changeset）
+
+用法：
+  python3 scripts/bank_diff.py                                  # HEAD vs 目前工作目錄的題庫
+  python3 scripts/bank_diff.py git:HEAD~5 git:HEAD              # 兩個 commit 的題庫
+  python3 scripts/bank_diff.py old.json new.json --output changes.json
+
+版本寫法：
+  - working：目前的 src/data 題庫（BANK_FILES）
+  - git:<rev>：該 commit 中的 BANK_FILES
+  - 檔案路徑：單一 {"questions": [...]} 檔
+
+分類（每題只看一次，兩邊各建一次雜湊表，線性時間）：
+  - added / removed：只在新版 / 舊版出現的 ID
+  - edited：同 ID，列出改了哪些欄位（含前後的值）
+  - moved：同 ID 換了檔案，或 ID 改了但內容雜湊相同（重新編號）—— 不算成一刪一增；
+    重新編號的題目若還改了其他欄位（詳解、難度、題型…），另外列在 edited（附 previousId）
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+from bank_io import BANK_FILES, DATA_DIR, content_hash, data_path, id_sort_key, iter_questions
+
+REPO_DIR = os.path.abspath(os.path.join(DATA_DIR, "..", ".."))
+
+
+def field_hash(value):
+    """欄位值的正規化雜湊（dict 鍵排序，與縮排無關）"""
+    return hashlib.sha1(json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def git(*args):
+    return subprocess.run(["git", *args], cwd=REPO_DIR, capture_output=True)
+
+
+def check_rev(rev):
+    """rev 不存在（打錯字等）時以 git 的錯誤訊息結束，避免被當成空題庫比對"""
+    result = git("cat-file", "-e", f"{rev}^{{commit}}")
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", "replace").strip()
+        raise SystemExit(f"❌ 無效的版本 git:{rev}" + (f"：{message}" if message else ""))
+
+
+def git_questions(rev, name):
+    """某個 commit 中 src/data/<name> 的題目；該 commit 沒有這個檔案時回傳 []"""
+    path = f"{rev}:src/data/{name}"
+    if git("cat-file", "-e", path).returncode != 0:
+        return []
+    result = git("show", path)
+    if result.returncode != 0:
+        raise SystemExit(f"❌ git show {path} 失敗：{result.stderr.decode('utf-8', 'replace').strip()}")
+    return json.loads(result.stdout.decode("utf-8"))["questions"]
+
+
+def load_snapshot(spec):
+    """版本 → {ID: (檔名, 題目)}；同一版本中重複的 ID 只保留第一題"""
+    if spec == "working":
+        sources = [(name, iter_questions(data_path(name))) for name in BANK_FILES if os.path.exists(data_path(name))]
+    elif spec.startswith("git:"):
+        check_rev(spec[4:])
+        sources = [(name, git_questions(spec[4:], name)) for name in BANK_FILES]
+    else:
+        sources = [(os.path.basename(spec), iter_questions(spec))]
+
+    snapshot = {}
+    for name, questions in sources:
+        for q in questions:
+            snapshot.setdefault(q["id"], (name, q))
+    return snapshot
+
+
+def changed_fields(old_q, q, skip=()):
+    """兩題不同的欄位 → {欄位: {"from", "to"}}"""
+    fields = {}
+    for key in sorted(set(q) | set(old_q)):
+        if key not in skip and field_hash(q.get(key)) != field_hash(old_q.get(key)):
+            fields[key] = {"from": old_q.get(key), "to": q.get(key)}
+    return fields
+
+
+def diff(old, new):
+    """兩個版本（load_snapshot 的格式）→ 變更集"""
+    added_ids = [qid for qid in new if qid not in old]
+    removed_ids = [qid for qid in old if qid not in new]
+
+    # 重新編號：舊 ID 消失、新 ID 出現，但內容雜湊相同
+    removed_by_content = {}
+    for qid in removed_ids:
+        removed_by_content.setdefault(content_hash(old[qid][1]), []).append(qid)
+    moved = []
+    edited = []
+    renamed = set()
+    for qid in added_ids:
+        candidates = removed_by_content.get(content_hash(new[qid][1]))
+        if candidates:
+            old_id = candidates.pop(0)
+            renamed.update((old_id, qid))
+            moved.append({"from": old_id, "to": qid, "fromFile": old[old_id][0], "toFile": new[qid][0]})
+            # 內容雜湊只涵蓋題幹、選項、答案；其他欄位的修改不能因為重新編號而遺漏
+            fields = changed_fields(old[old_id][1], new[qid][1], skip=("id",))
+            if fields:
+                edited.append({"id": qid, "previousId": old_id, "fields": fields})
+
+    for qid, (file, q) in new.items():
+        if qid not in old:
+            continue
+        old_file, old_q = old[qid]
+        fields = changed_fields(old_q, q)
+        if old_file != file:
+            moved.append({"from": qid, "to": qid, "fromFile": old_file, "toFile": file})
+        if fields:
+            edited.append({"id": qid, "fields": fields})
+
+    added = [new[qid][1] for qid in added_ids if qid not in renamed]
+    removed = [{"id": qid, "contentHash": content_hash(old[qid][1])} for qid in removed_ids if qid not in renamed]
+    edited.sort(key=lambda e: id_sort_key(e["id"]))
+    moved.sort(key=lambda m: id_sort_key(m["to"]))
+    touched = {e["id"] for e in edited} | {m["to"] for m in moved if m["from"] != m["to"]}
+    return {
+        "summary": {
+            "old": len(old),
+            "new": len(new),
+            "added": len(added),
+            "removed": len(removed),
+            "edited": len(edited),
+            "moved": len(moved),
+            "unchanged": len(new) - len(added) - len(touched),
+        },
+        "added": added,
+        "removed": removed,
+        "edited": edited,
+        "moved": moved,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較兩個版本的題庫")
+    parser.add_argument("old", nargs="?", default="git:HEAD", help="舊版本（預設 git:HEAD）")
+    parser.add_argument("new", nargs="?", default="working", help="新版本（預設 working）")
+    parser.add_argument("--output", help="變更集輸出檔（省略時只印摘要；- 為 stdout）")
+    args = parser.parse_args()
+
+    changeset = diff(load_snapshot(args.old), load_snapshot(args.new))
+    changeset = {"old": args.old, "new": args.new, **changeset}
+
+    if args.output == "-":
+        json.dump(changeset, sys.stdout, ensure_ascii=False, indent=2)
+        return
+
+    s = changeset["summary"]
+    print(f"{args.old}（{s['old']} 題）→ {args.new}（{s['new']} 題）")
+    print(f"  新增 {s['added']}、刪除 {s['removed']}、修改 {s['edited']}、移動 {s['moved']}、未變 {s['unchanged']}")
+    field_counts = {}
+    for e in changeset["edited"]:
+        for key in e["fields"]:
+            field_counts[key] = field_counts.get(key, 0) + 1
+    if field_counts:
+        print("  修改的欄位: " + "、".join(f"{k} {n}" for k, n in sorted(field_counts.items(), key=lambda x: -x[1])))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(changeset, f, ensure_ascii=False, indent=2)
+        print(f"變更集已儲存到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
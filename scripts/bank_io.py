@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+題庫讀取共用函式 - 供 scripts/ 下的 Python 工具使用
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import re
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SCRIPTS_DIR, "..", "src", "data")
+
+# 主題庫與幾何題庫（與 validate-questions.js 的載入順序相同）
+BANK_FILES = [
+    "questions.json",
+    "questions-geometry.json",
+]
+
+
+def data_path(name):
+    """src/data 下的檔案路徑"""
+    return os.path.join(DATA_DIR, name)
+
+
+def load_script(filename):
+    """以模組載入 scripts/ 下檔名含「-」的腳本（如 generate-ps-batch.py），不執行其 __main__"""
+    path = os.path.join(SCRIPTS_DIR, filename)
+    name = os.path.splitext(filename)[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_questions(path):
+    """讀取 {"questions": [...]} 格式的題庫檔"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["questions"]
+
+
+def save_questions(path, questions):
+    """寫回題庫檔（格式與生成腳本的 json.dump indent=2 相同）"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"questions": questions}, f, ensure_ascii=False, indent=2)
+
+
+def load_bank(files=BANK_FILES):
+    """讀取完整題庫（不存在的檔案略過）"""
+    questions = []
+    for name in files:
+        path = data_path(name)
+        if os.path.exists(path):
+            questions.extend(load_questions(path))
+    return questions
+
+
+def iter_questions(path, buffer_size=1 << 16):
+    """逐題串流讀取 {"questions": [...]}，不把整個檔案載入記憶體"""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        # 找到 questions 陣列的開頭
+        while True:
+            chunk = f.read(buffer_size)
+            buf += chunk
+            m = re.search(r'"questions"\s*:\s*\[', buf)
+            if m:
+                buf = buf[m.end():]
+                break
+            if not chunk:
+                raise ValueError(f"{path} 不是 {{\"questions\": [...]}} 格式")
+
+        pos = 0
+        eof = False
+        while True:
+            # 跳過空白與逗號
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(buffer_size)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            yield item
+            pos = end
+
+
+class QuestionWriter:
+    """逐題寫出 {"questions": [...]}，輸出與 json.dump(indent=2) 完全相同"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.f = open(path, "w", encoding="utf-8")
+        self.f.write('{\n  "questions": [')
+
+    def write(self, question):
+        text = json.dumps(question, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+        self.f.write(("," if self.count else "") + "\n    " + text)
+        self.count += 1
+
+    def close(self):
+        self.f.write("\n  ]\n}" if self.count else "]\n}")
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def id_sort_key(qid):
+    """題目 ID 排序鍵：ps-batch-6010 → ("ps-batch-", 6010)，數字部分依數值排序"""
+    m = re.match(r"^(.*?)(\d+)$", qid)
+    if not m:
+        return (qid, -1)
+    return (m.group(1), int(m.group(2)))
+
+
+def normalize_text(text):
+    return re.sub(r"\s+", "", text or "")
+
+
+def content_hash(question):
+    """題目內容雜湊（題幹 + 選項集合 + 正確答案），選項順序不同也視為同一題"""
+    options = question.get("options", [])
+    answer = question.get("answer", 0)
+    key = [
+        normalize_text(question.get("content")),
+        sorted(normalize_text(o) for o in options),
+        normalize_text(options[answer]) if 0 <= answer < len(options) else "",
+    ]
+    return hashlib.sha1(json.dumps(key, ensure_ascii=False).encode("utf-8")).hexdigest()
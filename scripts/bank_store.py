@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+題庫版本庫 - 以內容雜湊存每一題的每個版本（只存一次），快照只記 (ID, 雜湊) 清單
+
+用法：
+  python3 scripts/bank_store.py snapshot -m "合併 ps-batch"   # 把目前題庫存成快照
+  python3 scripts/bank_store.py log                          # 列出快照與各自的變動題數
+  python3 scripts/bank_store.py checkout 3                   # 把題庫還原成第 3 個快照
+  python3 scripts/bank_store.py revert 5                     # 撤銷第 5 個快照相對前一個快照的變動
+  python3 scripts/bank_store.py revert 5 --prefix ps-batch-  # 只撤銷某一批（ID 前綴）
+
+版本庫是 SQLite 檔（scripts/bank-store.db），只新增、不修改：
+  - objects：題目 JSON（zlib 壓縮），以 sha1 為鍵，內容相同的題目版本只存一份
+  - snapshots：每個快照一列，manifest 是各檔案依序的 [ID, 雜湊] 清單（壓縮後存放）
+建快照時只寫入前一個快照沒有的雜湊；checkout / revert 只向版本庫讀取目前題庫中沒有的題目，
+題目沒變的檔案不重寫，因此成本與變動的題數成正比，而不是整個題庫。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+from bank_io import BANK_FILES, SCRIPTS_DIR, data_path, load_questions, save_questions
+
+STORE_PATH = os.path.join(SCRIPTS_DIR, "bank-store.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+  hash TEXT PRIMARY KEY,
+  body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  parent INTEGER,
+  created_at TEXT NOT NULL,
+  message TEXT,
+  manifest BLOB NOT NULL
+);
+"""
+
+
+def connect(path=STORE_PATH):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def encode(q):
+    """題目 → 儲存用 JSON（保留欄位順序，checkout 出來的檔案與原檔相同）"""
+    return json.dumps(q, ensure_ascii=False).encode("utf-8")
+
+
+def object_hash(q):
+    return hashlib.sha1(encode(q)).hexdigest()
+
+
+def read_bank(files=BANK_FILES):
+    """{檔名: [(ID, 雜湊, 題目)]}，不存在的檔案略過"""
+    bank = {}
+    for name in files:
+        if os.path.exists(data_path(name)):
+            bank[name] = [(q["id"], object_hash(q), q) for q in load_questions(data_path(name))]
+    return bank
+
+
+def load_manifest(conn, snapshot_id):
+    """快照 → {檔名: [(ID, 雜湊)]}"""
+    row = conn.execute("SELECT manifest FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+    if row is None:
+        raise ValueError(f"沒有快照 {snapshot_id}")
+    return {name: [tuple(e) for e in entries] for name, entries in json.loads(zlib.decompress(row[0])).items()}
+
+
+def latest_snapshot(conn):
+    row = conn.execute("SELECT MAX(id) FROM snapshots").fetchone()
+    return row[0]
+
+
+def fetch_objects(conn, hashes):
+    """從版本庫讀出題目：{雜湊: 題目}"""
+    hashes = list(hashes)
+    found = {}
+    for i in range(0, len(hashes), 500):
+        chunk = hashes[i:i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        for h, body in conn.execute(f"SELECT hash, body FROM objects WHERE hash IN ({placeholders})", chunk):
+            found[h] = json.loads(zlib.decompress(body))
+    missing = set(hashes) - set(found)
+    if missing:
+        raise ValueError(f"版本庫缺少 {len(missing)} 個題目版本（如 {next(iter(missing))}）")
+    return found
+
+
+def snapshot(message=None, files=BANK_FILES, path=STORE_PATH):
+    """把目前題庫存成快照，回傳 (快照編號, 新寫入的題目版本數)"""
+    bank = read_bank(files)
+    conn = connect(path)
+    try:
+        parent = latest_snapshot(conn)
+        known = set()
+        if parent is not None:
+            known = {h for entries in load_manifest(conn, parent).values() for _, h in entries}
+        new_objects = {h: q for entries in bank.values() for _, h, q in entries if h not in known}
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO objects (hash, body) VALUES (?, ?)",
+                ((h, zlib.compress(encode(q))) for h, q in new_objects.items()),
+            )
+            manifest = {name: [[qid, h] for qid, h, _ in entries] for name, entries in bank.items()}
+            cur = conn.execute(
+                "INSERT INTO snapshots (parent, created_at, message, manifest) VALUES (?, ?, ?, ?)",
+                (parent, time.strftime("%Y-%m-%dT%H:%M:%S"), message,
+                 zlib.compress(json.dumps(manifest, separators=(",", ":")).encode("utf-8"))),
+            )
+        return cur.lastrowid, len(new_objects)
+    finally:
+        conn.close()
+
+
+def write_if_changed(name, current, target, conn):
+    """current：目前 [(ID, 雜湊, 題目)]；target：要的 [(ID, 雜湊)]。只讀取缺少的題目版本，回傳讀取數（沒變動時回傳 None）"""
+    if [h for _, h, _ in current] == [h for _, h in target]:
+        return None
+    have = {h: q for _, h, q in current}
+    fetched = fetch_objects(conn, {h for _, h in target if h not in have})
+    have.update(fetched)
+    save_questions(data_path(name), [have[h] for _, h in target])
+    return len(fetched)
+
+
+def checkout(snapshot_id, path=STORE_PATH):
+    """把題庫還原成某個快照，回傳 {檔名: 從版本庫讀取的題數}（只列有改寫的檔案）"""
+    conn = connect(path)
+    try:
+        manifest = load_manifest(conn, snapshot_id)
+        bank = read_bank(list(manifest))
+        written = {}
+        for name, target in manifest.items():
+            n = write_if_changed(name, bank.get(name, []), target, conn)
+            if n is not None:
+                written[name] = n
+        return written
+    finally:
+        conn.close()
+
+
+def changes(conn, snapshot_id, prefix=None):
+    """快照相對前一個快照的變動：{ID: (前一版 (檔名, 位置, 雜湊) 或 None, 這一版 (檔名, 位置, 雜湊) 或 None)}"""
+    parent = conn.execute("SELECT parent FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+    if parent is None:
+        raise ValueError(f"沒有快照 {snapshot_id}")
+
+    def locate(manifest):
+        return {
+            qid: (name, pos, h)
+            for name, entries in manifest.items()
+            for pos, (qid, h) in enumerate(entries)
+            if prefix is None or qid.startswith(prefix)
+        }
+
+    after = locate(load_manifest(conn, snapshot_id))
+    before = locate(load_manifest(conn, parent[0])) if parent[0] is not None else {}
+    return {
+        qid: (before.get(qid), after.get(qid))
+        for qid in set(before) | set(after)
+        if (before.get(qid) or (None, None, None))[2] != (after.get(qid) or (None, None, None))[2]
+    }
+
+
+def revert(snapshot_id, prefix=None, path=STORE_PATH):
+    """撤銷某個快照帶來的變動（可只限某個 ID 前綴），回傳 (撤銷題數, 衝突 ID 清單)。
+    題目在那之後又被改過（目前內容不是該快照的版本）時視為衝突，不動它。"""
+    conn = connect(path)
+    try:
+        delta = changes(conn, snapshot_id, prefix)
+        bank = read_bank()
+        current = {qid: (name, h) for name, entries in bank.items() for qid, h, _ in entries}
+        targets = {name: [(qid, h) for qid, h, _ in entries] for name, entries in bank.items()}
+
+        reverted, conflicts = 0, []
+        restore = []
+        for qid, (before, after) in sorted(delta.items()):
+            expected = after[2] if after else None
+            if current.get(qid, (None, None))[1] != expected:
+                conflicts.append(qid)
+                continue
+            if after:
+                name = current[qid][0]
+                targets[name] = [(i, h) for i, h in targets[name] if i != qid]
+            if before:
+                restore.append((qid, before))
+            reverted += 1
+
+        # 刪掉或改過的題目放回前一版的位置（改過的題目已在上面移除）
+        for qid, (name, pos, h) in sorted(restore, key=lambda x: x[1][1]):
+            targets.setdefault(name, []).insert(pos, (qid, h))
+
+        for name, target in targets.items():
+            write_if_changed(name, bank.get(name, []), target, conn)
+        return reverted, conflicts
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="題庫版本庫（內容定址、只新增）")
+    parser.add_argument("--store", default=STORE_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_snap = sub.add_parser("snapshot", help="把目前題庫存成快照")
+    p_snap.add_argument("-m", "--message")
+    sub.add_parser("log", help="列出快照")
+    p_checkout = sub.add_parser("checkout", help="把題庫還原成某個快照")
+    p_checkout.add_argument("snapshot", type=int)
+    p_revert = sub.add_parser("revert", help="撤銷某個快照帶來的變動")
+    p_revert.add_argument("snapshot", type=int)
+    p_revert.add_argument("--prefix", help="只撤銷此 ID 前綴的題目（如 ps-batch-）")
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        sid, new = snapshot(args.message, path=args.store)
+        print(f"已建立快照 {sid}（新存入 {new} 個題目版本）")
+    elif args.command == "log":
+        conn = connect(args.store)
+        objects = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM objects").fetchone()
+        print(f"題目版本 {objects[0]} 個（壓縮後 {objects[1] / 1024:.0f} KB）")
+        for sid, created_at, message in conn.execute("SELECT id, created_at, message FROM snapshots ORDER BY id"):
+            n = len(changes(conn, sid))
+            print(f"  {sid:>4}  {created_at}  變動 {n:>5} 題  {message or ''}")
+        conn.close()
+    elif args.command == "checkout":
+        written = checkout(args.snapshot, path=args.store)
+        if not written:
+            print("題庫已是該快照的內容")
+        for name, n in written.items():
+            print(f"  已改寫 {name}（從版本庫讀取 {n} 題）")
+    else:
+        reverted, conflicts = revert(args.snapshot, args.prefix, path=args.store)
+        print(f"已撤銷 {reverted} 題")
+        if conflicts:
+            print(f"⚠️ {len(conflicts)} 題在快照 {args.snapshot} 之後又被改過，未撤銷: {', '.join(conflicts[:20])}")
+
+
+if __name__ == "__main__":
+    main()
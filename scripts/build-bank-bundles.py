@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+題庫分包 - 把題庫依「年級 × 題型」切成小檔，壓縮並產生內容雜湊對照表
+
+用法：
+  python3 scripts/build-bank-bundles.py
+
+輸出到 public/bank/：
+  <hash>.json / <hash>.json.gz / <hash>.json.br   每個分包（壓縮成最小 JSON）
+  manifest.json                                   年級、題型 → 分包檔名與題數
+
+分包檔名就是內容雜湊，內容不變檔名就不變，可以長期快取；請求 .json 時 next.config.ts
+依 Accept-Encoding 改送 .br / .gz 並加上 Content-Encoding。
+前端只需載入 manifest.json，再依年級 / 題型抓需要的分包（src/lib/bank.ts，測驗頁使用）。
+npm run dev / build 前會自動執行本腳本（package.json 的 predev / prebuild）。
+Brotli 需要 `pip install brotli`，未安裝時只輸出 gzip。
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from collections import defaultdict
+
+from bank_io import SCRIPTS_DIR, load_bank
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+OUTPUT_DIR = os.path.join(SCRIPTS_DIR, "..", "public", "bank")
+URL_PREFIX = "/bank/"
+HASH_LENGTH = 16
+
+
+def minify(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_compressed(path, compress):
+    """檔名即雜湊：已存在的檔案內容必定相同，不必重新壓縮。回傳檔案大小"""
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(compress())
+    return os.path.getsize(path)
+
+
+def main():
+    questions = load_bank()
+    groups = defaultdict(list)
+    for q in questions:
+        groups[(q["grade"], q["category"])].append(q)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    chunks = []
+    written = 0
+    raw_total = gzip_total = brotli_total = 0
+    for (grade, category), items in sorted(groups.items()):
+        raw = minify({"grade": grade, "category": category, "questions": items})
+        digest = hashlib.sha256(raw).hexdigest()[:HASH_LENGTH]
+        base = os.path.join(OUTPUT_DIR, f"{digest}.json")
+
+        if not os.path.exists(base):
+            written += 1
+        write_compressed(base, lambda: raw)
+        gz_size = write_compressed(base + ".gz", lambda: gzip.compress(raw, compresslevel=9, mtime=0))
+        chunk = {
+            "grade": grade,
+            "category": category,
+            "count": len(items),
+            "file": f"{URL_PREFIX}{digest}.json",
+            "hash": digest,
+            "bytes": len(raw),
+            "gzipBytes": gz_size,
+        }
+        if brotli:
+            br_size = write_compressed(base + ".br", lambda: brotli.compress(raw, quality=11))
+            chunk["brotliBytes"] = br_size
+            brotli_total += br_size
+
+        chunks.append(chunk)
+        raw_total += len(raw)
+        gzip_total += gz_size
+
+    # 清掉已不在對照表中的舊分包
+    keep = {c["hash"] for c in chunks}
+    removed = 0
+    for name in os.listdir(OUTPUT_DIR):
+        if name != "manifest.json" and name.split(".")[0] not in keep:
+            os.remove(os.path.join(OUTPUT_DIR, name))
+            removed += 1
+
+    version = hashlib.sha256("".join(c["hash"] for c in chunks).encode()).hexdigest()[:HASH_LENGTH]
+    manifest = {"version": version, "total": len(questions), "chunks": chunks}
+    with open(os.path.join(OUTPUT_DIR, "manifest.json"), "w", encoding="utf-8") as f:
+        f.write(minify(manifest).decode("utf-8"))
+
+    print(f"題庫 {len(questions)} 題，切成 {len(chunks)} 個分包（新增 {written} 個，移除 {removed} 個舊檔）")
+    print(f"原始 JSON: {raw_total / 1024:.0f} KB，gzip: {gzip_total / 1024:.0f} KB", end="")
+    print(f"，brotli: {brotli_total / 1024:.0f} KB" if brotli else "（未安裝 brotli，略過 .br）")
+    print(f"已輸出到 public/bank/（版本 {version}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+IRT 難度校準 - 依 answers 表的實際作答結果估計每題難度
+
+用法：
+  python3 scripts/calibrate-difficulty.py answers.csv
+  python3 scripts/calibrate-difficulty.py answers.csv --model 2pl
+  python3 scripts/calibrate-difficulty.py new-answers.csv --init scripts/irt-params.json   # 暖啟動增量重算
+  python3 scripts/calibrate-difficulty.py answers.csv --write-bank                        # 寫回題庫 difficulty
+
+模型：P(答對) = 1 / (1 + e^(-a(θ - b)))
+  θ = 學生能力、b = 題目難度、a = 鑑別度（1PL 固定 a = 1）
+以 JML 交替牛頓法估計，θ 與 b 帶常態先驗避免全對 / 全錯時發散。
+作答資料以緊湊陣列（array）儲存，每輪只做一次線性掃描。
+
+暖啟動（--init）：新匯出檔中出現的題目 / 學生從上次的參數開始估計，且不再重新置中能力平均，
+量尺沿用上次的結果。上次的估計當作先驗：b、a 的先驗中心是上次的值，精確度隨上次的作答數 n
+增加（每筆約 PRIOR_INFO_PER_RESPONSE 的資訊量），θ 的先驗中心是上次的能力；
+所以少量新作答只會微調參數，不會推翻累積的證據。
+新檔沒有的題目 / 學生原樣保留，各題作答數 n 為上次的 n 加上新作答數。
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from array import array
+
+from bank_io import BANK_FILES, SCRIPTS_DIR, data_path, load_questions, save_questions
+from export_reader import DEFAULT_CHUNK_SIZE, iter_chunks, to_bool
+
+PARAMS_PATH = os.path.join(SCRIPTS_DIR, "irt-params.json")
+
+THETA_PRIOR_VAR = 1.0
+B_PRIOR_VAR = 4.0
+A_PRIOR_VAR = 0.5
+A_RANGE = (0.25, 4.0)
+MAX_STEP = 1.0
+# 暖啟動時，上次每筆作答換算成的先驗精確度（2PL 資訊量 a²P(1-P) 在 P≈0.3~0.7 時約 0.2）
+PRIOR_INFO_PER_RESPONSE = 0.2
+
+# b 值對應到題庫的三級難度
+EASY_BELOW = -0.5
+HARD_ABOVE = 0.5
+
+
+class ResponseMatrix:
+    """稀疏的 學生 × 題目 作答矩陣（COO 格式）"""
+
+    def __init__(self):
+        self.user_index = {}
+        self.item_index = {}
+        self.users = array("I")
+        self.items = array("I")
+        self.correct = bytearray()
+
+    def add(self, user, item, ok):
+        u = self.user_index.setdefault(user, len(self.user_index))
+        i = self.item_index.setdefault(item, len(self.item_index))
+        self.users.append(u)
+        self.items.append(i)
+        self.correct.append(1 if ok else 0)
+
+    def __len__(self):
+        return len(self.correct)
+
+
+def load_responses(path, table, chunk_size):
+    matrix = ResponseMatrix()
+    for chunk in iter_chunks(path, table, chunk_size):
+        for row in chunk:
+            qid = row.get("question_id")
+            if qid:
+                matrix.add(row.get("user_id") or "", qid, to_bool(row.get("is_correct")))
+        print(f"  已載入 {len(matrix):,} 筆...")
+    return matrix
+
+
+def sigmoid(z):
+    if z < -30:
+        return 1e-13
+    if z > 30:
+        return 1 - 1e-13
+    return 1 / (1 + math.exp(-z))
+
+
+def clamp_step(step):
+    return max(-MAX_STEP, min(MAX_STEP, step))
+
+
+def fit(matrix, model="1pl", init=None, max_iter=50, tol=1e-3):
+    """交替更新 θ、b（、a），回傳 (theta, a, b, 每題作答數)"""
+    n_users = len(matrix.user_index)
+    n_items = len(matrix.item_index)
+    theta = [0.0] * n_users
+    a = [1.0] * n_items
+    b = [0.0] * n_items
+
+    # 先驗：預設以 0（a 為 1）為中心；暖啟動時以上次的參數為中心，精確度隨上次作答數增加
+    theta_mean = [0.0] * n_users
+    b_mean = [0.0] * n_items
+    a_mean = [1.0] * n_items
+    b_prec = [1 / B_PRIOR_VAR] * n_items
+    a_prec = [1 / A_PRIOR_VAR] * n_items
+    if init:
+        for item, i in matrix.item_index.items():
+            p = init.get("items", {}).get(item)
+            if p:
+                a[i] = a_mean[i] = p.get("a", 1.0)
+                b[i] = b_mean[i] = p["b"]
+                info = p.get("n", 0) * PRIOR_INFO_PER_RESPONSE
+                b_prec[i] += info * a[i] * a[i]
+                if model == "2pl":
+                    a_prec[i] += info
+        for user, u in matrix.user_index.items():
+            if user in init.get("users", {}):
+                theta[u] = theta_mean[u] = init["users"][user]
+
+    users, items, correct = matrix.users, matrix.items, matrix.correct
+    counts = [0] * n_items
+    for i in items:
+        counts[i] += 1
+
+    for it in range(1, max_iter + 1):
+        # θ 步
+        grad = [-(t - m) / THETA_PRIOR_VAR for t, m in zip(theta, theta_mean)]
+        hess = [1 / THETA_PRIOR_VAR] * n_users
+        for u, i, y in zip(users, items, correct):
+            ai = a[i]
+            p = sigmoid(ai * (theta[u] - b[i]))
+            grad[u] += ai * (y - p)
+            hess[u] += ai * ai * p * (1 - p)
+        for u in range(n_users):
+            theta[u] += clamp_step(grad[u] / hess[u])
+
+        # 固定量尺：能力平均為 0（暖啟動時量尺由沿用的參數決定，不重新置中）
+        if not init:
+            shift = sum(theta) / n_users if n_users else 0.0
+            theta = [t - shift for t in theta]
+            b = [x - shift for x in b]
+
+        # b（與 a）步
+        grad_b = [-(x - m) * w for x, m, w in zip(b, b_mean, b_prec)]
+        hess_b = list(b_prec)
+        grad_a = [-(x - m) * w for x, m, w in zip(a, a_mean, a_prec)]
+        hess_a = list(a_prec)
+        loglik = 0.0
+        for u, i, y in zip(users, items, correct):
+            ai = a[i]
+            d = theta[u] - b[i]
+            p = sigmoid(ai * d)
+            r = y - p
+            w = p * (1 - p)
+            grad_b[i] -= ai * r
+            hess_b[i] += ai * ai * w
+            if model == "2pl":
+                grad_a[i] += d * r
+                hess_a[i] += d * d * w
+            loglik += math.log(p if y else 1 - p)
+
+        delta = 0.0
+        for i in range(n_items):
+            step = clamp_step(grad_b[i] / hess_b[i])
+            b[i] += step
+            delta = max(delta, abs(step))
+            if model == "2pl":
+                a[i] = min(A_RANGE[1], max(A_RANGE[0], a[i] + clamp_step(grad_a[i] / hess_a[i])))
+
+        print(f"  第 {it} 輪：log-likelihood = {loglik:,.1f}，最大 Δb = {delta:.4f}")
+        if delta < tol:
+            break
+
+    return theta, a, b, counts
+
+
+def merge_params(matrix, theta, a, b, counts, init=None):
+    """本次估計結果併入上次的參數：回傳 (題目參數, 學生能力, 總作答數)"""
+    init = init or {}
+    previous = init.get("items", {})
+    item_params = dict(previous)
+    for item, i in matrix.item_index.items():
+        n = counts[i] + previous.get(item, {}).get("n", 0)
+        item_params[item] = {"a": round(a[i], 4), "b": round(b[i], 4), "n": n}
+    users = dict(init.get("users", {}))
+    users.update({user: round(theta[u], 4) for user, u in matrix.user_index.items()})
+    return item_params, users, len(matrix) + init.get("responses", 0)
+
+
+def difficulty_label(b_value):
+    if b_value < EASY_BELOW:
+        return "easy"
+    if b_value > HARD_ABOVE:
+        return "hard"
+    return "medium"
+
+
+def write_bank(item_params, min_responses):
+    """把校準後的難度寫回題庫檔，只更新作答數足夠的題目"""
+    changed = 0
+    for name in BANK_FILES:
+        path = data_path(name)
+        if not os.path.exists(path):
+            continue
+        questions = load_questions(path)
+        file_changed = 0
+        for q in questions:
+            p = item_params.get(q["id"])
+            if not p or p["n"] < min_responses:
+                continue
+            label = difficulty_label(p["b"])
+            if q.get("difficulty") != label:
+                q["difficulty"] = label
+                file_changed += 1
+        if file_changed:
+            save_questions(path, questions)
+            print(f"  {name}: 更新 {file_changed} 題難度")
+        changed += file_changed
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="以 IRT 模型校準題目難度")
+    parser.add_argument("input", help="answers 匯出檔（.csv / .jsonl / .db）")
+    parser.add_argument("--table", default="answers")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--model", choices=["1pl", "2pl"], default="1pl")
+    parser.add_argument("--init", help="上次的參數檔（暖啟動）")
+    parser.add_argument("--max-iter", type=int, default=50)
+    parser.add_argument("--tol", type=float, default=1e-3)
+    parser.add_argument("--output", default=PARAMS_PATH)
+    parser.add_argument("--write-bank", action="store_true", help="把校準後難度寫回題庫")
+    parser.add_argument("--min-responses", type=int, default=30, help="寫回題庫所需的最少作答數")
+    args = parser.parse_args()
+
+    started = time.time()
+    print(f"讀取 {args.input}...")
+    matrix = load_responses(args.input, args.table, args.chunk_size)
+    print(f"作答 {len(matrix):,} 筆，學生 {len(matrix.user_index):,} 人，題目 {len(matrix.item_index):,} 題")
+
+    init = None
+    if args.init:
+        with open(args.init, "r", encoding="utf-8") as f:
+            init = json.load(f)
+        print(f"暖啟動：沿用 {args.init}")
+
+    theta, a, b, counts = fit(matrix, args.model, init, args.max_iter, args.tol)
+
+    item_params, users, responses = merge_params(matrix, theta, a, b, counts, init)
+    params = {
+        "model": args.model,
+        "fittedAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "responses": responses,
+        "items": dict(sorted(item_params.items())),
+        "users": users,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(params, f, ensure_ascii=False, indent=2)
+    print(f"\n已儲存到 {args.output}（{time.time() - started:.1f} 秒）")
+
+    labels = {}
+    for p in item_params.values():
+        if p["n"] >= args.min_responses:
+            label = difficulty_label(p["b"])
+            labels[label] = labels.get(label, 0) + 1
+    print(f"校準後難度分布（作答數 ≥ {args.min_responses}）：{labels}")
+
+    if args.write_bank:
+        changed = write_bank(item_params, args.min_responses)
+        print(f"共更新 {changed} 題難度")
+
+
+if __name__ == "__main__":
+    main()
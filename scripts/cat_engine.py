@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+電腦化適性測驗（CAT）- 依學生目前的能力估計，每次出「資訊量最大」的題目
+
+用法（在服務端程式中）：
+  from cat_engine import CatEngine
+  engine = CatEngine(grade=5)                  # 載入 irt-params.json 並預先建表（每個行程一次）
+  session = engine.session(user_id)            # 以上次測驗結束時的能力當起點（沒有則用校準時的估計）
+  qid = session.next_item()
+  session.record(qid, correct=True)
+  session.theta, session.se, session.done
+  engine.save_result(session)                  # 測驗結束後存下這位學生的能力與 SE
+
+命令列：
+  python3 scripts/cat_engine.py simulate --grade 5 --students 500    # 模擬學生，比較適性與隨機出題的估計誤差
+  python3 scripts/cat_engine.py simulate --grade 5 --synthetic       # 改用隨機抽的 2PL 參數（a、b 分散，較接近校準後的題庫）
+
+題目參數來自 calibrate-difficulty.py 輸出的 scripts/irt-params.json（2PL：a、b）；
+尚未校準的題目依題庫 difficulty 給預設難度（easy -1、medium 0、hard 1，a = 1）。
+每位學生最近一次測驗的能力與 SE 存在 scripts/cat-abilities.json（以 user_id 為鍵），
+下次測驗以它為先驗（SE 至少放寬到 MIN_CARRYOVER_SD，讓能力有變化的空間）；沒有紀錄時才用 irt-params.json。
+
+預先計算：
+  - 能力軸切成 THETA_GRID 個格點，每題在每個格點的答對機率（更新能力用）
+  - 每個格點一張「題目依 Fisher 資訊量 a²P(1-P) 由大到小」的排序表
+出題時找到能力所在的格點，從排序表開頭跳過已出過的題目，成本只跟已出題數有關，與題庫大小無關。
+能力以格點上的後驗分布（常態先驗）估計（EAP），每作答一題更新一次。
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import time
+
+from bank_io import SCRIPTS_DIR, load_bank
+
+PARAMS_PATH = os.path.join(SCRIPTS_DIR, "irt-params.json")
+ABILITY_PATH = os.path.join(SCRIPTS_DIR, "cat-abilities.json")
+
+THETA_MIN, THETA_MAX, THETA_STEP = -4.0, 4.0, 0.1
+THETA_GRID = [round(THETA_MIN + i * THETA_STEP, 4) for i in range(int(round((THETA_MAX - THETA_MIN) / THETA_STEP)) + 1)]
+PRIOR_SD = 1.0
+# 沿用上次測驗的能力時，先驗標準差的下限
+MIN_CARRYOVER_SD = 0.5
+DEFAULT_B = {"easy": -1.0, "medium": 0.0, "hard": 1.0}
+# 測驗結束條件
+SE_TARGET = 0.3
+MAX_ITEMS = 20
+# 從資訊量前幾名中隨機挑一題，避免同能力的學生都拿到同一題
+RANDOMESQUE = 3
+# --synthetic：a ~ 對數常態（中位數 1），b ~ N(0, 1)
+SYNTHETIC_LOG_A_SD = 0.3
+SYNTHETIC_B_SD = 1.0
+
+
+def sigmoid(z):
+    if z >= 0:
+        return 1 / (1 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1 + e)
+
+
+def load_params(path=PARAMS_PATH):
+    """irt-params.json → ({qid: (a, b)}, {user: theta})；檔案不存在時回傳空表"""
+    if not os.path.exists(path):
+        return {}, {}
+    with open(path, "r", encoding="utf-8") as f:
+        params = json.load(f)
+    items = {qid: (p.get("a", 1.0), p["b"]) for qid, p in params.get("items", {}).items()}
+    return items, params.get("users", {})
+
+
+def synthetic_params(questions, seed=0):
+    """模擬用：每題隨機抽 2PL 參數 {qid: (a, b)}"""
+    rng = random.Random(seed)
+    return {
+        q["id"]: (math.exp(rng.gauss(0, SYNTHETIC_LOG_A_SD)), rng.gauss(0, SYNTHETIC_B_SD))
+        for q in questions
+    }
+
+
+class AbilityStore:
+    """每位學生最近一次測驗結束時的能力估計：{user_id: {"theta", "se", "items", "updatedAt"}}"""
+
+    def __init__(self, path=ABILITY_PATH):
+        self.path = path
+        self.users = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.users = json.load(f)
+
+    def get(self, user):
+        return self.users.get(user)
+
+    def save(self, user, session):
+        self.users[user] = {
+            "theta": round(session.theta, 4),
+            "se": round(session.se, 4),
+            "items": len(session.responses),
+            "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.users, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+
+class CatEngine:
+    """一個年級的題目參數與預先算好的機率表、資訊量排序表"""
+
+    def __init__(self, grade=None, questions=None, params_path=PARAMS_PATH, items=None, ability_path=ABILITY_PATH):
+        """items 給 {qid: (a, b)} 時直接使用，不讀參數檔；ability_path 為 None 時不讀寫學生能力紀錄"""
+        self.store = AbilityStore(ability_path) if ability_path else None
+        questions = load_bank() if questions is None else questions
+        if items is None:
+            calibrated, self.abilities = load_params(params_path)
+        else:
+            calibrated, self.abilities = items, {}
+        self.ids = []
+        self.params = []
+        for q in questions:
+            if grade is not None and q.get("grade") != grade:
+                continue
+            a, b = calibrated.get(q["id"], (1.0, DEFAULT_B.get(q.get("difficulty"), 0.0)))
+            self.ids.append(q["id"])
+            self.params.append((a, b))
+        self.calibrated = sum(1 for qid in self.ids if qid in calibrated)
+
+        # 每題在每個格點的 log P(答對)、log P(答錯)
+        self.log_p = []
+        self.log_q = []
+        info = []
+        for a, b in self.params:
+            ps = [sigmoid(a * (t - b)) for t in THETA_GRID]
+            self.log_p.append([math.log(max(p, 1e-12)) for p in ps])
+            self.log_q.append([math.log(max(1 - p, 1e-12)) for p in ps])
+            info.append([a * a * p * (1 - p) for p in ps])
+        # 每個格點：題目索引依資訊量由大到小
+        self.ranked = [
+            sorted(range(len(self.ids)), key=lambda i, g=g: -info[i][g])
+            for g in range(len(THETA_GRID))
+        ]
+        self.index = {qid: i for i, qid in enumerate(self.ids)}
+
+    def bucket(self, theta):
+        g = int(round((theta - THETA_MIN) / THETA_STEP))
+        return min(len(THETA_GRID) - 1, max(0, g))
+
+    def session(self, user=None, theta0=None, se_target=SE_TARGET, max_items=MAX_ITEMS, rng=None):
+        """開始一次測驗；起始能力優先用 theta0，其次用上次測驗的結果、校準時的學生能力，都沒有則為 0"""
+        prior_sd = PRIOR_SD
+        if theta0 is None:
+            last = self.store.get(user) if self.store and user is not None else None
+            if last:
+                theta0, prior_sd = last["theta"], max(last["se"], MIN_CARRYOVER_SD)
+            else:
+                theta0 = self.abilities.get(user, 0.0)
+        return CatSession(self, theta0, se_target, max_items, rng or random.Random(), user, prior_sd)
+
+    def save_result(self, session):
+        """存下這次測驗結束時的能力與 SE，下次 session() 由此開始"""
+        if self.store is None or session.user is None:
+            return
+        self.store.save(session.user, session)
+
+
+class CatSession:
+    """一位學生一次測驗的狀態（後驗分布、已出過的題目）"""
+
+    def __init__(self, engine, theta0, se_target, max_items, rng, user=None, prior_sd=PRIOR_SD):
+        self.engine = engine
+        self.user = user
+        self.se_target = se_target
+        self.max_items = max_items
+        self.rng = rng
+        self.log_post = [-0.5 * ((t - theta0) / prior_sd) ** 2 for t in THETA_GRID]
+        self.used = set()
+        self.responses = []
+        self._update_estimate()
+
+    def _update_estimate(self):
+        peak = max(self.log_post)
+        weights = [math.exp(v - peak) for v in self.log_post]
+        total = sum(weights)
+        mean = sum(w * t for w, t in zip(weights, THETA_GRID)) / total
+        var = sum(w * (t - mean) ** 2 for w, t in zip(weights, THETA_GRID)) / total
+        self.theta, self.se = mean, math.sqrt(var)
+
+    @property
+    def done(self):
+        return len(self.responses) >= self.max_items or (bool(self.responses) and self.se <= self.se_target)
+
+    def next_item(self, randomesque=RANDOMESQUE):
+        """目前能力格點上資訊量最大（前 randomesque 名中隨機一題）且還沒出過的題目；題目用完回傳 None"""
+        candidates = []
+        for i in self.engine.ranked[self.engine.bucket(self.theta)]:
+            if i not in self.used:
+                candidates.append(i)
+                if len(candidates) >= randomesque:
+                    break
+        if not candidates:
+            return None
+        return self.engine.ids[self.rng.choice(candidates)]
+
+    def record(self, qid, correct):
+        """記錄作答並更新能力估計"""
+        i = self.engine.index[qid]
+        self.used.add(i)
+        self.responses.append((qid, bool(correct)))
+        table = self.engine.log_p[i] if correct else self.engine.log_q[i]
+        self.log_post = [v + d for v, d in zip(self.log_post, table)]
+        self._update_estimate()
+
+    def to_dict(self):
+        return {
+            "theta": round(self.theta, 4),
+            "se": round(self.se, 4),
+            "responses": [{"questionId": qid, "correct": ok} for qid, ok in self.responses],
+        }
+
+
+def simulate(engine, students, max_items, seed):
+    """模擬能力 ~ N(0, 1) 的學生，回傳適性 / 隨機出題的估計誤差與出題耗時"""
+    rng = random.Random(seed)
+    results = {"adaptive": [], "random": []}
+    lengths = []
+    select_time, selections = 0.0, 0
+    for _ in range(students):
+        true_theta = rng.gauss(0, 1)
+
+        def answer(qid):
+            a, b = engine.params[engine.index[qid]]
+            return rng.random() < sigmoid(a * (true_theta - b))
+
+        session = engine.session(theta0=0.0, max_items=max_items, rng=rng)
+        while not session.done:
+            started = time.perf_counter()
+            qid = session.next_item()
+            select_time += time.perf_counter() - started
+            selections += 1
+            if qid is None:
+                break
+            session.record(qid, answer(qid))
+        results["adaptive"].append(session.theta - true_theta)
+        lengths.append(len(session.responses))
+
+        fixed = engine.session(theta0=0.0, max_items=len(session.responses), rng=rng)
+        for qid in rng.sample(engine.ids, len(session.responses)):
+            fixed.record(qid, answer(qid))
+        results["random"].append(fixed.theta - true_theta)
+
+    rmse = {k: math.sqrt(sum(e * e for e in v) / len(v)) for k, v in results.items()}
+    return rmse, statistics.mean(lengths), select_time / max(1, selections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="電腦化適性測驗引擎")
+    parser.add_argument("--params", default=PARAMS_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_sim = sub.add_parser("simulate", help="模擬學生作答，比較適性與隨機出題")
+    p_sim.add_argument("--grade", type=int)
+    p_sim.add_argument("--students", type=int, default=500)
+    p_sim.add_argument("--max-items", type=int, default=MAX_ITEMS)
+    p_sim.add_argument("--seed", type=int, default=0)
+    p_sim.add_argument("--synthetic", action="store_true", help="不用參數檔，每題隨機抽 2PL 參數")
+    args = parser.parse_args()
+
+    started = time.time()
+    questions = load_bank()
+    items = synthetic_params(questions, args.seed) if args.synthetic else None
+    engine = CatEngine(grade=args.grade, questions=questions, params_path=args.params, items=items, ability_path=None)
+    source = "隨機 2PL 參數" if args.synthetic else f"已校準 {engine.calibrated} 題"
+    print(
+        f"題目 {len(engine.ids)} 題（{source}），"
+        f"能力格點 {len(THETA_GRID)} 個，建表 {time.time() - started:.2f} 秒"
+    )
+    rmse, mean_length, per_select = simulate(engine, args.students, args.max_items, args.seed)
+    print(f"模擬 {args.students} 位學生，平均出 {mean_length:.1f} 題（SE ≤ {SE_TARGET} 或 {args.max_items} 題結束）")
+    print(f"  能力估計 RMSE：適性 {rmse['adaptive']:.3f}、同題數隨機出題 {rmse['random']:.3f}")
+    print(f"  每次選題平均 {per_select * 1e6:.1f} 微秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+詳解與答案數值一致性檢查 - 詳解算出的最後結果要等於正確選項
+
+用法：
+  python3 scripts/check-explanation-answers.py            # 檢查整個題庫
+  python3 scripts/check-explanation-answers.py --strict   # 有不一致時回傳非 0（供建置流程使用）
+  python3 scripts/check-explanation-answers.py --workers 4
+
+取詳解的最後結果：
+  1. 最後一個「答案：…」/「答案是 …」之後的文字（「答案：B (24)」同時比對選項字母）
+  2. 沒有「答案」字樣時，取最後一行算式第一個「=」或「≈」之後的文字
+選項的數字須是結果數字串的開頭或結尾（反之亦可），中間算式不影響判斷。
+數字經 numeric.py 正規化（分數、帶分數、小數、百分比、略過單位）後與 options[answer] 比較。
+題庫切成多批，由多個行程平行檢查。
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from bank_io import SCRIPTS_DIR, load_bank
+from numeric import APPROX_TOLERANCE, EXACT_TOLERANCE, format_number, is_approx, numbers, same_values
+
+REPORT_PATH = os.path.join(SCRIPTS_DIR, "explanation-answer-report.json")
+BATCH_SIZE = 200
+
+ANSWER_RE = re.compile(r"答案\s*(?:是|為|：|:)\s*([^\n]*)")
+LETTER_RE = re.compile(r"^([A-D])(?![A-Za-z])\s*[\(（]?")
+RESULT_SPLIT_RE = re.compile(r"[=＝≈]")
+
+
+def final_result(explanation):
+    """詳解的最後結果 → (選項字母或 None, 結果文字)；找不到回傳 None"""
+    matches = ANSWER_RE.findall(explanation or "")
+    if matches:
+        text = matches[-1].strip()
+        letter = LETTER_RE.match(text)
+        if letter:
+            return letter.group(1), text[letter.end():]
+        return None, text
+    lines = [line for line in (explanation or "").splitlines() if RESULT_SPLIT_RE.search(line)]
+    if lines:
+        return None, RESULT_SPLIT_RE.split(lines[-1], maxsplit=1)[1]
+    return None
+
+
+def values_agree(expected, found, tolerance):
+    """較短的一串數字是另一串的開頭或結尾（「30/9≈3.3」對「3.3」、「4/12=1/3」對「1/3」）"""
+    short, long = sorted((expected, found), key=len)
+    n = len(short)
+    return n > 0 and (same_values(short, long[:n], tolerance) or same_values(short, long[-n:], tolerance))
+
+
+def check_question(q):
+    """回傳 (狀態, 細節)；狀態：ok / mismatch / letter / no-result / non-numeric"""
+    options = q.get("options") or []
+    answer = q.get("answer")
+    if not isinstance(answer, int) or not 0 <= answer < len(options):
+        return "non-numeric", None
+    expected = numbers(options[answer])
+    if not expected:
+        return "non-numeric", None
+
+    result = final_result(q.get("explanation"))
+    if result is None:
+        return "no-result", None
+    letter, text = result
+    if letter and ord(letter) - ord("A") != answer:
+        return "letter", {"explanationLetter": letter, "answerLetter": chr(ord("A") + answer)}
+
+    found = numbers(text)
+    if not found:
+        return ("ok", None) if letter else ("no-result", None)
+
+    tolerance = APPROX_TOLERANCE if is_approx(options[answer]) or is_approx(text) else EXACT_TOLERANCE
+    if values_agree(expected, found, tolerance):
+        return "ok", None
+
+    # 詳解的結果是否剛好是另一個選項（多半是答案索引標錯）
+    points_to = None
+    for i, option in enumerate(options):
+        if i != answer and values_agree(numbers(option), found, tolerance):
+            points_to = chr(ord("A") + i)
+            break
+    return "mismatch", {
+        "option": options[answer],
+        "explanationResult": text.strip()[:60],
+        "expected": [format_number(v) for v in expected],
+        "found": [format_number(v) for v in found],
+        "matchesOption": points_to,
+    }
+
+
+def check_batch(batch):
+    results = []
+    for q in batch:
+        status, detail = check_question(q)
+        results.append((q["id"], q.get("category", ""), status, detail))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="檢查詳解結果與正確選項是否一致")
+    parser.add_argument("--workers", type=int, default=None, help="平行行程數（預設 CPU 核心數）")
+    parser.add_argument("--output", default=REPORT_PATH)
+    parser.add_argument("--strict", action="store_true", help="有不一致時以非 0 結束")
+    args = parser.parse_args()
+
+    started = time.time()
+    questions = load_bank()
+    batches = [questions[i:i + BATCH_SIZE] for i in range(0, len(questions), BATCH_SIZE)]
+
+    with Pool(args.workers) as pool:
+        results = [r for batch in pool.imap(check_batch, batches) for r in batch]
+
+    status_counts = Counter(status for _, _, status, _ in results)
+    problems = [
+        {"id": qid, "category": category, "type": status, **detail}
+        for qid, category, status, detail in results
+        if status in ("mismatch", "letter")
+    ]
+    by_category = Counter(p["category"] for p in problems)
+
+    report = {
+        "checkedAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "total": len(questions),
+        "summary": dict(status_counts),
+        "byCategory": dict(by_category.most_common()),
+        "problems": problems,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"檢查 {len(questions)} 題（{time.time() - started:.1f} 秒）")
+    print(f"  ✅ 一致: {status_counts['ok']}")
+    print(f"  ❌ 數值不一致: {status_counts['mismatch']}")
+    print(f"  ❌ 選項字母不一致: {status_counts['letter']}")
+    print(f"  ⏭️ 詳解無最後結果: {status_counts['no-result']}，非數值選項: {status_counts['non-numeric']}")
+    if by_category:
+        print("\n不一致最多的題型:")
+        for category, n in by_category.most_common(10):
+            print(f"  {category}: {n}")
+    print(f"\n報告已儲存到 {os.path.basename(args.output)}")
+
+    if args.strict and problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+全班試卷批次組卷 - 一次為全班每位學生各組一份「題目不同、配額相同」的試卷
+
+用法：
+  python3 scripts/class_papers.py --grade 5 --students 40 --count 20
+  python3 scripts/class_papers.py --grade 6 --roster class_members.csv --class-id <uuid> \\
+      --answers answers.csv --mix easy=6,medium=8,hard=6 --output papers.json
+  python3 scripts/class_papers.py --grade 5 --students 30 --categories 分數加減,分數乘除,小數運算
+
+規則：
+  - 每份試卷各層（難度 × 題型）的題數相同；--mix 省略時依題庫中該年級的難度比例
+  - 學生做過的題目（answers 匯出檔中該學生的 question_id）不會再出現
+  - 相鄰座號（名單順序）的兩份試卷盡量不重複題目，全班題目使用次數盡量平均
+
+作法：先把題庫依層建好索引（每層一個打亂過的環狀清單），每層一個游標；
+每份試卷從游標往後取題，跳過做過的、本卷已有的、上一份試卷有的題目，取完游標往後移。
+全班只掃一次題庫，之後每題的成本與該層大小無關（除非大多數題目都被跳過）。
+層內題目不夠時改從同難度的其他層補，並在報告中列出（substitutions）。
+"""
+
+import argparse
+import json
+import random
+from collections import Counter, defaultdict
+
+from bank_io import load_bank
+from export_reader import iter_chunks
+from quota_planner import largest_remainder
+
+DIFFICULTY_ORDER = ["easy", "medium", "hard"]
+# 與前幾份試卷比較重複（1 = 只看座號相鄰的上一份）
+NEIGHBOR_SPAN = 1
+
+
+def parse_mix(text):
+    """"easy=6,medium=8,hard=6" → {"easy": 6, ...}"""
+    mix = {}
+    for part in text.split(","):
+        key, _, n = part.partition("=")
+        mix[key.strip()] = int(n)
+    return mix
+
+
+def load_roster(path, class_id=None):
+    """class_members 匯出檔 → 依加入順序的 user_id 清單"""
+    students = []
+    for chunk in iter_chunks(path, "class_members"):
+        for row in chunk:
+            if class_id and row.get("class_id") != class_id:
+                continue
+            if row.get("user_id") and row["user_id"] not in students:
+                students.append(row["user_id"])
+    return students
+
+
+def load_seen(path, students):
+    """answers 匯出檔 → {user_id: 做過的題目 ID 集合}（只保留名單中的學生）"""
+    wanted = set(students)
+    seen = defaultdict(set)
+    for chunk in iter_chunks(path, "answers"):
+        for row in chunk:
+            user = row.get("user_id")
+            if user in wanted and row.get("question_id"):
+                seen[user].add(row["question_id"])
+    return seen
+
+
+class StratumCursor:
+    """一層的題目：打亂後的環狀清單 + 游標（輪流取題，使用次數自然平均）"""
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.pos = 0
+
+    def take(self, exclude, avoid):
+        """取一題：不可在 exclude 中，盡量不在 avoid 中；沒有可用的題目回傳 None"""
+        fallback = None
+        n = len(self.ids)
+        for step in range(n):
+            i = (self.pos + step) % n
+            qid = self.ids[i]
+            if qid in exclude:
+                continue
+            if qid in avoid:
+                if fallback is None:
+                    fallback = i
+                continue
+            self.pos = i + 1
+            return qid
+        if fallback is not None:
+            self.pos = fallback + 1
+            return self.ids[fallback]
+        return None
+
+
+def build_strata(questions, grade, categories=None, seed=0):
+    """(難度, 題型) → StratumCursor"""
+    rng = random.Random(seed)
+    strata = defaultdict(list)
+    for q in questions:
+        if q.get("grade") != grade:
+            continue
+        if categories and q.get("category") not in categories:
+            continue
+        strata[(q.get("difficulty"), q.get("category"))].append(q["id"])
+    cursors = {}
+    for key in sorted(strata, key=lambda k: (str(k[0]), str(k[1]))):
+        ids = sorted(strata[key])
+        rng.shuffle(ids)
+        cursors[key] = StratumCursor(ids)
+    return cursors
+
+
+def paper_quota(strata, count, mix=None):
+    """每份試卷各層的題數：先依 mix（或題庫比例）分難度，再依各層大小分題型"""
+    by_difficulty = defaultdict(dict)
+    for (difficulty, category), cursor in strata.items():
+        by_difficulty[difficulty][category] = len(cursor.ids)
+    if mix is None:
+        mix = largest_remainder(count, {d: sum(c.values()) for d, c in by_difficulty.items()})
+    elif sum(mix.values()) != count:
+        raise ValueError(f"--mix 總和 {sum(mix.values())} 不等於每份題數 {count}")
+
+    quota = {}
+    for difficulty, n in mix.items():
+        if n and not by_difficulty.get(difficulty):
+            raise ValueError(f"沒有 {difficulty} 難度的題目")
+        for category, k in largest_remainder(n, by_difficulty.get(difficulty, {})).items():
+            if k:
+                quota[(difficulty, category)] = k
+    return quota
+
+
+def assemble(students, strata, quota, seen=None):
+    """依名單順序組卷，回傳 (試卷清單, 統計)"""
+    seen = seen or {}
+    papers = []
+    usage = Counter()
+    substitutions = []
+    recent = []  # 前 NEIGHBOR_SPAN 份試卷的題目集合
+    order = sorted(quota, key=lambda k: (DIFFICULTY_ORDER.index(k[0]) if k[0] in DIFFICULTY_ORDER else 99, str(k[1])))
+
+    for student in students:
+        paper = []
+        in_paper = set()
+        exclude = seen.get(student, set())
+        avoid = set().union(*recent) if recent else set()
+        for key in order:
+            for _ in range(quota[key]):
+                qid = strata[key].take(exclude | in_paper, avoid)
+                if qid is None:
+                    # 這層不夠，從同難度的其他層補
+                    for other in sorted((k for k in strata if k[0] == key[0] and k != key), key=lambda k: str(k[1])):
+                        qid = strata[other].take(exclude | in_paper, avoid)
+                        if qid is not None:
+                            substitutions.append({"student": student, "stratum": list(key), "usedStratum": list(other)})
+                            break
+                if qid is None:
+                    raise ValueError(f"{student} 的 {key[0]} 難度題目不夠（做過的題目太多）")
+                paper.append(qid)
+                in_paper.add(qid)
+                usage[qid] += 1
+        papers.append({"student": student, "questionIds": paper})
+        recent = (recent + [in_paper])[-NEIGHBOR_SPAN:]
+
+    overlaps = [
+        len(set(a["questionIds"]) & set(b["questionIds"]))
+        for a, b in zip(papers, papers[1:])
+    ]
+    stats = {
+        "distinctQuestions": len(usage),
+        "maxUsage": max(usage.values(), default=0),
+        "neighborOverlapMax": max(overlaps, default=0),
+        "neighborOverlapMean": round(sum(overlaps) / len(overlaps), 2) if overlaps else 0,
+        "substitutions": substitutions,
+    }
+    return papers, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="全班試卷批次組卷")
+    parser.add_argument("--grade", type=int, required=True)
+    parser.add_argument("--count", type=int, default=20, help="每份試卷題數（預設 20）")
+    parser.add_argument("--students", type=int, help="沒有名單時，要組幾份試卷")
+    parser.add_argument("--roster", help="class_members 匯出檔（.csv / .jsonl / .db）")
+    parser.add_argument("--class-id", help="只取名單中這個班級的學生")
+    parser.add_argument("--answers", help="answers 匯出檔，排除每位學生做過的題目")
+    parser.add_argument("--mix", help="每份試卷的難度題數，如 easy=6,medium=8,hard=6")
+    parser.add_argument("--categories", help="只用這些題型（逗號分隔）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="class-papers.json")
+    args = parser.parse_args()
+
+    if args.roster:
+        students = load_roster(args.roster, args.class_id)
+    elif args.students:
+        students = [f"paper-{i:02d}" for i in range(1, args.students + 1)]
+    else:
+        raise SystemExit("❌ 請指定 --roster 或 --students")
+    if not students:
+        raise SystemExit("❌ 名單中沒有學生")
+    seen = load_seen(args.answers, students) if args.answers else {}
+
+    categories = set(args.categories.split(",")) if args.categories else None
+    strata = build_strata(load_bank(), args.grade, categories, args.seed)
+    try:
+        quota = paper_quota(strata, args.count, parse_mix(args.mix) if args.mix else None)
+        papers, stats = assemble(students, strata, quota, seen)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+
+    print(f"{len(students)} 份試卷 × {args.count} 題（{args.grade} 年級，{len(quota)} 層）")
+    for difficulty in DIFFICULTY_ORDER:
+        n = sum(k for (d, _), k in quota.items() if d == difficulty)
+        if n:
+            print(f"  {difficulty}: 每份 {n} 題")
+    print(f"  用到 {stats['distinctQuestions']} 題，單題最多出現在 {stats['maxUsage']} 份試卷")
+    print(f"  相鄰試卷重複題數：平均 {stats['neighborOverlapMean']}、最多 {stats['neighborOverlapMax']}")
+    if stats["substitutions"]:
+        print(f"  ⚠️ {len(stats['substitutions'])} 題因該層題目不夠改用同難度其他題型")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "grade": args.grade,
+                "count": args.count,
+                "quota": [{"difficulty": d, "category": c, "count": k} for (d, c), k in sorted(quota.items(), key=str)],
+                "papers": papers,
+                "stats": stats,
+            },
+            f, ensure_ascii=False, indent=2,
+        )
+    print(f"已儲存到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
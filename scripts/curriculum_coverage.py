@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+課綱單元覆蓋率 - 把題庫的每一題對應到 questions-grade5*/6*.json 的課綱單元，找出缺題與過多的單元
+
+用法：
+  python3 scripts/curriculum_coverage.py                   # 增量更新並輸出報告
+  python3 scripts/curriculum_coverage.py --full            # 忽略快取全部重算
+  python3 scripts/curriculum_coverage.py --unit 5:植樹問題  # 列出對應到某單元的題目
+
+對應方式（稀疏矩陣：單元 × 題目，只存有對應的格子）：
+  - 題型對應：題目的 category 等於單元名稱，或去掉「進階 / 強化 / 挑戰…」後的主題名
+  - 關鍵字對應：每個單元從自己的題目中挑出最有鑑別度的二字詞，題幹命中 2 個以上就算對應
+  - 只對應同年級的單元
+兩種對應都先建好倒排表（關鍵字 → 單元、題型 → 單元），每題只查自己用到的詞。
+
+增量更新：scripts/curriculum-coverage-cache.json 記下每個單元關鍵字的雜湊與每題的內容雜湊，
+只有內容變過的題目重算整列，只有關鍵字變過的單元重算整欄。
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import math
+import os
+import re
+import statistics
+from collections import Counter, defaultdict
+
+from bank_io import SCRIPTS_DIR, content_hash, data_path, load_bank
+from question_search import tokenize
+
+CACHE_PATH = os.path.join(SCRIPTS_DIR, "curriculum-coverage-cache.json")
+REPORT_PATH = os.path.join(SCRIPTS_DIR, "curriculum-coverage.json")
+UNIT_FILE_PATTERN = "questions-grade[56]*.json"
+
+KEYWORDS_PER_UNIT = 8
+# 超過這個比例的單元都會用到的詞（如「多少」「請問」）不當關鍵字
+MAX_UNIT_SHARE = 0.1
+MIN_KEYWORD_HITS = 2
+CATEGORY_SCORE = 3
+# 題數低於同年級單元中位數的 GAP_RATIO 倍算缺題，高於 OVER_RATIO 倍算過多
+GAP_RATIO = 0.5
+OVER_RATIO = 3
+UNIT_SUFFIX_RE = re.compile(r"(?:最終|進階|強化|挑戰|基礎|綜合|應用|計算|運算|[二三四五])+$")
+
+
+def terms(text):
+    """中文二字詞集合（同 question_search 的斷詞，去掉單字、數字與英文）"""
+    return {t for t in tokenize(text) if len(t) == 2 and "㐀" <= t[0] <= "﫿"}
+
+
+def base_name(name):
+    """「雞兔問題進階」→「雞兔問題」；全部都是修飾詞（如「綜合應用三」）時回傳空字串"""
+    return UNIT_SUFFIX_RE.sub("", name)
+
+
+def load_units(pattern=UNIT_FILE_PATTERN):
+    """{"5:分數加減": {"grade", "name", "questions"}}；同年級同名單元合併"""
+    units = {}
+    for path in sorted(glob.glob(data_path(pattern))):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for unit in data["units"]:
+            key = f"{data['grade']}:{unit['name']}"
+            entry = units.setdefault(key, {"grade": data["grade"], "name": unit["name"], "questions": []})
+            entry["questions"].extend(unit.get("questions", []))
+    return units
+
+
+def unit_profiles(units):
+    """單元 → {"grade", "categories", "keywords", "hash"}"""
+    unit_terms = {}
+    for key, unit in units.items():
+        counts = Counter()
+        for q in unit["questions"]:
+            counts.update(terms(q.get("content", "")))
+        unit_terms[key] = counts
+    df = Counter()
+    for counts in unit_terms.values():
+        df.update(counts.keys())
+
+    n_units = len(units)
+    max_df = max(1, int(n_units * MAX_UNIT_SHARE))
+    profiles = {}
+    for key, unit in units.items():
+        counts = unit_terms[key]
+        n = max(1, len(unit["questions"]))
+        ranked = sorted(
+            (t for t, c in counts.items() if c >= 2 and df[t] <= max_df),
+            key=lambda t: (-counts[t] / n * math.log(n_units / df[t]), t),
+        )
+        keywords = set(ranked[:KEYWORDS_PER_UNIT])
+        base = base_name(unit["name"])
+        keywords |= {t for t in terms(base) if df[t] <= max_df}
+        categories = sorted({unit["name"], base} - {""})
+        profile = {"grade": unit["grade"], "categories": categories, "keywords": sorted(keywords)}
+        profile["hash"] = hashlib.sha1(json.dumps(profile, ensure_ascii=False).encode("utf-8")).hexdigest()[:12]
+        profiles[key] = profile
+    return profiles
+
+
+class UnitIndex:
+    """關鍵字 → 單元、(年級, 題型) → 單元 的倒排表"""
+
+    def __init__(self, profiles):
+        self.by_keyword = defaultdict(set)
+        self.by_category = defaultdict(set)
+        for key, p in profiles.items():
+            for t in p["keywords"]:
+                self.by_keyword[(p["grade"], t)].add(key)
+            for c in p["categories"]:
+                self.by_category[(p["grade"], c)].add(key)
+
+    def match(self, q, only=None):
+        """題目 → {單元: 分數}；only 為單元集合時只算這些單元"""
+        grade = q.get("grade")
+        hits = Counter()
+        for t in terms(q.get("content", "")):
+            hits.update(self.by_keyword.get((grade, t), ()))
+        row = {key: n for key, n in hits.items() if n >= MIN_KEYWORD_HITS}
+        for key in self.by_category.get((grade, q.get("category")), ()):
+            row[key] = hits.get(key, 0) + CATEGORY_SCORE
+        if only is not None:
+            row = {key: s for key, s in row.items() if key in only}
+        return row
+
+
+def load_cache(path=CACHE_PATH):
+    if not os.path.exists(path):
+        return {"units": {}, "items": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def update_matrix(questions, profiles, cache):
+    """增量更新稀疏矩陣，回傳 (新快取, 統計)；矩陣在 cache["items"][qid]["row"]"""
+    index = UnitIndex(profiles)
+    old_units = cache.get("units", {})
+    changed_units = {k for k, p in profiles.items() if old_units.get(k) != p["hash"]}
+    removed_units = set(old_units) - set(profiles)
+    stats = Counter(changedUnits=len(changed_units), removedUnits=len(removed_units))
+
+    old_items = cache.get("items", {})
+    items = {}
+    for q in questions:
+        h = content_hash(q) + f":{q.get('grade')}:{q.get('category')}"
+        entry = old_items.get(q["id"])
+        if entry is None or entry["hash"] != h:
+            row = index.match(q)
+            stats["recomputedItems"] += 1
+        elif changed_units or removed_units:
+            row = {k: s for k, s in entry["row"].items() if k not in changed_units and k not in removed_units}
+            row.update(index.match(q, only=changed_units))
+            stats["reusedItems"] += 1
+        else:
+            row = entry["row"]
+            stats["reusedItems"] += 1
+        items[q["id"]] = {"hash": h, "row": row}
+    stats["removedItems"] = len(set(old_items) - set(items))
+    return {"units": {k: p["hash"] for k, p in profiles.items()}, "items": items}, stats
+
+
+def coverage_report(units, profiles, matrix, questions):
+    """每個單元的題數，以及缺題 / 過多 / 沒有對應單元的題目"""
+    columns = defaultdict(list)
+    for qid, entry in matrix.items():
+        for key in entry["row"]:
+            columns[key].append(qid)
+    bank_ids = {q["id"] for q in questions}
+
+    rows = {}
+    for key, unit in units.items():
+        rows[key] = {
+            "grade": unit["grade"],
+            "name": unit["name"],
+            "matched": len(columns[key]),
+            "unitQuestionsInBank": sum(1 for q in unit["questions"] if q.get("id") in bank_ids),
+            "keywords": profiles[key]["keywords"],
+        }
+
+    gaps, over = [], []
+    for grade in sorted({u["grade"] for u in units.values()}):
+        keys = [k for k in rows if rows[k]["grade"] == grade]
+        median = statistics.median(rows[k]["matched"] for k in keys)
+        for k in keys:
+            rows[k]["relative"] = round(rows[k]["matched"] / median, 2) if median else None
+            if rows[k]["matched"] < GAP_RATIO * median:
+                gaps.append(k)
+            elif rows[k]["matched"] > OVER_RATIO * median:
+                over.append(k)
+
+    unmatched = sorted(qid for qid, entry in matrix.items() if not entry["row"])
+    return {
+        "units": rows,
+        "gaps": sorted(gaps, key=lambda k: rows[k]["matched"]),
+        "overRepresented": sorted(over, key=lambda k: -rows[k]["matched"]),
+        "unmatchedQuestions": unmatched,
+        "cells": sum(len(entry["row"]) for entry in matrix.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="課綱單元覆蓋率")
+    parser.add_argument("--full", action="store_true", help="忽略快取全部重算")
+    parser.add_argument("--unit", help="列出對應到這個單元的題目（格式：年級:單元名稱）")
+    parser.add_argument("--output", default=REPORT_PATH)
+    args = parser.parse_args()
+
+    units = load_units()
+    profiles = unit_profiles(units)
+    questions = load_bank()
+    cache = {"units": {}, "items": {}} if args.full else load_cache()
+    cache, stats = update_matrix(questions, profiles, cache)
+    with open(CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, separators=(",", ":"))
+
+    if args.unit:
+        if args.unit not in units:
+            raise SystemExit(f"❌ 找不到單元 {args.unit}")
+        by_id = {q["id"]: q for q in questions}
+        matched = sorted(
+            ((entry["row"][args.unit], qid) for qid, entry in cache["items"].items() if args.unit in entry["row"]),
+            reverse=True,
+        )
+        print(f"{args.unit}（關鍵字：{'、'.join(profiles[args.unit]['keywords'])}）對應 {len(matched)} 題")
+        for score, qid in matched:
+            print(f"  [{score}] {qid} {by_id[qid]['category']} | {by_id[qid]['content'][:40]}")
+        return
+
+    report = coverage_report(units, profiles, cache["items"], questions)
+    print(f"課綱單元 {len(units)} 個 × 題目 {len(questions)} 題，對應 {report['cells']} 格")
+    print(
+        f"  重算 {stats['recomputedItems']} 題、沿用 {stats['reusedItems']} 題，"
+        f"關鍵字變動的單元 {stats['changedUnits']} 個"
+    )
+    rows = report["units"]
+    print(f"\n⚠️ 缺題單元（少於同年級中位數的 {GAP_RATIO:.0%}）: {len(report['gaps'])}")
+    for k in report["gaps"]:
+        print(f"  {k}: {rows[k]['matched']} 題（單元本身在題庫中 {rows[k]['unitQuestionsInBank']} 題）")
+    print(f"\n⚠️ 題數過多單元（超過同年級中位數的 {OVER_RATIO} 倍）: {len(report['overRepresented'])}")
+    for k in report["overRepresented"]:
+        print(f"  {k}: {rows[k]['matched']} 題")
+    print(f"\n沒有對應任何單元的題目: {len(report['unmatchedQuestions'])} 題")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"報告已儲存到 {os.path.basename(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Supabase 匯出資料分批讀取 - 支援 CSV / JSONL / SQLite
+
+大量資料（上千萬列）以固定大小的批次讀入，記憶體用量與檔案大小無關。
+"""
+
+import csv
+import json
+import os
+import sqlite3
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+SQLITE_EXTS = (".db", ".sqlite", ".sqlite3")
+
+
+def iter_chunks(path, table, chunk_size=DEFAULT_CHUNK_SIZE):
+    """依副檔名選擇讀取方式，每次產出一批 dict 列"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        rows = _iter_csv(path)
+    elif ext in (".jsonl", ".ndjson"):
+        rows = _iter_jsonl(path)
+    elif ext in SQLITE_EXTS:
+        yield from _iter_sqlite(path, table, chunk_size)
+        return
+    else:
+        raise ValueError(f"不支援的匯出格式: {path}（請用 .csv / .jsonl / .db）")
+
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_csv(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def _iter_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _iter_sqlite(path, table, chunk_size):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        cur = conn.execute(f'SELECT * FROM "{table}"')
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [dict(r) for r in rows]
+    finally:
+        conn.close()
+
+
+def to_bool(value):
+    """Supabase 匯出的布林值可能是 true / t / 1 / True"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    return str(value).strip().lower() in ("true", "t", "1", "yes")
+
+
+def to_int(value, default=0):
+    if value is None or value == "":
+        return default
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
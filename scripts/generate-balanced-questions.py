@@ -7,6 +7,9 @@
 import json
 import random
 
+from answer_shuffle import AnswerShuffler
+from id_allocator import lease
+
 # 需要補充的類別和對應的題目模板
 QUESTION_TEMPLATES = {
     # ===== 五年級 EASY =====
@@ -597,14 +600,16 @@ QUESTION_TEMPLATES = {
 def generate_questions():
     """生成 200 題均衡難度的題目"""
     all_questions = []
-    question_id = 2000  # 從 2000 開始編號避免衝突
+    shuffle = AnswerShuffler(seed="bal")
+    # 向 ID 註冊表租用區段（原本固定從 2001 開始編號）
+    ids = iter(lease("bal-", sum(len(t) for t in QUESTION_TEMPLATES.values()), floor=2001))
     
     for category_key, templates in QUESTION_TEMPLATES.items():
         grade, difficulty = category_key.split('-')
         grade_num = int(grade)
         
         for template in templates:
-            question_id += 1
+            question_id = next(ids)
             q = {
                 "id": f"bal-{question_id}",
                 "content": template["content"],
@@ -616,7 +621,7 @@ def generate_questions():
                 "source": "均衡補充",
                 "explanation": template["explanation"]
             }
-            all_questions.append(q)
+            all_questions.append(shuffle(q))
     
     return all_questions
 
@@ -7,6 +7,9 @@
 import json
 import random
 
+from answer_shuffle import AnswerShuffler
+from id_allocator import lease
+
 ADDITIONAL_QUESTIONS = [
     # ===== 更多 EASY 五年級 =====
     {"grade": 5, "difficulty": "easy", "category": "分數加減", "content": "計算：2/5 + 1/5 = ?", "options": ["3/5", "3/10", "1/5", "2/10"], "answer": 0, "explanation": "分母相同直接加分子：2/5 + 1/5 = 3/5"},
@@ -99,11 +102,12 @@ ADDITIONAL_QUESTIONS = [
 
 def main():
     questions = []
-    base_id = 3000
+    shuffle = AnswerShuffler(seed="add")
+    ids = lease("add-", len(ADDITIONAL_QUESTIONS), floor=3000)
     
-    for i, q in enumerate(ADDITIONAL_QUESTIONS):
-        questions.append({
-            "id": f"add-{base_id + i}",
+    for qid, q in zip(ids, ADDITIONAL_QUESTIONS):
+        questions.append(shuffle({
+            "id": f"add-{qid}",
             "content": q["content"],
             "options": q["options"],
             "answer": q["answer"],
@@ -112,7 +116,7 @@ def main():
             "difficulty": q["difficulty"],
             "source": "均衡補充2",
             "explanation": q["explanation"]
-        })
+        }))
     
     # 統計
     easy_count = sum(1 for q in questions if q["difficulty"] == "easy")
@@ -122,6 +126,7 @@ def main():
     print(f"- Easy: {easy_count} 題")
     print(f"- Medium: {medium_count} 題")
     print(f"- 總計: {len(questions)} 題")
+    print(f"- 正確答案位置: {shuffle.distribution()}")
     
     # 儲存
     with open("questions-additional.json", "w", encoding="utf-8") as f:
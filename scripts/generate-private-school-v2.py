@@ -7,6 +7,9 @@
 
 import json
 
+from answer_shuffle import AnswerShuffler
+from id_allocator import lease
+
 PRIVATE_SCHOOL_QUESTIONS = [
     # ===== 分數進階應用 =====
     {"grade": 5, "difficulty": "hard", "category": "分數進階", "content": "一桶油，第一天用去 1/4，第二天用去剩下的 1/3，還剩 20 公升，原有多少公升？", "options": ["40", "60", "30", "50"], "answer": 0, "explanation": "設原有 x 公升。第一天後剩 3x/4，第二天用 1/3 後剩 3x/4 × 2/3 = x/2 = 20，x = 40"},
@@ -120,11 +123,12 @@ PRIVATE_SCHOOL_QUESTIONS = [
 
 def main():
     questions = []
-    base_id = 4000
+    shuffle = AnswerShuffler(seed="ps2")
+    ids = lease("ps2-", len(PRIVATE_SCHOOL_QUESTIONS), floor=4000)
     
-    for i, q in enumerate(PRIVATE_SCHOOL_QUESTIONS):
-        questions.append({
-            "id": f"ps2-{base_id + i}",
+    for qid, q in zip(ids, PRIVATE_SCHOOL_QUESTIONS):
+        questions.append(shuffle({
+            "id": f"ps2-{qid}",
             "content": q["content"],
             "options": q["options"],
             "answer": q["answer"],
@@ -133,7 +137,7 @@ def main():
             "difficulty": q["difficulty"],
             "source": "考私中V2",
             "explanation": q["explanation"]
-        })
+        }))
     
     # 統計
     g5 = sum(1 for q in questions if q["grade"] == 5)
@@ -141,6 +145,7 @@ def main():
     
     print(f"考私中題庫 V2 統計：")
     print(f"- 總計: {len(questions)} 題")
+    print(f"- 正確答案位置: {shuffle.distribution()}")
     print(f"- 五年級: {g5} 題")
     print(f"- 六年級: {g6} 題")
     
@@ -5,6 +5,9 @@
 
 import json
 
+from answer_shuffle import AnswerShuffler
+from id_allocator import lease
+
 MORE_QUESTIONS = [
     # ===== 更多分數題 =====
     {"grade": 5, "difficulty": "hard", "category": "分數進階", "content": "一瓶果汁喝了 2/5 後剩 300 毫升，原有多少毫升？", "options": ["500", "450", "600", "400"], "answer": 0, "explanation": "剩下 3/5 = 300，原有 500 毫升"},
@@ -101,11 +104,12 @@ MORE_QUESTIONS = [
 
 def main():
     questions = []
-    base_id = 5000
+    shuffle = AnswerShuffler(seed="ps3")
+    ids = lease("ps3-", len(MORE_QUESTIONS), floor=5000)
     
-    for i, q in enumerate(MORE_QUESTIONS):
-        questions.append({
-            "id": f"ps3-{base_id + i}",
+    for qid, q in zip(ids, MORE_QUESTIONS):
+        questions.append(shuffle({
+            "id": f"ps3-{qid}",
             "content": q["content"],
             "options": q["options"],
             "answer": q["answer"],
@@ -114,10 +118,11 @@ def main():
             "difficulty": q["difficulty"],
             "source": "考私中V3",
             "explanation": q["explanation"]
-        })
+        }))
     
     print(f"考私中題庫 V3：")
     print(f"- 總計: {len(questions)} 題")
+    print(f"- 正確答案位置: {shuffle.distribution()}")
     
     with open("questions-ps-v3.json", "w", encoding="utf-8") as f:
         json.dump({"questions": questions}, f, ensure_ascii=False, indent=2)
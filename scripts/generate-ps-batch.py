@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 """
-考私中題庫大規模擴充 - 批量生成 550 題
+考私中題庫大規模擴充 - 依 BATCH_PLAN 批量生成（驗證、去重後實際寫出的題數可能較少，會印出警告）
 """
 
-import json
 import random
 
+from number_theory import lcm, solve_congruences
+from param_tables import draw
+from pipeline import Pipeline, assign_ids, dedupe, fix_arithmetic, fix_negative_profit, shuffle, validate
+
 # 題目模板庫 - 每個類別多個變體
 TEMPLATES = {
     "分數進階": [
@@ -56,7 +59,6 @@ TEMPLATES = {
 
 def generate_fraction_questions(count):
     """生成分數題"""
-    questions = []
     fractions = ["1/3", "1/4", "1/5", "2/5", "2/3", "3/4", "3/5"]
     remains = [20, 30, 40, 50, 60, 80, 100, 120, 150, 200]
     
@@ -81,13 +83,10 @@ def generate_fraction_questions(count):
             "category": "分數進階",
             "explanation": f"設原有 x 件，根據題意列方程求解，原有 {original} 件"
         }
-        questions.append(q)
-    
-    return questions
+        yield q
 
 def generate_chicken_rabbit_questions(count):
     """生成雞兔同籠題"""
-    questions = []
     
     for i in range(count):
         # 設定雞兔數量
@@ -105,13 +104,10 @@ def generate_chicken_rabbit_questions(count):
             "category": "雞兔同籠",
             "explanation": f"設雞 x 隻，2x + 4({total}-x) = {feet}，解得 x = {chicken}"
         }
-        questions.append(q)
-    
-    return questions
+        yield q
 
 def generate_speed_questions(count):
     """生成速率題"""
-    questions = []
     
     for i in range(count):
         qtype = random.choice(["meet", "chase", "bridge"])
@@ -164,13 +160,10 @@ def generate_speed_questions(count):
                 "explanation": f"行駛 {total_dist} 公尺，時速 {int(speed_kmh)} = {speed_ms} m/s，時間 = {time} 秒"
             }
         
-        questions.append(q)
-    
-    return questions
+        yield q
 
 def generate_work_questions(count):
     """生成工程題"""
-    questions = []
     
     for i in range(count):
         a = random.choice([6, 8, 10, 12, 15, 18, 20])
@@ -179,7 +172,6 @@ def generate_work_questions(count):
             b = random.choice([8, 10, 12, 15, 18, 20, 24, 30])
         
         # 計算合作天數 (a*b)/(a+b)
-        lcm = (a * b) // gcd(a, b)
         coop = (a * b) / (a + b)
         coop_str = f"{a*b}/{a+b}" if coop != int(coop) else str(int(coop))
         
@@ -192,18 +184,10 @@ def generate_work_questions(count):
             "category": "工程問題",
             "explanation": f"合作效率 = 1/{a} + 1/{b}，需 {coop_str} 天"
         }
-        questions.append(q)
-    
-    return questions
-
-def gcd(a, b):
-    while b:
-        a, b = b, a % b
-    return a
+        yield q
 
 def generate_concentration_questions(count):
     """生成濃度題"""
-    questions = []
     
     for i in range(count):
         qtype = random.choice(["dilute", "mix", "add_salt"])
@@ -260,30 +244,17 @@ def generate_concentration_questions(count):
                 "explanation": f"設加 x 克鹽，列方程解得 x ≈ {add_salt}"
             }
         
-        questions.append(q)
-    
-    return questions
+        yield q
 
 def generate_age_questions(count):
     """生成年齡題"""
-    questions = []
     
     for i in range(count):
         qtype = random.choice(["past", "future"])
         
         if qtype == "past":
-            father = random.randint(35, 50)
-            son = random.randint(8, 18)
-            years = random.randint(2, 10)
-            ratio = (father - years) // (son - years) if (son - years) > 0 else 3
-            
-            # 調整使得 ratio 為整數
-            while (father - years) % (son - years) != 0 or ratio > 10:
-                years -= 1
-                if years < 1:
-                    years = 5
-                    father += 5
-            ratio = (father - years) // (son - years)
+            # 從事先列舉的合法組合抽一組（整除、倍數 2~10、幾年前兒子已出生）
+            father, son, years, ratio = draw("age_past")
             age_sum = father + son
             
             q = {
@@ -296,10 +267,7 @@ def generate_age_questions(count):
                 "explanation": f"設兒子 x 歲，({age_sum}-x-{years}) = {ratio}(x-{years})，解得父親 {father} 歲"
             }
         else:
-            mom = random.randint(30, 45)
-            child = random.randint(5, 15)
-            ratio = random.choice([2, 3])
-            years = (mom - ratio * child) // (ratio - 1)
+            mom, child, ratio, years = draw("age_future")
             
             q = {
                 "content": f"媽媽今年 {mom} 歲，女兒 {child} 歲，幾年後媽媽是女兒的 {ratio} 倍？",
@@ -311,13 +279,10 @@ def generate_age_questions(count):
                 "explanation": f"{mom}+x = {ratio}({child}+x)，解得 x = {years}"
             }
         
-        questions.append(q)
-    
-    return questions
+        yield q
 
 def generate_profit_questions(count):
     """生成利潤題"""
-    questions = []
     
     for i in range(count):
         cost = random.choice([50, 60, 80, 100, 120, 150, 200])
@@ -337,13 +302,10 @@ def generate_profit_questions(count):
             "category": "利潤問題",
             "explanation": f"標價 = {cost} × {1+markup/100} = {marked_price}，售價 = {marked_price} × {discount/10} = {sale_price}，利潤 = {profit}"
         }
-        questions.append(q)
-    
-    return questions
+        yield q
 
 def generate_geometry_questions(count):
     """生成幾何題"""
-    questions = []
     
     for i in range(count):
         qtype = random.choice(["trapezoid", "circle", "cylinder", "triangle", "sector"])
@@ -419,13 +381,10 @@ def generate_geometry_questions(count):
                 "explanation": f"扇形面積 = πr² × {angle}/360 = {area}"
             }
         
-        questions.append(q)
-    
-    return questions
+        yield q
 
 def generate_sequence_questions(count):
     """生成數列題"""
-    questions = []
     
     for i in range(count):
         qtype = random.choice(["ap_nth", "ap_sum", "gp_nth"])
@@ -477,23 +436,19 @@ def generate_sequence_questions(count):
                 "explanation": f"第 n 項 = {a} × {r}^({n}-1) = {nth}"
             }
         
-        questions.append(q)
-    
-    return questions
+        yield q
 
 def generate_ratio_questions(count):
     """生成比例題"""
-    questions = []
     
     for i in range(count):
         qtype = random.choice(["divide", "scale"])
         
         if qtype == "divide":
-            r1, r2, r3 = random.randint(1, 5), random.randint(2, 6), random.randint(1, 5)
-            total = random.choice([100, 150, 200, 240, 300, 360, 400, 500])
-            # 調整使得能整除
+            # 總數為總份數的整數倍，四個選項互不相同
+            r1, r2, r3, unit = draw("ratio_divide")
             total_parts = r1 + r2 + r3
-            total = total_parts * random.randint(10, 50)
+            total = total_parts * unit
             b_amount = total * r2 // total_parts
             
             q = {
@@ -520,13 +475,10 @@ def generate_ratio_questions(count):
                 "explanation": f"實際 = {map_dist} × {scale} = {map_dist*scale} 公分 = {real_dist} 公里"
             }
         
-        questions.append(q)
-    
-    return questions
+        yield q
 
 def generate_logic_questions(count):
     """生成邏輯題"""
-    questions = []
     
     templates = [
         {"content": "從 1 到 {n}，{mult} 的倍數有幾個？", "type": "count_mult"},
@@ -554,8 +506,8 @@ def generate_logic_questions(count):
         elif qtype == "count_lcm":
             n = random.choice([100, 200, 500])
             a, b = random.choice([(2, 3), (3, 4), (3, 5), (4, 5), (2, 5)])
-            lcm = (a * b) // gcd(a, b)
-            ans = n // lcm
+            common = lcm(a, b)
+            ans = n // common
             
             q = {
                 "content": f"從 1 到 {n}，既是 {a} 的倍數又是 {b} 的倍數有幾個？",
@@ -564,20 +516,19 @@ def generate_logic_questions(count):
                 "grade": 6,
                 "difficulty": "hard",
                 "category": "邏輯推理",
-                "explanation": f"要是 {lcm} 的倍數，{n}÷{lcm} = {ans} 個"
+                "explanation": f"要是 {common} 的倍數，{n}÷{common} = {ans} 個"
             }
         else:
             a = random.randint(3, 9)
             b = random.randint(3, 9)
             while a == b:
                 b = random.randint(3, 9)
-            r1 = random.randint(1, a-1)
-            r2 = random.randint(1, b-1)
-            # 找最小的數
-            for x in range(1, 1000):
-                if x % a == r1 and x % b == r2:
-                    ans = x
-                    break
+            # 只抽有解的餘數組合（餘數差要是 a、b 最大公因數的倍數）
+            r1, r2 = random.choice([
+                (r1, r2) for r1 in range(1, a) for r2 in range(1, b)
+                if solve_congruences(r1, a, r2, b) is not None
+            ])
+            ans = solve_congruences(r1, a, r2, b)
             
             q = {
                 "content": f"一個數除以 {a} 餘 {r1}、除以 {b} 餘 {r2}，100 以內最小的這個數是？",
@@ -589,13 +540,10 @@ def generate_logic_questions(count):
                 "explanation": f"逐一檢驗，最小的數是 {ans}"
             }
         
-        questions.append(q)
-    
-    return questions
+        yield q
 
 def generate_probability_questions(count):
     """生成機率題"""
-    questions = []
     
     for i in range(count):
         qtype = random.choice(["dice", "ball", "coin"])
@@ -647,13 +595,10 @@ def generate_probability_questions(count):
                 "explanation": f"全反面機率 = 1/{all_tails}，至少一正面 = {prob_at_least_one_head}"
             }
         
-        questions.append(q)
-    
-    return questions
+        yield q
 
 def generate_mixed_questions(count):
     """生成綜合應用題"""
-    questions = []
     
     templates = [
         {
@@ -717,65 +662,46 @@ def generate_mixed_questions(count):
                 "explanation": f"設數為 x，{a}x + {b} = {result}，x = {x}"
             }
         
-        questions.append(q)
-    
-    return questions
+        yield q
+
+# 各題型生成函式與題數
+BATCH_PLAN = [
+    ("分數題", generate_fraction_questions, 50),
+    ("雞兔同籠", generate_chicken_rabbit_questions, 50),
+    ("速率題", generate_speed_questions, 60),
+    ("工程題", generate_work_questions, 40),
+    ("濃度題", generate_concentration_questions, 50),
+    ("年齡題", generate_age_questions, 40),
+    ("利潤題", generate_profit_questions, 40),
+    ("幾何題", generate_geometry_questions, 60),
+    ("數列題", generate_sequence_questions, 40),
+    ("比例題", generate_ratio_questions, 40),
+    ("邏輯題", generate_logic_questions, 40),
+    ("機率題", generate_probability_questions, 40),
+    ("綜合題", generate_mixed_questions, 50),
+]
+
+def generate_all():
+    """依 BATCH_PLAN 逐題產生（惰性，不先建立整批清單）"""
+    for label, generate, count in BATCH_PLAN:
+        print(f"生成{label}...")
+        yield from generate(count)
 
 def main():
-    all_questions = []
-    
-    # 生成各類型題目
-    print("生成分數題...")
-    all_questions.extend(generate_fraction_questions(50))
-    
-    print("生成雞兔同籠...")
-    all_questions.extend(generate_chicken_rabbit_questions(50))
-    
-    print("生成速率題...")
-    all_questions.extend(generate_speed_questions(60))
-    
-    print("生成工程題...")
-    all_questions.extend(generate_work_questions(40))
-    
-    print("生成濃度題...")
-    all_questions.extend(generate_concentration_questions(50))
-    
-    print("生成年齡題...")
-    all_questions.extend(generate_age_questions(40))
-    
-    print("生成利潤題...")
-    all_questions.extend(generate_profit_questions(40))
-    
-    print("生成幾何題...")
-    all_questions.extend(generate_geometry_questions(60))
-    
-    print("生成數列題...")
-    all_questions.extend(generate_sequence_questions(40))
-    
-    print("生成比例題...")
-    all_questions.extend(generate_ratio_questions(40))
-    
-    print("生成邏輯題...")
-    all_questions.extend(generate_logic_questions(40))
-    
-    print("生成機率題...")
-    all_questions.extend(generate_probability_questions(40))
-    
-    print("生成綜合題...")
-    all_questions.extend(generate_mixed_questions(50))
-    
-    # 添加 ID
-    for i, q in enumerate(all_questions):
-        q["id"] = f"ps-batch-{6000 + i}"
-        q["source"] = "考私中批量"
+    # 驗證 → 去重（含現有題庫）→ 修正 → 打亂選項 → 編號 → 寫檔，逐題一次完成
+    pipe = Pipeline(
+        validate(),
+        dedupe(bank=True),
+        fix_negative_profit(),
+        fix_arithmetic(),
+        shuffle(seed="ps-batch"),
+        assign_ids("ps-batch-", floor=6000, source="考私中批量"),
+    )
+    total = pipe.write(generate_all(), "questions-ps-batch.json", expected=sum(n for _, _, n in BATCH_PLAN))
     
     # 統計
-    print(f"\n總計生成 {len(all_questions)} 題")
-    
-    # 儲存
-    with open("questions-ps-batch.json", "w", encoding="utf-8") as f:
-        json.dump({"questions": all_questions}, f, ensure_ascii=False, indent=2)
-    
+    print(f"\n總計生成 {total} 題")
+    pipe.print_stats()
     print("已儲存到 questions-ps-batch.json")
 
 if __name__ == "__main__":
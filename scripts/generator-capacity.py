@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+生成函式容量分析 - 不抽樣，直接列舉各 generate_* 的參數空間，估計要求 n 題時會重複多少
+
+用法：
+  python3 scripts/generator-capacity.py                   # 以 generate-ps-batch.py 的 BATCH_PLAN 題數估計
+  python3 scripts/generator-capacity.py --count 500       # 每個生成函式都要 500 題時
+  python3 scripts/generator-capacity.py --max-dup 0.02    # 重複率上限（決定「建議最多題數」）
+
+容量 = 各題型分支中「題幹不同」的參數組合數（年級不影響題幹，不另計）。
+每個分支被選中的機率相同（對應程式中的 random.choice），分支內各組合機率相同，
+要求 n 題時預期不重複題數 = Σ 分支容量 N × (1 - (1 - p/N)^n)，p 為分支機率。
+參數範圍需與 generate-ps-batch.py 保持一致；查表抽樣的分支直接用 param_tables 的組合數。
+"""
+
+import argparse
+import json
+import os
+from itertools import permutations, product
+
+from bank_io import SCRIPTS_DIR, load_script
+from number_theory import solve_congruences
+from param_tables import load_table
+
+REPORT_PATH = os.path.join(SCRIPTS_DIR, "generator-capacity.json")
+DEFAULT_MAX_DUP = 0.05
+
+
+def distinct(*axes, key=None, where=None):
+    """各軸取值的所有組合中，題幹（key）不同的個數"""
+    keys = set()
+    for combo in product(*axes):
+        if where and not where(*combo):
+            continue
+        keys.add(key(*combo) if key else combo)
+    return len(keys)
+
+
+def r(lo, hi):
+    """random.randint(lo, hi) 的取值範圍"""
+    return range(lo, hi + 1)
+
+
+def branch_sizes():
+    """生成函式 → [(分支, 容量)]，範圍對應 generate-ps-batch.py"""
+    work_a = [6, 8, 10, 12, 15, 18, 20]
+    work_b = [8, 10, 12, 15, 18, 20, 24, 30]
+    fractions = ["1/3", "1/4", "1/5", "2/5", "2/3", "3/4", "3/5"]
+    return {
+        "generate_fraction_questions": [
+            ("fraction_chain", distinct(list(permutations(fractions, 2)), [20, 30, 40, 50, 60, 80, 100, 120, 150, 200])),
+        ],
+        "generate_chicken_rabbit_questions": [
+            # 題幹是總數與腳數，(雞, 兔) 一一對應
+            ("chicken_rabbit", distinct(r(5, 30), r(5, 30), key=lambda c, b: (c + b, 2 * c + 4 * b))),
+        ],
+        "generate_speed_questions": [
+            ("meet", distinct(r(40, 80), r(30, 70), r(2, 6), key=lambda v1, v2, t: ((v1 + v2) * t, v1, v2))),
+            ("chase", distinct(r(50, 80), r(30, 50), r(2, 8), key=lambda v1, v2, t: ((v1 - v2) * t, v1, v2))),
+            ("bridge", distinct([100, 150, 200, 250, 300], [200, 300, 400, 500, 600], [15, 20, 25])),
+        ],
+        "generate_work_questions": [
+            ("work_coop", distinct(work_a, work_b, where=lambda a, b: a != b)),
+        ],
+        "generate_concentration_questions": [
+            ("dilute", distinct([10, 15, 20, 25, 30], [100, 200, 300, 400, 500], [50, 100, 150, 200])),
+            ("mix", distinct([10, 15, 20], [25, 30, 35, 40], [100, 200, 300], [100, 200, 300])),
+            ("add_salt", distinct([10, 15, 20], [200, 300, 400, 500], [25, 30, 35])),
+        ],
+        "generate_age_questions": [
+            ("past", len(set((f + s, y, k) for f, s, y, k in load_table("age_past")))),
+            ("future", len(set((m, c, k) for m, c, k, _ in load_table("age_future")))),
+        ],
+        "generate_profit_questions": [
+            ("profit_chain", distinct([50, 60, 80, 100, 120, 150, 200], [20, 25, 30, 40, 50], [8, 85, 9])),
+        ],
+        "generate_geometry_questions": [
+            ("trapezoid", distinct(r(4, 12), r(8, 20), r(4, 12))),
+            ("circle", distinct(r(3, 10))),
+            ("cylinder", distinct(r(2, 6), r(5, 15))),
+            ("triangle", distinct(r(6, 15), r(4, 12))),
+            ("sector", distinct(r(6, 12), [60, 90, 120])),
+        ],
+        "generate_sequence_questions": [
+            ("ap_nth", distinct(r(1, 10), r(2, 5), r(10, 20))),
+            ("ap_sum", distinct([1, 2, 3], [1, 2, 3], [10, 20, 50, 100])),
+            ("gp_nth", distinct([1, 2, 3], [2, 3], r(4, 6))),
+        ],
+        "generate_ratio_questions": [
+            ("divide", len(load_table("ratio_divide"))),
+            ("scale", distinct([20000, 50000, 100000, 200000], [2, 3, 4, 5, 6, 8, 10])),
+        ],
+        "generate_logic_questions": [
+            ("count_mult", distinct([50, 100, 200, 500, 1000], r(3, 9))),
+            ("count_lcm", distinct([100, 200, 500], [(2, 3), (3, 4), (3, 5), (4, 5), (2, 5)])),
+            # 只抽有解的餘數組合
+            ("divisibility", sum(
+                1 for a in r(3, 9) for b in r(3, 9) if a != b
+                for r1 in r(1, a - 1) for r2 in r(1, b - 1) if solve_congruences(r1, a, r2, b) is not None
+            )),
+        ],
+        "generate_probability_questions": [
+            ("dice", distinct([6, 7, 8, 9, 10, 11])),
+            ("ball", distinct(r(2, 5), r(3, 6))),
+            ("coin", distinct([2, 3, 4])),
+        ],
+        "generate_mixed_questions": [
+            # 每人 b = a + (1~3) 顆，差的顆數 r2 由人數推得
+            ("surplus", distinct(r(3, 6), r(1, 3), r(5, 15), r(1, 10), key=lambda a, k, n, r1: (a, r1, a + k, k * n - r1))),
+            ("reverse", distinct(r(5, 20), r(2, 8), r(2, 5), key=lambda x, a, b: (a, b, (x + a) * b))),
+            ("equation", distinct(r(2, 5), r(10, 30), r(5, 15), key=lambda a, b, x: (a, b, a * x + b))),
+        ],
+    }
+
+
+def expected_unique(branches, n):
+    """n 次抽樣（分支等機率、分支內均勻）預期得到的不重複題數"""
+    p = 1 / len(branches)
+    return sum(size * (1 - (1 - p / size) ** n) for _, size in branches if size)
+
+
+def max_count(branches, max_dup):
+    """預期重複率不超過 max_dup 時最多可要求的題數（二分搜尋）"""
+    capacity = sum(size for _, size in branches)
+    lo, hi = 0, capacity
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if mid - expected_unique(branches, mid) <= max_dup * mid:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成函式容量與重複率估計")
+    parser.add_argument("--count", type=int, help="每個生成函式的題數（預設用 BATCH_PLAN）")
+    parser.add_argument("--max-dup", type=float, default=DEFAULT_MAX_DUP, help="可接受的重複率（預設 0.05）")
+    parser.add_argument("--output", default=REPORT_PATH)
+    args = parser.parse_args()
+
+    planned = {fn.__name__: count for _, fn, count in load_script("generate-ps-batch.py").BATCH_PLAN}
+    report = {}
+    print(f"{'生成函式':<36}{'容量':>6}{'要求':>6}{'預期不重複':>7}{'重複率':>6}{'建議上限':>6}")  # 中文字佔兩格
+    for name, branches in branch_sizes().items():
+        n = args.count or planned.get(name, 0)
+        capacity = sum(size for _, size in branches)
+        unique = expected_unique(branches, n)
+        dup_rate = (n - unique) / n if n else 0
+        limit = max_count(branches, args.max_dup)
+        report[name] = {
+            "capacity": capacity,
+            "branches": dict(branches),
+            "requested": n,
+            "expectedUnique": round(unique, 1),
+            "expectedDuplicateRate": round(dup_rate, 4),
+            "maxCountAtDupRate": limit,
+        }
+        flag = " ⚠️" if n > limit else ""
+        print(f"{name:<40}{capacity:>8}{n:>8}{unique:>12.1f}{dup_rate:>9.1%}{limit:>10}{flag}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"maxDuplicateRate": args.max_dup, "generators": report}, f, ensure_ascii=False, indent=2)
+    print(f"\n⚠️ = 要求題數超過重複率 {args.max_dup:.0%} 的建議上限")
+    print(f"報告已儲存到 {os.path.basename(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
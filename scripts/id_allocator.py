@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+題目 ID 區段分配 - 讓各生成腳本（或平行的多個 worker）拿到互不重疊的 ID
+
+用法（在生成腳本中）：
+  from id_allocator import lease
+  ids = lease("ps-batch-", len(questions), floor=6000)
+  for qid, q in zip(ids, questions):
+      q["id"] = f"ps-batch-{qid}"
+
+命令列：
+  python3 scripts/id_allocator.py status
+  python3 scripts/id_allocator.py lease ps-batch- 100
+
+註冊表是一個 SQLite 檔（scripts/id-registry.db）。每次租用是一條
+UPDATE ... RETURNING 陳述式，由 SQLite 保證原子性，不需要額外的鎖；
+同時執行的腳本各自拿到連續且不重疊的區段，事後不必重新編號。
+某個前綴第一次租用時，從 floor 與題庫中該前綴最大編號 + 1 兩者較大者開始。
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+
+from bank_io import SCRIPTS_DIR, id_sort_key, load_bank
+
+REGISTRY_PATH = os.path.join(SCRIPTS_DIR, "id-registry.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+  prefix TEXT PRIMARY KEY,
+  next_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+  prefix TEXT NOT NULL,
+  start_id INTEGER NOT NULL,
+  end_id INTEGER NOT NULL,
+  owner TEXT,
+  leased_at TEXT NOT NULL
+);
+"""
+
+
+def connect(path=REGISTRY_PATH):
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def bank_next_id(prefix):
+    """題庫中該前綴的最大編號 + 1"""
+    numbers = [n for p, n in (id_sort_key(q["id"]) for q in load_bank()) if p == prefix]
+    return max(numbers) + 1 if numbers else 0
+
+
+def lease(prefix, count, floor=0, owner=None, path=REGISTRY_PATH):
+    """租用 count 個連續編號，回傳 range"""
+    if count <= 0:
+        return range(0)
+    conn = connect(path)
+    try:
+        # 第一次使用此前綴：以題庫現況初始化（INSERT OR IGNORE，多個行程同時初始化也安全）
+        if conn.execute("SELECT 1 FROM counters WHERE prefix = ?", (prefix,)).fetchone() is None:
+            conn.execute(
+                "INSERT OR IGNORE INTO counters (prefix, next_id) VALUES (?, ?)",
+                (prefix, max(floor, bank_next_id(prefix))),
+            )
+        end = conn.execute(
+            "UPDATE counters SET next_id = max(next_id, ?) + ? WHERE prefix = ? RETURNING next_id",
+            (floor, count, prefix),
+        ).fetchone()[0]
+        start = end - count
+        conn.execute(
+            "INSERT INTO leases (prefix, start_id, end_id, owner, leased_at) VALUES (?, ?, ?, ?, ?)",
+            (prefix, start, end - 1, owner or f"pid-{os.getpid()}", time.strftime("%Y-%m-%dT%H:%M:%S")),
+        )
+        return range(start, end)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="題目 ID 區段分配")
+    parser.add_argument("--registry", default=REGISTRY_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="各前綴的下一個可用編號")
+    p_lease = sub.add_parser("lease", help="手動租用一段 ID")
+    p_lease.add_argument("prefix")
+    p_lease.add_argument("count", type=int)
+    p_lease.add_argument("--floor", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "lease":
+        ids = lease(args.prefix, args.count, args.floor, owner="cli", path=args.registry)
+        print(f"{args.prefix}{ids.start} ~ {args.prefix}{ids.stop - 1}")
+        return
+
+    conn = connect(args.registry)
+    print("前綴 → 下一個可用編號（租用次數）")
+    for prefix, next_id, n in conn.execute(
+        "SELECT c.prefix, c.next_id, COUNT(l.prefix) FROM counters c "
+        "LEFT JOIN leases l ON l.prefix = c.prefix GROUP BY c.prefix ORDER BY c.prefix"
+    ):
+        print(f"  {prefix}: {next_id}（{n} 次）")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
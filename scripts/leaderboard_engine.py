@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+排行榜增量計算 - 每個範圍（全站 / 年級 / 班級 / 每日 / 每週）維護前 K 名與名次計數
+
+用法：
+  python3 scripts/leaderboard_engine.py ingest leaderboard.csv [--classes class_members.csv --users users.csv]
+  python3 scripts/leaderboard_engine.py top --scope grade:5 [-k 10]
+  python3 scripts/leaderboard_engine.py rank --scope global --player 小明
+
+每位玩家只記最佳成績。新成績進來時：
+  - 名次計數用 Fenwick tree（以「分數 × 101 + 正確率」為索引），更新與查名次都是 O(log S)
+  - 前 K 名用大小固定為 K 的最小堆積，讀排行榜只讀這 K 筆
+存檔時另外輸出只含各榜前 K 名的 *-top.json，`top` 指令只讀這個檔，
+所以讀取成本跟玩家總數無關。排序規則與 storage.ts 相同：分數高者先，同分比正確率；
+分數與正確率都相同時名次並列（top 顯示的名次與 rank 查到的一致）。
+"""
+
+import argparse
+import heapq
+import json
+import os
+from datetime import date, datetime
+
+from bank_io import SCRIPTS_DIR
+from export_reader import iter_chunks, to_int
+
+SNAPSHOT_PATH = os.path.join(SCRIPTS_DIR, "leaderboard-snapshot.json")
+DEFAULT_TOP_K = 50  # 與 storage.ts 的 top50 相同
+
+# 正確率 0~100，名次索引 = 分數 × ACCURACY_SLOTS + 正確率
+ACCURACY_SLOTS = 101
+
+# 每日 / 每週排行榜只保留最近幾期
+KEEP_DAILY = 14
+KEEP_WEEKLY = 8
+
+
+class Fenwick:
+    """分數 → 人數 的樹狀陣列，容量不足時自動加倍"""
+
+    def __init__(self, size=1024):
+        self.size = size
+        self.tree = [0] * (size + 1)
+        self.total = 0
+
+    def _grow(self, score):
+        size = self.size
+        while size <= score:
+            size *= 2
+        counts = [self.count_at(s) for s in range(self.size)]
+        self.size = size
+        self.tree = [0] * (size + 1)
+        self.total = 0
+        for s, c in enumerate(counts):
+            if c:
+                self.add(s, c)
+
+    def add(self, score, delta=1):
+        if score >= self.size:
+            self._grow(score)
+        self.total += delta
+        i = score + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, score):
+        """分數 ≤ score 的人數"""
+        i = min(score, self.size - 1) + 1
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def count_at(self, score):
+        return self.prefix(score) - (self.prefix(score - 1) if score > 0 else 0)
+
+    def count_above(self, score):
+        return self.total - self.prefix(score)
+
+
+def rank_key(score, accuracy):
+    return score * ACCURACY_SLOTS + min(ACCURACY_SLOTS - 1, max(0, accuracy))
+
+
+class ScopeBoard:
+    """單一範圍的排行榜"""
+
+    def __init__(self, k=DEFAULT_TOP_K):
+        self.k = k
+        self.best = {}      # 玩家 → [分數, 正確率, 日期]
+        self.heap = []      # (分數, 正確率, 玩家) 最小堆積，最多 K 筆
+        self.members = set()
+        self.ranks = Fenwick()
+
+    def submit(self, player, score, accuracy, when):
+        """提交一筆成績，只有刷新個人最佳時才更新。回傳是否更新"""
+        score = max(0, score)
+        prev = self.best.get(player)
+        if prev and (prev[0], prev[1]) >= (score, accuracy):
+            return False
+
+        if prev:
+            self.ranks.add(rank_key(prev[0], prev[1]), -1)
+        self.ranks.add(rank_key(score, accuracy))
+        self.best[player] = [score, accuracy, when]
+
+        entry = (score, accuracy, player)
+        if player in self.members:
+            # 已在榜上：原地更新後重建（K 為常數）
+            self.heap = [e if e[2] != player else entry for e in self.heap]
+            heapq.heapify(self.heap)
+        elif len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+            self.members.add(player)
+        elif entry > self.heap[0]:
+            evicted = heapq.heapreplace(self.heap, entry)
+            self.members.discard(evicted[2])
+            self.members.add(player)
+        return True
+
+    def top(self, n=None):
+        """前 n 名；分數與正確率相同者名次並列（比他好的人都在前 K 名內，名次與 rank() 相同）"""
+        entries = sorted(self.heap, reverse=True)[:n or self.k]
+        result = []
+        for i, (s, a, p) in enumerate(entries):
+            tied = result and (result[-1]["score"], result[-1]["accuracy"]) == (s, a)
+            rank = result[-1]["rank"] if tied else i + 1
+            result.append({"rank": rank, "username": p, "score": s, "accuracy": a, "date": self.best[p][2]})
+        return result
+
+    def rank(self, player):
+        """名次 = (分數, 正確率) 比他好的人數 + 1"""
+        prev = self.best.get(player)
+        if not prev:
+            return None
+        return self.ranks.count_above(rank_key(prev[0], prev[1])) + 1
+
+    def to_dict(self):
+        return {"k": self.k, "players": self.best}
+
+    @classmethod
+    def from_dict(cls, data):
+        board = cls(data.get("k", DEFAULT_TOP_K))
+        for player, (score, accuracy, when) in data["players"].items():
+            board.submit(player, score, accuracy, when)
+        return board
+
+
+def top_path(snapshot_path):
+    root, ext = os.path.splitext(snapshot_path)
+    return f"{root}-top{ext}"
+
+
+def write_json_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def week_key(d):
+    year, week, _ = d.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def parse_date(value):
+    if not value:
+        return date.today()
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date()
+    except ValueError:
+        return date.fromisoformat(str(value)[:10])
+
+
+class LeaderboardEngine:
+    def __init__(self, k=DEFAULT_TOP_K):
+        self.k = k
+        self.scopes = {}
+
+    def board(self, scope):
+        if scope not in self.scopes:
+            self.scopes[scope] = ScopeBoard(self.k)
+        return self.scopes[scope]
+
+    def submit(self, username, score, accuracy, grade, when=None, class_id=None):
+        d = parse_date(when)
+        stamp = d.isoformat()
+        scopes = ["global", f"grade:{grade}", f"daily:{stamp}", f"weekly:{week_key(d)}"]
+        if class_id:
+            scopes.append(f"class:{class_id}")
+        for scope in scopes:
+            self.board(scope).submit(username, score, accuracy, stamp)
+
+    def prune(self):
+        """移除過期的每日 / 每週排行榜"""
+        for prefix, keep in (("daily:", KEEP_DAILY), ("weekly:", KEEP_WEEKLY)):
+            periods = sorted(s for s in self.scopes if s.startswith(prefix))
+            for scope in periods[:-keep]:
+                del self.scopes[scope]
+
+    def save(self, path=SNAPSHOT_PATH):
+        self.prune()
+        full = {"k": self.k, "scopes": {s: b.to_dict() for s, b in self.scopes.items()}}
+        top = {s: {"players": len(b.best), "top": b.top()} for s, b in self.scopes.items()}
+        write_json_atomic(path, full)
+        write_json_atomic(top_path(path), top)
+
+    @classmethod
+    def load(cls, path=SNAPSHOT_PATH, k=DEFAULT_TOP_K):
+        if not os.path.exists(path):
+            return cls(k)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        engine = cls(data.get("k", k))
+        engine.scopes = {s: ScopeBoard.from_dict(b) for s, b in data["scopes"].items()}
+        return engine
+
+
+def load_usernames(path):
+    """users 匯出檔 → {user_id: username}"""
+    names = {}
+    for chunk in iter_chunks(path, "users"):
+        for row in chunk:
+            if row.get("id") and row.get("username"):
+                names[row["id"]] = row["username"]
+    return names
+
+
+def load_classes(path, usernames=None):
+    """username → class_id 對照。class_members 匯出檔只有 user_id，需用 users 匯出檔對應到 username；
+    已 join 好、帶 username 欄位的檔案則直接使用"""
+    usernames = usernames or {}
+    classes = {}
+    missing = 0
+    for chunk in iter_chunks(path, "class_members"):
+        for row in chunk:
+            if not row.get("class_id"):
+                continue
+            name = row.get("username") or usernames.get(row.get("user_id"))
+            if name:
+                classes[name] = row["class_id"]
+            elif row.get("user_id"):
+                missing += 1
+    if missing:
+        print(f"⚠️ {missing:,} 位班級成員找不到 username（請用 --users 指定 users 匯出檔）")
+    return classes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="排行榜增量計算")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    parser.add_argument("-k", type=int, default=DEFAULT_TOP_K)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ingest = sub.add_parser("ingest", help="匯入 leaderboard 表匯出檔")
+    p_ingest.add_argument("input")
+    p_ingest.add_argument("--table", default="leaderboard")
+    p_ingest.add_argument("--classes", help="class_members 匯出檔（user_id, class_id；或已 join 的 username, class_id）")
+    p_ingest.add_argument("--users", help="users 匯出檔，把 class_members 的 user_id 對應到 username")
+
+    p_top = sub.add_parser("top", help="顯示前 K 名")
+    p_top.add_argument("--scope", default="global")
+
+    p_rank = sub.add_parser("rank", help="查詢玩家名次")
+    p_rank.add_argument("--scope", default="global")
+    p_rank.add_argument("--player", required=True)
+
+    args = parser.parse_args()
+
+    if args.command == "top":
+        # 只讀前 K 名檔，不載入完整快照
+        path = top_path(args.snapshot)
+        if not os.path.exists(path):
+            print(f"找不到 {path}，請先執行 ingest")
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            board = json.load(f).get(args.scope)
+        if not board:
+            print(f"沒有排行榜: {args.scope}")
+            return
+        print(f"🏆 {args.scope}（共 {board['players']:,} 人）")
+        for e in board["top"][:args.k]:
+            print(f"  {e['rank']:>3}. {e['username']}  {e['score']} 分  {e['accuracy']}%  {e['date']}")
+        return
+
+    engine = LeaderboardEngine.load(args.snapshot, args.k)
+
+    if args.command == "ingest":
+        usernames = load_usernames(args.users) if args.users else {}
+        classes = load_classes(args.classes, usernames) if args.classes else {}
+        count = 0
+        for chunk in iter_chunks(args.input, args.table):
+            for row in chunk:
+                name = row.get("username")
+                if not name:
+                    continue
+                engine.submit(
+                    name,
+                    to_int(row.get("score")),
+                    to_int(row.get("accuracy")),
+                    to_int(row.get("grade"), 5),
+                    row.get("created_at"),
+                    classes.get(name),
+                )
+                count += 1
+        engine.save(args.snapshot)
+        print(f"匯入 {count:,} 筆成績，共 {len(engine.scopes)} 個排行榜")
+        print(f"已儲存到 {args.snapshot}")
+
+    else:
+        board = engine.scopes.get(args.scope)
+        rank = board.rank(args.player) if board else None
+        if rank is None:
+            print(f"{args.player} 不在 {args.scope} 排行榜")
+        else:
+            print(f"{args.player} 在 {args.scope} 排第 {rank} 名（共 {len(board.best):,} 人）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+串流合併生成腳本的輸出到主題庫（k 路合併）
+
+用法：
+  python3 scripts/merge-batches.py questions-ps-batch.json questions-balanced.json ...
+  python3 scripts/merge-batches.py --output merged.json questions-*.json
+
+流程：
+  1. 主題庫（src/data/questions.json）逐題原樣輸出（只建索引，不刪題）
+  2. 各批次檔（須依 ID 排序，生成腳本的輸出本來就是）用 heapq.merge 依 ID 合併
+  3. 一邊輸出一邊用雜湊索引檢查：
+     - ID 重複：同 ID 不同內容 → 回報並略過；同 ID 同內容 → 視為已合併過，略過
+     - 內容重複：不同 ID 但題幹 / 選項 / 答案相同 → 回報並略過
+每題只讀一次、寫一次，記憶體只保留 ID 與內容雜湊，不隨批次檔數量增加。
+"""
+
+import argparse
+import heapq
+import json
+import os
+
+from bank_io import QuestionWriter, SCRIPTS_DIR, content_hash, data_path, id_sort_key, iter_questions
+
+REPORT_PATH = os.path.join(SCRIPTS_DIR, "merge-report.json")
+
+
+def sorted_stream(path):
+    """逐題讀取批次檔，並確認已依 ID 排序"""
+    prev = None
+    for q in iter_questions(path):
+        key = id_sort_key(q["id"])
+        if prev is not None and key < prev:
+            raise ValueError(f"{path} 未依 ID 排序（{q['id']} 出現在後面）")
+        prev = key
+        q.setdefault("_source_file", os.path.basename(path))
+        yield q
+
+
+def merge(base_path, batch_paths, output_path):
+    seen_ids = {}      # ID → 內容雜湊
+    seen_content = {}  # 內容雜湊 → ID
+    report = {"idCollisions": [], "contentDuplicates": [], "alreadyMerged": 0, "added": 0}
+
+    tmp = output_path + ".tmp"
+    try:
+        with QuestionWriter(tmp) as writer:
+            if os.path.exists(base_path):
+                for q in iter_questions(base_path):
+                    h = content_hash(q)
+                    seen_ids.setdefault(q["id"], h)
+                    seen_content.setdefault(h, q["id"])
+                    writer.write(q)
+
+            def accept(q):
+                h = content_hash(q)
+                qid = q["id"]
+                if qid in seen_ids:
+                    if seen_ids[qid] == h:
+                        report["alreadyMerged"] += 1
+                    else:
+                        report["idCollisions"].append({"id": qid, "file": q.get("_source_file")})
+                    return
+                if h in seen_content:
+                    report["contentDuplicates"].append({"id": qid, "duplicateOf": seen_content[h], "file": q.get("_source_file")})
+                    return
+                seen_ids[qid] = h
+                seen_content[h] = qid
+                q.pop("_source_file", None)
+                writer.write(q)
+                report["added"] += 1
+
+            streams = [sorted_stream(p) for p in batch_paths]
+            for q in heapq.merge(*streams, key=lambda q: id_sort_key(q["id"])):
+                accept(q)
+
+            total = writer.count
+    except Exception:
+        os.remove(tmp)
+        raise
+
+    os.replace(tmp, output_path)
+    report["total"] = total
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="串流 k 路合併題庫批次檔")
+    parser.add_argument("batches", nargs="+", help="生成腳本的輸出檔（依 ID 排序）")
+    parser.add_argument("--base", default=data_path("questions.json"), help="主題庫（預設 src/data/questions.json）")
+    parser.add_argument("--output", help="輸出檔（預設覆寫主題庫）")
+    args = parser.parse_args()
+
+    output = args.output or args.base
+    print(f"合併 {len(args.batches)} 個批次檔到 {os.path.basename(output)}...")
+    report = merge(args.base, args.batches, output)
+
+    with open(REPORT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"新增 {report['added']} 題，已合併過 {report['alreadyMerged']} 題，總計 {report['total']} 題")
+    if report["idCollisions"]:
+        print(f"⚠️ ID 衝突 {len(report['idCollisions'])} 題（已略過）:")
+        for c in report["idCollisions"][:10]:
+            print(f"  {c['id']}（{c['file']}）")
+    if report["contentDuplicates"]:
+        print(f"⚠️ 內容重複 {len(report['contentDuplicates'])} 題（已略過）:")
+        for c in report["contentDuplicates"][:10]:
+            print(f"  {c['id']} 與 {c['duplicateOf']} 相同（{c['file']}）")
+    print(f"報告已儲存到 {os.path.basename(REPORT_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+數論查表 - 最小質因數篩法，一次算好上限內每個數的質因數分解、因數清單與因數個數
+
+用法（在生成腳本中）：
+  from number_theory import divisors, divisor_count, factorize, gcd, lcm
+  divisors(36)            # [1, 2, 3, 4, 6, 9, 12, 18, 36]
+  factorize(60)           # ((2, 2), (3, 1), (5, 1))
+  lcm(6, 8, 9)            # 72
+
+命令列：
+  python3 scripts/number_theory.py show 360     # 列出質因數分解、因數等
+  python3 scripts/number_theory.py check        # 驗算題庫中的因數 / 倍數 / 質數題
+
+表在同一個行程中只建一次（預設到 DEFAULT_LIMIT），查更大的數時自動重建到足夠的上限，
+但最多到 TABLE_LIMIT（因數清單的記憶體與上限成正比）。質數判斷與計數另用只記「是否為質數」的
+簡單篩法（上限 PRIME_LIMIT），不必為了「N 以內的質數」建整張因數表。超出上限時丟出 ValueError，
+驗算時該題視為 skip。
+gcd / lcm 直接用 math 的版本，可傳入多個數。
+"""
+
+import argparse
+import os
+import re
+from bisect import bisect_right
+from math import gcd, isqrt, lcm
+
+from bank_io import BANK_FILES, data_path, load_questions
+from numeric import numbers
+
+DEFAULT_LIMIT = 10000
+TABLE_LIMIT = 200_000
+PRIME_LIMIT = 10_000_000
+SUPERSCRIPT_DIGITS = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+
+class NumberTable:
+    """1 ~ limit 的最小質因數、質因數分解、因數清單"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        spf = list(range(limit + 1))
+        for p in range(2, isqrt(limit) + 1):
+            if spf[p] == p:
+                for m in range(p * p, limit + 1, p):
+                    if spf[m] == m:
+                        spf[m] = p
+        self.spf = spf
+        self.primes = [n for n in range(2, limit + 1) if spf[n] == n]
+
+        # n 的分解 = spf[n] 接上 n // spf[n] 的分解（由小到大）
+        factors = [()] * (limit + 1)
+        for n in range(2, limit + 1):
+            p, rest = spf[n], factors[n // spf[n]]
+            if rest and rest[0][0] == p:
+                factors[n] = ((p, rest[0][1] + 1),) + rest[1:]
+            else:
+                factors[n] = ((p, 1),) + rest
+        self.factors = factors
+
+        divs = [[] for _ in range(limit + 1)]
+        for d in range(1, limit + 1):
+            for m in range(d, limit + 1, d):
+                divs[m].append(d)
+        self.divs = divs
+
+    def check(self, n):
+        if not 1 <= n <= self.limit:
+            raise ValueError(f"{n} 超出數論表範圍 1 ~ {self.limit}")
+
+
+_tables = {}
+
+
+def table(n=DEFAULT_LIMIT):
+    """取得涵蓋 1 ~ n 的表（已建過夠大的表就直接用）"""
+    if n > TABLE_LIMIT:
+        raise ValueError(f"{n} 超出數論表上限 {TABLE_LIMIT}")
+    for limit, t in _tables.items():
+        if limit >= n:
+            return t
+    limit = DEFAULT_LIMIT
+    while limit < n:
+        limit *= 2
+    limit = min(limit, TABLE_LIMIT)
+    _tables.clear()
+    _tables[limit] = NumberTable(limit)
+    return _tables[limit]
+
+
+def factorize(n):
+    """質因數分解 ((質數, 次方), ...)，1 回傳 ()"""
+    t = table(n)
+    t.check(n)
+    return t.factors[n]
+
+
+def divisors(n):
+    """n 的所有正因數（由小到大，回傳共用清單，請勿修改）"""
+    t = table(n)
+    t.check(n)
+    return t.divs[n]
+
+
+def divisor_count(n):
+    return len(divisors(n))
+
+
+_sieve = {"limit": 0, "flags": bytearray(), "primes": []}
+
+
+def prime_sieve(n):
+    """涵蓋 0 ~ n 的質數篩（bytearray 旗標 + 質數清單），同一行程中只在需要更大範圍時重建"""
+    if n > PRIME_LIMIT:
+        raise ValueError(f"{n} 超出質數表上限 {PRIME_LIMIT}")
+    if _sieve["limit"] < n:
+        limit = max(DEFAULT_LIMIT, _sieve["limit"])
+        while limit < n:
+            limit *= 2
+        limit = min(limit, PRIME_LIMIT)
+        flags = bytearray([1]) * (limit + 1)
+        flags[0:2] = b"\x00\x00"
+        for p in range(2, isqrt(limit) + 1):
+            if flags[p]:
+                flags[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+        _sieve.update(limit=limit, flags=flags, primes=[i for i in range(limit + 1) if flags[i]])
+    return _sieve
+
+
+def is_prime(n):
+    return n >= 2 and bool(prime_sieve(n)["flags"][n])
+
+
+def primes_upto(n, start=2):
+    """start ~ n 之間的質數"""
+    primes = prime_sieve(max(n, 0))["primes"]
+    return primes[bisect_right(primes, start - 1):bisect_right(primes, n)]
+
+
+def format_factorization(n):
+    """60 → "2²×3×5"（與題庫選項寫法相同）"""
+    return "×".join(str(p) + (str(e).translate(SUPERSCRIPT_DIGITS) if e > 1 else "") for p, e in factorize(n))
+
+
+def count_multiples(n, *ks):
+    """1 ~ n 中同時是 ks 每個數的倍數的個數"""
+    return n // lcm(*ks)
+
+
+def solve_congruences(r1, a, r2, b):
+    """除以 a 餘 r1、除以 b 餘 r2 的最小正整數；無解回傳 None"""
+    g = gcd(a, b)
+    if (r1 - r2) % g:
+        return None
+    step = lcm(a, b)
+    x = next(x for x in range(r1 % a, step + r1 % a, a) if x % b == r2 % b)
+    return x if x > 0 else x + step
+
+
+# 題幹 → 正確答案（數值，或質因數分解的寫法）
+NUMBER_LIST = r"(\d+(?:\s*(?:、|和|與)\s*\d+)+)"
+RULES = [
+    (re.compile(r"(\d+)\s*的(?:所有)?正?因數有(?:幾|多少)個"), lambda n: divisor_count(int(n))),
+    (re.compile(r"(\d+)\s*的所有正?因數之和"), lambda n: sum(divisors(int(n)))),
+    (re.compile(NUMBER_LIST + r"\s*的最大公因數"), lambda ns: gcd(*map(int, re.findall(r"\d+", ns)))),
+    (re.compile(NUMBER_LIST + r"\s*的最小公倍數"), lambda ns: lcm(*map(int, re.findall(r"\d+", ns)))),
+    (re.compile(r"把\s*(\d+)\s*(?:做質因數分解|分解質因數)[，,]\s*結果是"), lambda n: format_factorization(int(n))),
+    (
+        re.compile(r"[從在]\s*1\s*到\s*(\d+).*?(?:既是|同時是|同時被)\s*(\d+)\s*(?:的倍數又是|和)\s*(\d+)\s*(?:的倍數|整除)"),
+        lambda n, a, b: count_multiples(int(n), int(a), int(b)),
+    ),
+    (re.compile(r"從\s*1\s*到\s*(\d+)[，,]\s*(\d+)\s*的倍數有幾個"), lambda n, k: count_multiples(int(n), int(k))),
+    (re.compile(r"(\d+)\s*以內的質數有幾個"), lambda n: len(primes_upto(int(n)))),
+    (re.compile(r"從\s*(\d+)\s*到\s*(\d+)\s*之間有幾個質數"), lambda lo, hi: len(primes_upto(int(hi), int(lo)))),
+    (re.compile(r"(\d+)\s*以內最大的質數"), lambda n: primes_upto(int(n))[-1]),
+]
+
+
+def expected_answer(content):
+    """依題幹算出正確答案；不是可驗算的題型回傳 None"""
+    for pattern, solve in RULES:
+        m = pattern.search(content)
+        if m:
+            try:
+                return solve(*m.groups())
+            except (ValueError, IndexError):
+                # 0 的因數、1 以內沒有質數、超出表的上限等，無法驗算
+                return None
+    return None
+
+
+def option_matches(option, expected):
+    if isinstance(expected, str):
+        return re.sub(r"\s+", "", str(option)).replace("*", "×") == expected
+    values = numbers(str(option))
+    return len(values) == 1 and values[0] == expected
+
+
+def check_question(q):
+    """回傳 (狀態, 正確選項索引；ambiguous 時為同值選項的索引串)；狀態：ok / wrong-answer / no-correct-option / ambiguous / skip"""
+    expected = expected_answer(q.get("content", ""))
+    if expected is None:
+        return "skip", None
+    matches = [i for i, option in enumerate(q.get("options", [])) if option_matches(option, expected)]
+    if not matches:
+        return "no-correct-option", None
+    if len(matches) > 1:
+        return "ambiguous", matches
+    return ("ok" if matches[0] == q.get("answer") else "wrong-answer"), matches[0]
+
+
+def run_check():
+    counts = {}
+    problems = []
+    for name in BANK_FILES:
+        if not os.path.exists(data_path(name)):
+            continue
+        for q in load_questions(data_path(name)):
+            status, located = check_question(q)
+            counts[status] = counts.get(status, 0) + 1
+            if status not in ("ok", "skip"):
+                problems.append((name, q, status, located))
+
+    checked = sum(n for status, n in counts.items() if status != "skip")
+    print(f"因數 / 倍數 / 質數題 {checked} 題（數論表上限 {max(_tables, default=DEFAULT_LIMIT)}）")
+    print(f"  ✅ 正確: {counts.get('ok', 0)}")
+    print(f"  ❌ 答案索引錯誤: {counts.get('wrong-answer', 0)}")
+    print(f"  ❌ 沒有正確選項: {counts.get('no-correct-option', 0)}")
+    print(f"  ⚠️ 多個選項同值: {counts.get('ambiguous', 0)}")
+    for name, q, status, located in problems:
+        if status == "ambiguous":
+            hint = "，同值選項 " + "、".join(chr(ord("A") + i) for i in located)
+        elif located is not None:
+            hint = f"，正確選項 {chr(ord('A') + located)}"
+        else:
+            hint = ""
+        print(f"  [{status}] {q['id']}（{name}）{q['content']} → {expected_answer(q['content'])}{hint}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="數論查表與因數倍數題驗算")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_show = sub.add_parser("show", help="列出一個數的分解與因數")
+    p_show.add_argument("n", type=int)
+    sub.add_parser("check", help="驗算題庫中的因數 / 倍數 / 質數題")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        n = args.n
+        try:
+            print(f"{n} = {format_factorization(n) or '1'}{'（質數）' if is_prime(n) else ''}")
+            print(f"因數 {divisor_count(n)} 個: {', '.join(map(str, divisors(n)))}")
+            print(f"因數和: {sum(divisors(n))}")
+        except ValueError as e:
+            raise SystemExit(f"❌ {e}")
+        return
+    run_check()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+數值正規化共用函式 - 把選項、詳解中的數字文字轉成精確的 Fraction
+
+支援：
+  整數、負數、千分位（1,000）、小數（3.14）
+  分數（3/4）、帶分數（1又5/12）
+  百分比（60% → 3/5）
+  單位與其他文字直接略過（「24 公里」→ 24，「3小時20分鐘」→ 3, 20）
+"""
+
+import re
+from fractions import Fraction
+
+NUMBER_RE = re.compile(
+    r"(?:(?<![\d)）])(?P<sign>-))?"                          # 緊接在數字 / 括號後的「-」是減號
+    r"(?:(?P<whole>\d+)又(?P<num>\d+)/(?P<den>\d+)"          # 帶分數
+    r"|(?P<fnum>\d+(?:\.\d+)?)/(?P<fden>\d+(?:\.\d+)?)"     # 分數
+    r"|(?P<value>\d+(?:\.\d+)?))"                           # 整數 / 小數
+    r"(?P<percent>\s*[%％])?"
+)
+THOUSANDS_RE = re.compile(r"(?<=\d),(?=\d{3}(?!\d))")
+APPROX_MARKS = ("約", "≈", "大約", "近似")
+
+# 相對誤差容許：精確值 vs. 四捨五入後的顯示值
+EXACT_TOLERANCE = Fraction(1, 10 ** 6)
+APPROX_TOLERANCE = Fraction(1, 100)
+
+
+def to_fraction(match):
+    """NUMBER_RE 的比對結果 → Fraction（分母為 0 回傳 None）"""
+    if match.group("whole"):
+        den = int(match.group("den"))
+        if den == 0:
+            return None
+        value = int(match.group("whole")) + Fraction(int(match.group("num")), den)
+    elif match.group("fnum"):
+        den = Fraction(match.group("fden"))
+        if den == 0:
+            return None
+        value = Fraction(match.group("fnum")) / den
+    else:
+        value = Fraction(match.group("value"))
+    if match.group("percent"):
+        value /= 100
+    return -value if match.group("sign") else value
+
+
+def numbers(text):
+    """文字中所有數字（依出現順序）"""
+    text = THOUSANDS_RE.sub("", str(text or ""))
+    values = []
+    for m in NUMBER_RE.finditer(text):
+        value = to_fraction(m)
+        if value is not None:
+            values.append(value)
+    return values
+
+
+def parse_number(text):
+    """文字中的第一個數字，沒有則回傳 None"""
+    values = numbers(text)
+    return values[0] if values else None
+
+
+def is_approx(text):
+    return any(mark in str(text or "") for mark in APPROX_MARKS)
+
+
+def close(a, b, tolerance=EXACT_TOLERANCE):
+    """相對誤差在容許範圍內（兩者皆為 0 視為相等）"""
+    if a == b:
+        return True
+    scale = max(abs(a), abs(b))
+    return abs(a - b) <= scale * tolerance
+
+
+def same_values(a, b, tolerance=EXACT_TOLERANCE):
+    """兩串數字逐一相等"""
+    return len(a) == len(b) and all(close(x, y, tolerance) for x, y in zip(a, b))
+
+
+def format_number(value):
+    """Fraction → 顯示用文字（整數、有限小數或分數）"""
+    if value.denominator == 1:
+        return str(value.numerator)
+    den = value.denominator
+    for p in (2, 5):
+        while den % p == 0:
+            den //= p
+    if den == 1:
+        return format(float(value), "g")
+    return f"{value.numerator}/{value.denominator}"
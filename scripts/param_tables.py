@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+生成參數表 - 事先列舉所有符合限制的參數組合，生成時直接均勻抽一組
+
+用法（在生成腳本中）：
+  from param_tables import draw
+  father, son, years, ratio = draw("age_past")
+
+命令列：
+  python3 scripts/param_tables.py          # 重建快取並列出各表的組合數
+
+原本的寫法是先亂數抽參數、再用 while 迴圈修到符合條件（例如年齡題要整除），
+可能跑很久，甚至把「兒子年齡 - 幾年前」修成 0 或負數。
+改成一次列舉所有合法組合後，抽樣就是 O(1)，也不會有無窮迴圈。
+列舉結果存在 scripts/param-tables.json，列舉函式的程式碼改變時自動重建。
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import random
+
+from bank_io import SCRIPTS_DIR
+
+CACHE_PATH = os.path.join(SCRIPTS_DIR, "param-tables.json")
+
+
+def age_past():
+    """(父親, 兒子, 幾年前, 倍數)：幾年前父親年齡是兒子的整數倍（2~10 倍）"""
+    for father in range(35, 51):
+        for son in range(8, 19):
+            for years in range(1, min(11, son)):
+                if (father - years) % (son - years) == 0:
+                    ratio = (father - years) // (son - years)
+                    if 2 <= ratio <= 10:
+                        yield father, son, years, ratio
+
+
+def age_future():
+    """(媽媽, 女兒, 倍數, 幾年後)：幾年後是整數年，且選項 years-2 仍為正數"""
+    for mom in range(30, 46):
+        for child in range(5, 16):
+            for ratio in (2, 3):
+                diff = mom - ratio * child
+                if diff % (ratio - 1) == 0 and diff // (ratio - 1) >= 3:
+                    yield mom, child, ratio, diff // (ratio - 1)
+
+
+def ratio_divide():
+    """(甲, 乙, 丙, 每份金額)：四個選項（乙、甲、丙、總數 ÷ 3）互不相同"""
+    for r1 in range(1, 6):
+        for r2 in range(2, 7):
+            for r3 in range(1, 6):
+                parts = r1 + r2 + r3
+                for unit in range(10, 51):
+                    total = parts * unit
+                    options = {unit * r2, unit * r1, unit * r3, total // 3}
+                    if len(options) == 4:
+                        yield r1, r2, r3, unit
+
+
+TABLES = {
+    "age_past": age_past,
+    "age_future": age_future,
+    "ratio_divide": ratio_divide,
+}
+
+_loaded = {}
+
+
+def table_version(name):
+    """列舉函式原始碼的雜湊，函式一改快取就失效"""
+    return hashlib.sha1(inspect.getsource(TABLES[name]).encode("utf-8")).hexdigest()[:12]
+
+
+def build_all(path=CACHE_PATH):
+    """重新列舉所有表並寫入快取"""
+    cache = {name: {"version": table_version(name), "rows": [list(r) for r in fn()]} for name, fn in TABLES.items()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, separators=(",", ":"))
+    _loaded.clear()
+    return cache
+
+
+def load_table(name, path=CACHE_PATH):
+    """取得參數表（tuple 清單）：先看行程內快取，再看磁碟快取，都沒有才列舉"""
+    if name in _loaded:
+        return _loaded[name]
+    cache = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    entry = cache.get(name)
+    if not entry or entry["version"] != table_version(name):
+        cache = build_all(path)
+        entry = cache[name]
+    _loaded[name] = [tuple(r) for r in entry["rows"]]
+    return _loaded[name]
+
+
+def draw(name, rng=random):
+    """均勻抽一組參數（預設用全域 random，與生成腳本的 random.seed 一致）"""
+    return rng.choice(load_table(name))
+
+
+def main():
+    cache = build_all()
+    for name, entry in cache.items():
+        print(f"  {name}: {len(entry['rows'])} 組")
+    print(f"已儲存到 {os.path.basename(CACHE_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
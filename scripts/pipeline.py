@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+題目生成管線 - 生成、驗證、去重、修正、打亂選項、編號、寫檔一次完成
+
+用法（在生成腳本中）：
+  from pipeline import Pipeline, validate, dedupe, fix_negative_profit, fix_arithmetic, shuffle, assign_ids
+
+  pipe = Pipeline(
+      validate(),
+      dedupe(bank=True),
+      fix_negative_profit(),
+      fix_arithmetic(),
+      shuffle(seed="ps-batch"),
+      assign_ids("ps-batch-", floor=6000, source="考私中批量"),
+  )
+  count = pipe.write(generate_all(), "questions-ps-batch.json", expected=550)
+  pipe.print_stats()
+
+每個階段都是「接收題目迭代器、回傳題目迭代器」的函式，題目逐一流過所有階段，
+不產生中間檔，也不必先把整批題目放進記憶體。
+原本各自重讀整個題庫的 validate-questions.js、fix-negative-numbers.js、
+shuffle-answers.js 等檢查，在這裡於生成當下就套用。
+"""
+
+import os
+import re
+from collections import Counter
+
+from answer_shuffle import AnswerShuffler
+from arith import check_question as check_arithmetic
+from bank_io import QuestionWriter, content_hash, load_bank
+from id_allocator import lease
+
+# assign_ids 每次向 ID 註冊表租用的區段大小（最後一段用不完的編號會空下）
+ID_BLOCK_SIZE = 50
+MIN_OPTIONS = 4
+
+
+class Pipeline:
+    def __init__(self, *stages):
+        self.stages = stages
+        self.stats = Counter()
+
+    def run(self, items):
+        """把題目依序串過所有階段，回傳惰性迭代器"""
+        for stage in self.stages:
+            items = stage(items, self.stats)
+        return items
+
+    def write(self, items, path, expected=None):
+        """執行管線並逐題寫出，回傳寫出的題數（中途失敗不會留下寫一半的檔案）。
+        給了 expected（要求的題數）時，被驗證 / 去重等階段丟掉而不足的題數會印出警告"""
+        tmp = path + ".tmp"
+        try:
+            with QuestionWriter(tmp) as writer:
+                for q in self.run(items):
+                    writer.write(q)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        os.replace(tmp, path)
+        self.stats["written"] = writer.count
+        if expected is not None and writer.count < expected:
+            dropped = {k: n for k, n in self.stats.items() if k.startswith("rejected:") or k == "duplicate"}
+            reasons = "、".join(f"{k} {n}" for k, n in sorted(dropped.items(), key=lambda x: -x[1]))
+            print(f"⚠️ 要求 {expected} 題，只寫出 {writer.count} 題（少 {expected - writer.count} 題）" + (f"：{reasons}" if reasons else ""))
+        return writer.count
+
+    def print_stats(self):
+        for key, n in sorted(self.stats.items()):
+            print(f"  {key}: {n}")
+
+
+def question_issues(q):
+    """與 validate-questions.js 相同的基本檢查，回傳問題清單"""
+    issues = []
+    content = (q.get("content") or "").strip()
+    options = q.get("options")
+    if not content:
+        issues.append("題目內容為空")
+    if "undefined" in content or "NaN" in content:
+        issues.append("題目包含 undefined / NaN")
+    if not isinstance(options, list) or len(options) < MIN_OPTIONS:
+        issues.append(f"選項不足 {MIN_OPTIONS} 個")
+        return issues
+    texts = [str(o).strip() for o in options]
+    if any(not t for t in texts):
+        issues.append("有空白選項")
+    if len(set(texts)) < len(texts):
+        issues.append("有重複選項")
+    answer = q.get("answer")
+    if not isinstance(answer, int) or not 0 <= answer < len(options):
+        issues.append("答案索引無效")
+    return issues
+
+
+def validate(rejects=None):
+    """丟掉有問題的題目；rejects 為 list 時記下 (題目, 問題)"""
+    def stage(items, stats):
+        for q in items:
+            issues = question_issues(q)
+            if issues:
+                stats["rejected:" + issues[0]] += 1
+                if rejects is not None:
+                    rejects.append((q, issues))
+                continue
+            yield q
+    return stage
+
+
+def dedupe(bank=False, exclude=()):
+    """丟掉內容重複的題目（同一批內重複、或 bank=True 時與現有題庫重複）"""
+    def stage(items, stats):
+        seen = set(exclude)
+        if bank:
+            seen.update(content_hash(q) for q in load_bank())
+        for q in items:
+            h = content_hash(q)
+            if h in seen:
+                stats["duplicate"] += 1
+                continue
+            seen.add(h)
+            yield q
+    return stage
+
+
+def fix_negative_profit():
+    """五年級利潤題不出現負數：-5 → 賠 5 元，題目與詳解一併改寫（同 fix-negative-numbers.js）"""
+    def relabel(option):
+        m = re.match(r"^(-?)(\d+)$", option)
+        if not m:
+            return option
+        if m.group(2) == "0":
+            return "不賺不賠"
+        return f"{'賠' if m.group(1) else '賺'} {m.group(2)} 元"
+
+    def stage(items, stats):
+        for q in items:
+            if (
+                q.get("grade") == 5
+                and ("利潤" in q.get("category", "") or "利潤" in q.get("content", ""))
+                and any(re.match(r"^-\d+$", str(o)) for o in q["options"])
+            ):
+                q = dict(q, options=[relabel(str(o)) for o in q["options"]])
+                q["content"] = q["content"].replace("利潤是多少元", "是賺還是賠？賺或賠多少元")
+                if q.get("explanation"):
+                    explanation = q["explanation"].replace("答案：-", "答案：賠 ", 1)
+                    explanation = re.sub(r"答案：(\d+)\Z", r"答案：賺 \1 元", explanation, count=1)
+                    q["explanation"] = explanation + "\n\n💡 小提醒：利潤為正數是賺錢，利潤為負數是賠錢！"
+                stats["fixed:negative-profit"] += 1
+            yield q
+    return stage
+
+
+def fix_arithmetic():
+    """「計算：… = ?」題自動驗算：答案索引標錯就改正，沒有正確選項就丟掉"""
+    def stage(items, stats):
+        for q in items:
+            status, located = check_arithmetic(q)
+            if status == "wrong-answer":
+                q = dict(q, answer=located)
+                stats["fixed:arithmetic-answer"] += 1
+            elif status == "no-correct-option":
+                stats["rejected:沒有正確選項"] += 1
+                continue
+            yield q
+    return stage
+
+
+def shuffle(seed=0):
+    """打亂選項並平衡正確答案位置（answer_shuffle.AnswerShuffler）"""
+    def stage(items, stats):
+        shuffler = AnswerShuffler(seed=seed)
+        for q in items:
+            yield shuffler(q)
+        for position, n in shuffler.distribution().items():
+            stats[f"answer:{position}"] = n
+    return stage
+
+
+def assign_ids(prefix, floor=0, source=None, block_size=ID_BLOCK_SIZE):
+    """依序編號（向 ID 註冊表分段租用），並把 id 放在第一個欄位"""
+    def stage(items, stats):
+        ids = iter(())
+        for q in items:
+            qid = next(ids, None)
+            if qid is None:
+                ids = iter(lease(prefix, block_size, floor=floor))
+                qid = next(ids)
+            q = {"id": f"{prefix}{qid}", **{k: v for k, v in q.items() if k != "id"}}
+            if source:
+                q["source"] = source
+            stats["assigned"] += 1
+            yield q
+    return stage
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+幾何圖形預先渲染 - 把 geometry-svg-params.json 轉成靜態 SVG 檔
+
+用法：
+  python3 scripts/prerender-geometry.py           # 只渲染新的圖形
+  python3 scripts/prerender-geometry.py --force   # 全部重新渲染
+
+輸出：
+  public/geometry/<hash>.svg              壓縮過的 SVG（檔名為圖形參數的雜湊）
+  src/data/geometry-svg-manifest.json     題目 ID → SVG 路徑與尺寸，GeometryImage.tsx 使用
+
+圖形與 GeometryImage.tsx 的各元件一致。參數相同的圖形只渲染一次，
+已存在的檔案直接沿用；渲染工作分散到多個行程。
+不在新對照表中的舊 SVG（題目已刪除或參數改了）會從 public/geometry/ 移除。
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from bank_io import SCRIPTS_DIR, data_path
+
+PARAMS_PATH = data_path("geometry-svg-params.json")
+MANIFEST_PATH = data_path("geometry-svg-manifest.json")
+OUTPUT_DIR = os.path.join(SCRIPTS_DIR, "..", "public", "geometry")
+URL_PREFIX = "/geometry/"
+
+# 圖形相同、只是題型名稱不同
+TYPE_ALIASES = {"circle_circumference": "circle"}
+
+LABEL = 'font-size="13" fill="#333" font-weight="bold"'
+
+
+def num(x):
+    """數字輸出成最短形式（12.0 → 12，小數取兩位）"""
+    x = round(x, 2)
+    return str(int(x)) if x == int(x) else str(x)
+
+
+def svg(width, height, body):
+    w, h = num(width), num(height)
+    return f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" viewBox="0 0 {w} {h}">{body}</svg>'
+
+
+def rectangle(length, width):
+    w, h = length * 12, width * 12
+    return w + 80, h + 60, (
+        f'<rect x="40" y="20" width="{num(w)}" height="{num(h)}" fill="#a5b4fc" stroke="#4f46e5" stroke-width="3"/>'
+        f'<line x1="40" y1="{num(h + 35)}" x2="{num(40 + w)}" y2="{num(h + 35)}" stroke="#333" stroke-width="2"/>'
+        f'<text x="{num(40 + w / 2)}" y="{num(h + 52)}" text-anchor="middle" {LABEL}>{length} 公分</text>'
+        f'<line x1="25" y1="20" x2="25" y2="{num(20 + h)}" stroke="#333" stroke-width="2"/>'
+        f'<text x="12" y="{num(20 + h / 2 + 5)}" {LABEL}>{width}</text>'
+    )
+
+
+def square(side):
+    s = side * 14
+    return s + 70, s + 60, (
+        f'<rect x="40" y="20" width="{num(s)}" height="{num(s)}" fill="#86efac" stroke="#16a34a" stroke-width="3"/>'
+        f'<line x1="40" y1="{num(s + 35)}" x2="{num(40 + s)}" y2="{num(s + 35)}" stroke="#333" stroke-width="2"/>'
+        f'<text x="{num(40 + s / 2)}" y="{num(s + 52)}" text-anchor="middle" {LABEL}>{side} 公分</text>'
+    )
+
+
+def triangle(base, height):
+    b, h = base * 12, height * 12
+    return b + 80, h + 60, (
+        f'<polygon points="40,{num(h + 20)} {num(40 + b / 2)},20 {num(40 + b)},{num(h + 20)}" fill="#fca5a5" stroke="#dc2626" stroke-width="3"/>'
+        f'<line x1="40" y1="{num(h + 35)}" x2="{num(40 + b)}" y2="{num(h + 35)}" stroke="#333" stroke-width="2"/>'
+        f'<text x="{num(40 + b / 2)}" y="{num(h + 52)}" text-anchor="middle" {LABEL}>{base} 公分</text>'
+        f'<line x1="{num(40 + b / 2)}" y1="20" x2="{num(40 + b / 2)}" y2="{num(h + 20)}" stroke="#333" stroke-width="2" stroke-dasharray="5,3"/>'
+        f'<text x="{num(40 + b / 2 + 15)}" y="{num(h / 2 + 20)}" font-size="12" fill="#333">高 {height}</text>'
+    )
+
+
+def parallelogram(base, height):
+    b, h, offset = base * 12, height * 12, 30
+    return b + offset + 80, h + 60, (
+        f'<polygon points="{num(40 + offset)},20 {num(40 + offset + b)},20 {num(40 + b)},{num(h + 20)} 40,{num(h + 20)}" fill="#c4b5fd" stroke="#7c3aed" stroke-width="3"/>'
+        f'<line x1="40" y1="{num(h + 35)}" x2="{num(40 + b)}" y2="{num(h + 35)}" stroke="#333" stroke-width="2"/>'
+        f'<text x="{num(40 + b / 2)}" y="{num(h + 52)}" text-anchor="middle" {LABEL}>{base} 公分</text>'
+        f'<line x1="{num(40 + offset)}" y1="20" x2="{num(40 + offset)}" y2="{num(h + 20)}" stroke="#333" stroke-width="2" stroke-dasharray="5,3"/>'
+        f'<text x="{num(40 + offset + 12)}" y="{num(h / 2 + 25)}" font-size="12" fill="#333">高 {height}</text>'
+    )
+
+
+def trapezoid(top, bottom, height):
+    t, b, h = top * 12, bottom * 12, height * 12
+    offset = (b - t) / 2
+    return b + 80, h + 70, (
+        f'<polygon points="{num(40 + offset)},20 {num(40 + offset + t)},20 {num(40 + b)},{num(h + 20)} 40,{num(h + 20)}" fill="#fde047" stroke="#ca8a04" stroke-width="3"/>'
+        f'<line x1="{num(40 + offset)}" y1="12" x2="{num(40 + offset + t)}" y2="12" stroke="#333" stroke-width="2"/>'
+        f'<text x="{num(40 + offset + t / 2)}" y="10" text-anchor="middle" font-size="12" fill="#333" font-weight="bold">{top} 公分</text>'
+        f'<line x1="40" y1="{num(h + 35)}" x2="{num(40 + b)}" y2="{num(h + 35)}" stroke="#333" stroke-width="2"/>'
+        f'<text x="{num(40 + b / 2)}" y="{num(h + 52)}" text-anchor="middle" {LABEL}>{bottom} 公分</text>'
+        f'<line x1="{num(40 + b / 2)}" y1="20" x2="{num(40 + b / 2)}" y2="{num(h + 20)}" stroke="#333" stroke-width="2" stroke-dasharray="5,3"/>'
+        f'<text x="{num(40 + b / 2 + 20)}" y="{num(h / 2 + 25)}" font-size="12" fill="#333">{height}</text>'
+    )
+
+
+def circle(radius):
+    r = radius * 10
+    size = r * 2 + 60
+    c = num(size / 2)
+    return size, size, (
+        f'<circle cx="{c}" cy="{c}" r="{num(r)}" fill="#fca5a5" stroke="#dc2626" stroke-width="3"/>'
+        f'<line x1="{c}" y1="{c}" x2="{num(size / 2 + r)}" y2="{c}" stroke="#333" stroke-width="2" stroke-dasharray="5,3"/>'
+        f'<circle cx="{c}" cy="{c}" r="4" fill="#333"/>'
+        f'<text x="{num(size / 2 + r / 2)}" y="{num(size / 2 - 8)}" {LABEL}>{radius} 公分</text>'
+    )
+
+
+def shadow_circle_in_square(side):
+    s = side * 10
+    return s + 60, s + 70, (
+        f'<rect x="30" y="20" width="{num(s)}" height="{num(s)}" fill="#6366f1"/>'
+        f'<circle cx="{num(30 + s / 2)}" cy="{num(20 + s / 2)}" r="{num(s / 2)}" fill="white"/>'
+        f'<rect x="30" y="20" width="{num(s)}" height="{num(s)}" fill="none" stroke="#4f46e5" stroke-width="3"/>'
+        f'<text x="{num(30 + s / 2)}" y="{num(s + 45)}" text-anchor="middle" {LABEL}>{side} 公分</text>'
+        f'<text x="{num(30 + s / 2)}" y="{num(s + 60)}" text-anchor="middle" font-size="11" fill="#666">求紫色陰影面積</text>'
+    )
+
+
+def sector(radius, angle):
+    r = radius * 10
+    size = r + 80
+    cx, cy = 50, size - 30
+    end = -angle * math.pi / 180
+    end_x, end_y = cx + r * math.cos(end), cy + r * math.sin(end)
+    large_arc = 1 if angle > 180 else 0
+    d = f"M{cx} {num(cy)}L{num(cx + r)} {num(cy)}A{num(r)} {num(r)} 0 {large_arc} 0 {num(end_x)} {num(end_y)}Z"
+    return size + 40, size, (
+        f'<path d="{d}" fill="#86efac" stroke="#16a34a" stroke-width="3"/>'
+        f'<text x="{num(cx + r / 2)}" y="{num(cy + 18)}" font-size="12" fill="#333" font-weight="bold">{radius} 公分</text>'
+        f'<text x="{cx + 25}" y="{num(cy - 15)}" font-size="11" fill="#333">{angle}°</text>'
+        f'<circle cx="{cx}" cy="{num(cy)}" r="3" fill="#333"/>'
+    )
+
+
+RENDERERS = {
+    "rectangle": rectangle,
+    "square": square,
+    "triangle": triangle,
+    "parallelogram": parallelogram,
+    "trapezoid": trapezoid,
+    "circle": circle,
+    "shadow_circle_in_square": shadow_circle_in_square,
+    "sector": sector,
+}
+
+
+def figure_key(entry):
+    """圖形參數的雜湊，相同圖形共用同一個檔案"""
+    figure = {"type": TYPE_ALIASES.get(entry["type"], entry["type"]), "params": entry["params"]}
+    canonical = json.dumps(figure, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12], figure
+
+
+def render(figure):
+    width, height, body = RENDERERS[figure["type"]](**figure["params"])
+    return svg(width, height, body), json.loads(num(width)), json.loads(num(height))
+
+
+def render_to_file(item):
+    key, figure = item
+    content, width, height = render(figure)
+    with open(os.path.join(OUTPUT_DIR, f"{key}.svg"), "w", encoding="utf-8") as f:
+        f.write(content)
+    return key, width, height
+
+
+def main():
+    parser = argparse.ArgumentParser(description="預先渲染幾何題 SVG")
+    parser.add_argument("--force", action="store_true", help="忽略已存在的檔案，全部重新渲染")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with open(PARAMS_PATH, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    figures = {}
+    keys_by_id = {}
+    for entry in entries:
+        if entry["type"] not in RENDERERS and entry["type"] not in TYPE_ALIASES:
+            print(f"  ⚠️ 略過未知圖形: {entry['id']} ({entry['type']})")
+            continue
+        key, figure = figure_key(entry)
+        figures[key] = figure
+        keys_by_id[entry["id"]] = key
+
+    # 尺寸記在舊 manifest，沿用的檔案不需重算
+    sizes = {}
+    if os.path.exists(MANIFEST_PATH) and not args.force:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            for m in json.load(f).values():
+                sizes[m["src"][len(URL_PREFIX):-4]] = (m["width"], m["height"])
+
+    todo = [
+        (key, figure) for key, figure in figures.items()
+        if args.force or key not in sizes or not os.path.exists(os.path.join(OUTPUT_DIR, f"{key}.svg"))
+    ]
+    if todo:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for key, width, height in pool.map(render_to_file, todo, chunksize=8):
+                sizes[key] = (width, height)
+
+    manifest = {}
+    for qid, key in sorted(keys_by_id.items()):
+        width, height = sizes[key]
+        manifest[qid] = {"src": f"{URL_PREFIX}{key}.svg", "width": width, "height": height}
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # 清掉已不在對照表中的舊圖形
+    keep = {f"{key}.svg" for key in keys_by_id.values()}
+    removed = 0
+    for name in os.listdir(OUTPUT_DIR):
+        if name.endswith(".svg") and name not in keep:
+            os.remove(os.path.join(OUTPUT_DIR, name))
+            removed += 1
+
+    print(f"圖形 {len(keys_by_id)} 個，不重複 {len(figures)} 個，本次渲染 {len(todo)} 個，移除 {removed} 個舊檔")
+    print(f"SVG 輸出到 public/geometry/，對照表已儲存到 {os.path.basename(MANIFEST_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+題目全文搜尋 - 中文二字詞（bigram）倒排索引
+
+用法：
+  python3 scripts/question_search.py build                 # 建立索引 scripts/question-index.bin
+  python3 scripts/question_search.py search 鹽水           # 題目或詳解提到「鹽水」
+  python3 scripts/question_search.py search 火車 隧道       # 多個詞 = AND
+  python3 scripts/question_search.py search 濃度 --category 濃度問題 --limit 50
+
+斷詞：
+  - 連續中文字切成相鄰二字（「鹽水濃度」→ 鹽水 / 水濃 / 濃度），單一中文字自成一詞
+  - 索引另外收每個中文字的單字詞，查詢單一中文字（如「圓」）時用它
+  - 數字（含小數、分數）整個當一詞：12、0.5、3/4
+  - 英文字母轉小寫成一詞
+查詢時先用倒排表取交集，再以原文確認詞語確實連續出現（不分大小寫）。
+倒排表以差值 + varint 編碼，整個索引檔以 zlib 壓縮。
+"""
+
+import argparse
+import json
+import os
+import re
+import struct
+import time
+import zlib
+
+from bank_io import SCRIPTS_DIR, load_bank
+
+INDEX_PATH = os.path.join(SCRIPTS_DIR, "question-index.bin")
+MAGIC = b"QIDX2"
+
+TOKEN_RE = re.compile(r"[㐀-鿿豈-﫿]+|\d+(?:\.\d+)?(?:/\d+)?|[A-Za-z]+")
+NUMBER_RE = re.compile(r"^\d+(?:\.\d+)?(?:/\d+)?$")
+
+
+def tokenize(text):
+    tokens = []
+    for m in TOKEN_RE.finditer(text or ""):
+        run = m.group()
+        if "㐀" <= run[0] <= "﫿":
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run.lower())
+    return tokens
+
+
+def index_terms(text):
+    """索引用的詞：tokenize 的結果加上每個中文字的單字詞"""
+    terms = set(tokenize(text))
+    for m in TOKEN_RE.finditer(text or ""):
+        if "㐀" <= m.group()[0] <= "﫿":
+            terms.update(m.group())
+    return terms
+
+
+def document_text(q):
+    return f"{q.get('content', '')}\n{q.get('explanation', '')}"
+
+
+def encode_postings(doc_ids):
+    """遞增的文件編號 → 差值 varint"""
+    out = bytearray()
+    prev = 0
+    for d in doc_ids:
+        delta = d - prev
+        prev = d
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(data):
+    result = []
+    value = shift = prev = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        prev += value
+        result.append(prev)
+        value = shift = 0
+    return result
+
+
+def build_index(questions, path=INDEX_PATH):
+    postings = {}
+    for doc, q in enumerate(questions):
+        for token in index_terms(document_text(q)):
+            postings.setdefault(token, []).append(doc)
+
+    blob = bytearray()
+    terms = {}
+    for token in sorted(postings):
+        encoded = encode_postings(postings[token])
+        terms[token] = [len(blob), len(encoded)]
+        blob.extend(encoded)
+
+    header = json.dumps({
+        "docs": [[q["id"], q.get("grade"), q.get("category", ""), q.get("difficulty", "")] for q in questions],
+        "texts": [document_text(q) for q in questions],
+        "terms": terms,
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    payload = struct.pack(">I", len(header)) + header + bytes(blob)
+    with open(path, "wb") as f:
+        f.write(MAGIC + zlib.compress(payload, 9))
+    return len(terms), os.path.getsize(path)
+
+
+class QuestionIndex:
+    def __init__(self, path=INDEX_PATH):
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} 不是題目索引檔（或是舊版索引，請重新 build）")
+        payload = zlib.decompress(data[len(MAGIC):])
+        header_len = struct.unpack(">I", payload[:4])[0]
+        header = json.loads(payload[4:4 + header_len])
+        self.docs = header["docs"]
+        self.texts = header["texts"]
+        self.folded = [t.lower() for t in self.texts]
+        self.terms = header["terms"]
+        self.blob = payload[4 + header_len:]
+
+    def postings(self, token):
+        entry = self.terms.get(token)
+        if not entry:
+            return []
+        offset, length = entry
+        return decode_postings(self.blob[offset:offset + length])
+
+    def search(self, query, category=None, grade=None, limit=None):
+        """以空白分隔的詞全部都要出現（AND），每個詞須連續出現（片語）"""
+        terms = query.split()
+        lists = []
+        for term in terms:
+            tokens = set(tokenize(term))
+            if not tokens:
+                continue
+            lists.extend(self.postings(t) for t in tokens)
+        if not lists:
+            return []
+
+        # 由最短的倒排表開始取交集
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for plist in lists[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(plist)
+
+        phrases = [t.lower() for t in terms if not NUMBER_RE.match(t)]
+        results = []
+        for doc in sorted(candidates):
+            qid, g, cat, difficulty = self.docs[doc]
+            if category and cat != category:
+                continue
+            if grade and g != grade:
+                continue
+            if any(p not in self.folded[doc] for p in phrases):
+                continue
+            results.append({"doc": doc, "id": qid, "grade": g, "category": cat, "difficulty": difficulty})
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def snippet(self, doc_id, query, width=40):
+        text = self.texts[doc_id].replace("\n", " ")
+        term = query.split()[0]
+        pos = max(0, text.lower().find(term.lower()) - width // 2)
+        return text[pos:pos + width]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="題目全文搜尋")
+    parser.add_argument("--index", default=INDEX_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="從題庫建立索引")
+    p_search = sub.add_parser("search", help="搜尋題目")
+    p_search.add_argument("query", nargs="+")
+    p_search.add_argument("--category")
+    p_search.add_argument("--grade", type=int)
+    p_search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        started = time.time()
+        questions = load_bank()
+        n_terms, size = build_index(questions, args.index)
+        print(f"索引 {len(questions)} 題，{n_terms} 個詞，檔案 {size / 1024:.0f} KB（{time.time() - started:.1f} 秒）")
+        print(f"已儲存到 {args.index}")
+        return
+
+    index = QuestionIndex(args.index)
+    query = " ".join(args.query)
+    started = time.perf_counter()
+    results = index.search(query, args.category, args.grade)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print(f"「{query}」共 {len(results)} 題（{elapsed:.2f} ms）")
+    for r in results[:args.limit]:
+        print(f"  {r['id']} | {r['grade']}年級 | {r['category']} | {r['difficulty']}")
+        print(f"    {index.snippet(r['doc'], query)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+出題配額規劃 - 依「年級 × 難度 × 題型」目標分布，一次生成剛好的題數
+
+用法：
+  python3 scripts/quota_planner.py plan.json --dry-run    # 只列出配額分配
+  python3 scripts/quota_planner.py plan.json              # 生成到 questions-planned.json
+  python3 scripts/quota_planner.py plan.json --output batch.json --seed 7
+
+plan.json 範例（weight 為相對比例，category 省略表示任何題型）：
+  {
+    "total": 200,
+    "mix": [
+      {"grade": 5, "difficulty": "easy", "weight": 30},
+      {"grade": 6, "difficulty": "easy", "weight": 30},
+      {"grade": 5, "difficulty": "medium", "weight": 40},
+      {"grade": 6, "difficulty": "medium", "weight": 40},
+      {"grade": 6, "difficulty": "hard", "category": "濃度問題", "weight": 60}
+    ]
+  }
+
+題目來源：
+  - 模板題（generate-balanced-questions.py、generate-more-easy-medium.py、
+    generate-private-school-v2.py / v3.py）：每個格子的容量 = 模板數，已在題庫中的略過
+  - 參數化生成函式（generate-ps-batch.py 的 generate_*）：容量不限，但只產生 hard 題
+配額以最大餘數法取整，總數必定等於 total；容量不足時在生成前就報錯，不會事後補題。
+"""
+
+import argparse
+import json
+import random
+from collections import defaultdict
+
+from answer_shuffle import AnswerShuffler
+from bank_io import QuestionWriter, content_hash, id_sort_key, load_bank, load_script
+from id_allocator import lease
+
+# 模板腳本：(檔名, 題目清單變數, ID 前綴, 起始編號, source)
+TEMPLATE_SCRIPTS = [
+    ("generate-balanced-questions.py", "QUESTION_TEMPLATES", "bal-", 2001, "均衡補充"),
+    ("generate-more-easy-medium.py", "ADDITIONAL_QUESTIONS", "add-", 3000, "均衡補充2"),
+    ("generate-private-school-v2.py", "PRIVATE_SCHOOL_QUESTIONS", "ps2-", 4000, "考私中V2"),
+    ("generate-private-school-v3.py", "MORE_QUESTIONS", "ps3-", 5000, "考私中V3"),
+]
+
+# generate-ps-batch.py 的生成函式 → (題型, 可能的年級)；難度一律 hard
+BATCH_GENERATORS = {
+    "generate_fraction_questions": ("分數進階", (5, 6)),
+    "generate_chicken_rabbit_questions": ("雞兔同籠", (5, 6)),
+    "generate_speed_questions": ("速率問題", (5, 6)),
+    "generate_work_questions": ("工程問題", (5, 6)),
+    "generate_concentration_questions": ("濃度問題", (5, 6)),
+    "generate_age_questions": ("年齡問題", (5, 6)),
+    "generate_profit_questions": ("利潤問題", (5, 6)),
+    "generate_geometry_questions": ("幾何問題", (5, 6)),
+    "generate_sequence_questions": ("數列問題", (6,)),
+    "generate_ratio_questions": ("比例問題", (5, 6)),
+    "generate_logic_questions": ("邏輯推理", (5, 6)),
+    "generate_probability_questions": ("機率問題", (6,)),
+    "generate_mixed_questions": ("綜合應用", (5, 6)),
+}
+BATCH_PREFIX, BATCH_FLOOR, BATCH_SOURCE = "ps-batch-", 6000, "考私中批量"
+
+BANK_FIELDS = ["content", "options", "answer", "grade", "category", "difficulty", "source", "explanation"]
+
+# 生成函式每次呼叫產生的題數，與同一輪未用到的年級存在緩衝區
+DRAW_SIZE = 20
+MAX_DRAWS = 200
+
+
+def largest_remainder(total, weights):
+    """把 total 依權重分成整數，總和剛好是 total（最大餘數法）"""
+    weight_sum = sum(weights.values())
+    if total <= 0 or weight_sum <= 0:
+        return {key: 0 for key in weights}
+    exact = {key: total * w / weight_sum for key, w in weights.items()}
+    counts = {key: int(v) for key, v in exact.items()}
+    short = total - sum(counts.values())
+    for key in sorted(exact, key=lambda k: (counts[k] - exact[k], str(k)))[:short]:
+        counts[key] += 1
+    return counts
+
+
+class TemplatePool:
+    """模板題：每個 (年級, 難度, 題型) 格子有固定數量的題目，不重複使用"""
+
+    def __init__(self, name, templates, prefix, floor, source, exclude, rng):
+        self.name = name
+        self.prefix = prefix
+        self.floor = floor
+        self.source = source
+        self.cells = defaultdict(list)
+        for t in templates:
+            q = dict(t)
+            if content_hash(q) not in exclude:
+                self.cells[(q["grade"], q["difficulty"], q["category"])].append(q)
+        for items in self.cells.values():
+            rng.shuffle(items)
+
+    def capacity(self, cell):
+        return len(self.cells.get(cell, ()))
+
+    def draw(self, cell, n):
+        items = self.cells[cell]
+        taken, self.cells[cell] = items[:n], items[n:]
+        return taken
+
+
+class GeneratorSource:
+    """參數化生成函式：反覆呼叫直到各年級的需求都湊滿，多出來的年級留在緩衝區"""
+
+    def __init__(self, name, fn, category, grades, exclude):
+        self.name = name
+        self.fn = fn
+        self.category = category
+        self.grades = grades
+        self.prefix = BATCH_PREFIX
+        self.floor = BATCH_FLOOR
+        self.source = BATCH_SOURCE
+        self.seen = set(exclude)
+        self.buffer = defaultdict(list)
+
+    def capacity(self, cell):
+        grade, difficulty, category = cell
+        return float("inf") if difficulty == "hard" and category == self.category and grade in self.grades else 0
+
+    def draw(self, cell, n):
+        grade = cell[0]
+        draws = 0
+        while len(self.buffer[grade]) < n:
+            if draws >= MAX_DRAWS:
+                raise RuntimeError(f"{self.name} 生成 {MAX_DRAWS} 輪仍湊不滿 {grade} 年級 {n} 題（參數空間可能不足）")
+            draws += 1
+            for q in self.fn(DRAW_SIZE):
+                h = content_hash(q)
+                if h not in self.seen:
+                    self.seen.add(h)
+                    self.buffer[q["grade"]].append(q)
+        taken, self.buffer[grade] = self.buffer[grade][:n], self.buffer[grade][n:]
+        return taken
+
+
+def load_sources(seed, exclude):
+    rng = random.Random(seed)
+    sources = []
+    for filename, attr, prefix, floor, source in TEMPLATE_SCRIPTS:
+        templates = getattr(load_script(filename), attr)
+        if isinstance(templates, dict):
+            # QUESTION_TEMPLATES 以 "5-easy" 這類鍵分組
+            templates = [
+                dict(t, grade=int(key.split("-")[0]), difficulty=key.split("-")[1])
+                for key, items in templates.items()
+                for t in items
+            ]
+        sources.append(TemplatePool(filename, templates, prefix, floor, source, exclude, rng))
+
+    batch = load_script("generate-ps-batch.py")
+    for fn_name, (category, grades) in BATCH_GENERATORS.items():
+        sources.append(GeneratorSource(fn_name, getattr(batch, fn_name), category, grades, exclude))
+    return sources
+
+
+def expand_cells(entry, sources):
+    """目標列 → 符合條件的格子及各格容量（未指定題型時展開成所有可用題型）"""
+    grade, difficulty, category = entry["grade"], entry["difficulty"], entry.get("category")
+    if category:
+        categories = {category}
+    else:
+        categories = {c for s in sources if isinstance(s, TemplatePool) for (g, d, c) in s.cells if (g, d) == (grade, difficulty)}
+        categories |= {s.category for s in sources if isinstance(s, GeneratorSource) and difficulty == "hard" and grade in s.grades}
+    cells = {}
+    for c in sorted(categories):
+        cell = (grade, difficulty, c)
+        capacity = sum(s.capacity(cell) for s in sources)
+        if capacity:
+            cells[cell] = capacity
+    return cells
+
+
+def plan(target, sources):
+    """目標分布 → [(來源, 格子, 題數)]；容量不足時 raise ValueError"""
+    mix = target["mix"]
+    row_counts = largest_remainder(target["total"], {i: row.get("weight", 1) for i, row in enumerate(mix)})
+
+    cell_counts = defaultdict(int)
+    for i, row in enumerate(mix):
+        need = row_counts[i]
+        if not need:
+            continue
+        cells = expand_cells(row, sources)
+        label = f"{row['grade']} 年級 {row['difficulty']} {row.get('category', '任何題型')}"
+        if not cells:
+            raise ValueError(f"沒有任何來源能出「{label}」")
+        # 未指定題型時平均分配到各題型，有限容量的題型滿了就把剩下的分給其他題型
+        remaining = dict(cells)
+        while need:
+            share = largest_remainder(need, {cell: 1 for cell in remaining})
+            progressed = False
+            for cell, n in share.items():
+                take = min(n, remaining[cell] - cell_counts[cell])
+                if take > 0:
+                    cell_counts[cell] += take
+                    need -= take
+                    progressed = True
+            remaining = {c: cap for c, cap in remaining.items() if cell_counts[c] < cap}
+            if need and (not progressed or not remaining):
+                raise ValueError(f"「{label}」容量不足，還差 {need} 題")
+
+    # 每格先用模板題，不夠再用生成函式
+    assignments = []
+    for cell, n in sorted(cell_counts.items(), key=lambda x: (x[0][0], x[0][1], x[0][2])):
+        for source in sources:
+            take = min(n, source.capacity(cell))
+            if take > 0:
+                assignments.append((source, cell, int(take)))
+                n -= take
+            if not n:
+                break
+    return assignments
+
+
+def generate(assignments, seed):
+    """依配額生成題目，回傳依 ID 排序的題目清單"""
+    random.seed(seed)
+    shuffle = AnswerShuffler(seed=f"plan-{seed}")
+    by_prefix = defaultdict(list)
+    for source, cell, n in assignments:
+        for q in source.draw(cell, n):
+            q = shuffle(q)
+            q["source"] = source.source
+            by_prefix[(source.prefix, source.floor)].append(q)
+
+    questions = []
+    for (prefix, floor), items in by_prefix.items():
+        for qid, q in zip(lease(prefix, len(items), floor=floor, owner="quota_planner"), items):
+            # 欄位順序與題庫相同
+            questions.append({"id": f"{prefix}{qid}", **{k: q[k] for k in BANK_FIELDS if k in q}})
+    questions.sort(key=lambda q: id_sort_key(q["id"]))
+    return questions, shuffle
+
+
+def main():
+    parser = argparse.ArgumentParser(description="依目標分布規劃並生成題目")
+    parser.add_argument("plan", help="目標分布 JSON（見說明）")
+    parser.add_argument("--output", default="questions-planned.json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dry-run", action="store_true", help="只列出配額，不生成")
+    parser.add_argument("--allow-bank-duplicates", action="store_true", help="不排除題庫中已有的題目")
+    args = parser.parse_args()
+
+    with open(args.plan, "r", encoding="utf-8") as f:
+        target = json.load(f)
+
+    exclude = set() if args.allow_bank_duplicates else {content_hash(q) for q in load_bank()}
+    sources = load_sources(args.seed, exclude)
+    try:
+        assignments = plan(target, sources)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+
+    print(f"目標 {target['total']} 題，配額：")
+    for source, (grade, difficulty, category), n in assignments:
+        print(f"  {grade} 年級 | {difficulty} | {category}: {n} 題 ← {source.name}")
+    if args.dry_run:
+        return
+
+    questions, shuffle = generate(assignments, args.seed)
+    with QuestionWriter(args.output) as writer:
+        for q in questions:
+            writer.write(q)
+
+    cells = defaultdict(int)
+    for q in questions:
+        cells[(q["grade"], q["difficulty"])] += 1
+    print(f"\n生成 {len(questions)} 題：" + "，".join(f"{g} 年級 {d} {n}" for (g, d), n in sorted(cells.items())))
+    print(f"正確答案位置: {shuffle.distribution()}")
+    print(f"已儲存到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
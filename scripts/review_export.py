@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+人工審查清單（分檔、增量）- 取代 export-for-review.js 產生的 all-questions-review.txt
+
+用法：
+  python3 scripts/review_export.py                          # 更新 scripts/review/ 下的分檔與 since-last-review.txt
+  python3 scripts/review_export.py --mark-reviewed          # 審完了：把目前的內容記為「已審查」
+  python3 scripts/review_export.py --mark-reviewed 濃度問題  # 只把某些題型記為已審查
+
+輸出（scripts/review/）：
+  - <題型>.txt：每個題型一個檔，格式與 all-questions-review.txt 相同；內容沒變的檔不重寫
+  - since-last-review.txt：上次審查後新增、修改（列出改了哪些欄位）、刪除的題目，審查者只需看這份
+  - review-manifest.json：每題各欄位的雜湊（上次審查時的狀態）與各分檔的雜湊
+
+題庫逐題串流讀取；每題只比對欄位雜湊，沒變的題目不會出現在 since-last-review.txt。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+from bank_io import BANK_FILES, SCRIPTS_DIR, data_path, iter_questions
+
+REVIEW_DIR = os.path.join(SCRIPTS_DIR, "review")
+MANIFEST_NAME = "review-manifest.json"
+DELTA_NAME = "since-last-review.txt"
+# 這些欄位任一改變，題目就要重新審查
+REVIEW_FIELDS = ["content", "options", "answer", "grade", "category", "difficulty", "explanation"]
+EXPLANATION_PREVIEW = 100
+RULE = "─" * 80
+
+
+def letter(i):
+    return chr(ord("A") + i)
+
+
+def field_hashes(q):
+    """各審查欄位的短雜湊"""
+    return {
+        field: hashlib.sha1(json.dumps(q.get(field), ensure_ascii=False).encode("utf-8")).hexdigest()[:10]
+        for field in REVIEW_FIELDS
+    }
+
+
+def render(q, n):
+    """一題的審查格式（同 export-for-review.js）"""
+    answer = q.get("answer", 0)
+    lines = [
+        f"【{n}】{q['id']} | {q.get('grade')}年級 | {q.get('category')} | {q.get('difficulty')}",
+        f"題目: {q.get('content', '')}",
+        "選項:",
+    ]
+    for i, option in enumerate(q.get("options", [])):
+        lines.append(f"  {'✓' if i == answer else ' '} {letter(i)}. {option}")
+    lines.append(f"正確答案: {letter(answer) if isinstance(answer, int) else answer}")
+    explanation = q.get("explanation")
+    if explanation:
+        more = "..." if len(explanation) > EXPLANATION_PREVIEW else ""
+        lines.append(f"解析: {explanation[:EXPLANATION_PREVIEW]}{more}")
+    lines.append(RULE)
+    return "\n".join(lines) + "\n\n"
+
+
+def shard_name(category):
+    """題型 → 檔名（去掉不能當檔名的字元）"""
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", category or "未分類") + ".txt"
+
+
+def load_manifest(review_dir):
+    path = os.path.join(review_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"reviewedAt": None, "reviewed": {}, "shards": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(review_dir, manifest):
+    with open(os.path.join(review_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+class ShardWriter:
+    """累積一個題型的審查內容，內容雜湊與上次相同時不重寫"""
+
+    def __init__(self, category):
+        self.category = category
+        self.blocks = []
+        self.digest = hashlib.sha1()
+
+    def add(self, q):
+        block = render(q, len(self.blocks) + 1)
+        self.blocks.append(block)
+        self.digest.update(block.encode("utf-8"))
+
+    def flush(self, review_dir, previous_hash):
+        """寫檔（有變動時），回傳 (雜湊, 是否重寫)"""
+        digest = self.digest.hexdigest()[:16]
+        path = os.path.join(review_dir, shard_name(self.category))
+        if digest == previous_hash and os.path.exists(path):
+            return digest, False
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"題庫人工審查清單 - {self.category}\n總題數: {len(self.blocks)}\n{'=' * 80}\n\n")
+            f.writelines(self.blocks)
+        return digest, True
+
+
+def export(review_dir=REVIEW_DIR, files=BANK_FILES):
+    """更新分檔與 since-last-review.txt，回傳 (目前各題欄位雜湊, 統計)"""
+    os.makedirs(review_dir, exist_ok=True)
+    manifest = load_manifest(review_dir)
+    reviewed = manifest["reviewed"]
+
+    shards = {}
+    current = {}
+    added, changed = [], []
+    for name in files:
+        if not os.path.exists(data_path(name)):
+            continue
+        for q in iter_questions(data_path(name)):
+            category = q.get("category") or "未分類"
+            shards.setdefault(category, ShardWriter(category)).add(q)
+            hashes = field_hashes(q)
+            current[q["id"]] = hashes
+            old = reviewed.get(q["id"])
+            if old is None:
+                added.append(q)
+            elif old != hashes:
+                changed.append((q, [f for f in REVIEW_FIELDS if old.get(f) != hashes[f]]))
+    removed = sorted(set(reviewed) - set(current))
+
+    shard_hashes = {}
+    rewritten = 0
+    for category, writer in shards.items():
+        file = shard_name(category)
+        shard_hashes[file], wrote = writer.flush(review_dir, manifest["shards"].get(file))
+        rewritten += wrote
+    for file in set(manifest["shards"]) - set(shard_hashes):
+        path = os.path.join(review_dir, file)
+        if os.path.exists(path):
+            os.remove(path)
+
+    write_delta(review_dir, manifest.get("reviewedAt"), added, changed, removed)
+    manifest["shards"] = shard_hashes
+    save_manifest(review_dir, manifest)
+    stats = {
+        "questions": len(current),
+        "shards": len(shards),
+        "rewritten": rewritten,
+        "added": len(added),
+        "changed": len(changed),
+        "removed": len(removed),
+    }
+    return current, stats
+
+
+def write_delta(review_dir, reviewed_at, added, changed, removed):
+    with open(os.path.join(review_dir, DELTA_NAME), "w", encoding="utf-8") as f:
+        f.write("題庫人工審查清單 - 上次審查後的變動\n")
+        f.write(f"上次審查: {reviewed_at or '（尚未審查過）'}\n")
+        f.write(f"新增 {len(added)} 題、修改 {len(changed)} 題、刪除 {len(removed)} 題\n")
+        f.write(f"{'=' * 80}\n\n")
+        n = 0
+        if changed:
+            f.write(f"■ 修改（{len(changed)} 題）\n\n")
+            for q, fields in changed:
+                n += 1
+                f.write(f"修改欄位: {', '.join(fields)}\n")
+                f.write(render(q, n))
+        if added:
+            f.write(f"■ 新增（{len(added)} 題）\n\n")
+            for q in added:
+                n += 1
+                f.write(render(q, n))
+        if removed:
+            f.write(f"■ 刪除（{len(removed)} 題）\n")
+            f.writelines(f"  {qid}\n" for qid in removed)
+
+
+def mark_reviewed(review_dir, current, categories=None):
+    """把目前的內容記為已審查；指定題型時只記這些題型的題目（刪除的題目要全部審完才清掉）"""
+    manifest = load_manifest(review_dir)
+    if categories:
+        wanted = {field_hashes({"category": c})["category"] for c in categories}
+        for qid, hashes in current.items():
+            if hashes["category"] in wanted:
+                manifest["reviewed"][qid] = hashes
+    else:
+        manifest["reviewed"] = dict(current)
+    manifest["reviewedAt"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+    save_manifest(review_dir, manifest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="輸出分題型、增量的人工審查清單")
+    parser.add_argument("--mark-reviewed", nargs="*", metavar="題型", help="把目前內容記為已審查（可只指定部分題型）")
+    parser.add_argument("--dir", default=REVIEW_DIR, help="輸出目錄（預設 scripts/review）")
+    args = parser.parse_args()
+
+    current, stats = export(args.dir)
+    print(f"題庫 {stats['questions']} 題，{stats['shards']} 個題型分檔，重寫 {stats['rewritten']} 個")
+    print(f"上次審查後：新增 {stats['added']} 題、修改 {stats['changed']} 題、刪除 {stats['removed']} 題")
+
+    if args.mark_reviewed is not None:
+        mark_reviewed(args.dir, current, args.mark_reviewed)
+        current, stats = export(args.dir)
+        print(f"已記為審查完成，待審查剩 {stats['added'] + stats['changed'] + stats['removed']} 題")
+    print(f"待審查清單: {os.path.join(os.path.basename(args.dir), DELTA_NAME)}")
+
+
+if __name__ == "__main__":
+    main()
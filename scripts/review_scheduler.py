@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+錯題本間隔複習排程（SM-2）- 每位學生的錯題依下次複習時間放在最小堆積
+
+用法：
+  python3 scripts/review_scheduler.py import-answers answers.csv
+  python3 scripts/review_scheduler.py import-progress progress.json
+  python3 scripts/review_scheduler.py due --user <user_id> [--limit 10]
+  python3 scripts/review_scheduler.py review --user <user_id> --question g5-fr-001 --correct
+
+規則（SM-2）：
+  - 答錯：加入 / 重設排程，隔天複習，熟練度（ease）下降
+  - 答對：間隔 1 天 → 6 天 → 前次間隔 × ease
+  - 間隔超過 MASTERED_DAYS 視為已熟練，移出錯題本
+取得到期題目是 O(k log n)，複習時只碰到期的題目，不用掃整個錯題歷史。
+
+import-answers：SM-2 的結果與作答順序有關，匯出檔依 created_at 排序後才重播（沒有 created_at 的列略過）。
+排序用外部合併排序：每批排好後寫到暫存檔，再以 heapq.merge 合併，記憶體只跟批次大小有關。
+每位學生記下已重播到的最後作答時間（lastApplied），再次匯入時只重播比它新的作答，
+重複匯入同一個檔案或匯入有重疊的匯出檔不會重複計算。
+"""
+
+import argparse
+import heapq
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from bank_io import SCRIPTS_DIR
+from export_reader import DEFAULT_CHUNK_SIZE, iter_chunks, to_bool
+
+SCHEDULE_PATH = os.path.join(SCRIPTS_DIR, "review-schedule.json")
+
+DAY = 86400
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+MASTERED_DAYS = 60
+
+# 每題存成一列：[下次複習時間(秒), 間隔(天), ease, 連續答對次數, 答錯次數]
+DUE, INTERVAL, EASE, REPS, LAPSES = range(5)
+
+
+class StudentSchedule:
+    def __init__(self, items=None, last_applied=None):
+        self.items = items or {}
+        self.last_applied = last_applied  # import-answers 已重播到的最後作答時間
+        self.heap = [(row[DUE], qid) for qid, row in self.items.items()]
+        heapq.heapify(self.heap)
+
+    def _push(self, qid):
+        heapq.heappush(self.heap, (self.items[qid][DUE], qid))
+
+    def _valid(self, entry):
+        """堆積裡可能留有重新排程前的舊紀錄，以 items 為準"""
+        row = self.items.get(entry[1])
+        return row is not None and row[DUE] == entry[0]
+
+    def record_wrong(self, qid, now):
+        row = self.items.get(qid)
+        if row is None:
+            row = self.items[qid] = [0, 0, INITIAL_EASE, 0, 0]
+        row[INTERVAL] = 1
+        row[EASE] = max(MIN_EASE, round(row[EASE] - 0.2, 2))
+        row[REPS] = 0
+        row[LAPSES] += 1
+        row[DUE] = int(now + DAY)
+        self._push(qid)
+
+    def record_correct(self, qid, now, quality=4):
+        """答對（quality 3~5），回傳 False 表示已熟練並移出"""
+        row = self.items.get(qid)
+        if row is None:
+            return False
+        if row[REPS] == 0:
+            interval = 1
+        elif row[REPS] == 1:
+            interval = 6
+        else:
+            interval = round(row[INTERVAL] * row[EASE])
+        row[EASE] = max(MIN_EASE, round(row[EASE] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02), 2))
+        row[REPS] += 1
+        row[INTERVAL] = interval
+
+        if interval > MASTERED_DAYS:
+            del self.items[qid]
+            return False
+        row[DUE] = int(now + interval * DAY)
+        self._push(qid)
+        return True
+
+    def due(self, now, limit=None):
+        """到期題目（最早到期的先），不會改變排程"""
+        result = []
+        popped = []
+        seen = set()
+        while self.heap and (limit is None or len(result) < limit):
+            entry = heapq.heappop(self.heap)
+            if not self._valid(entry) or entry[1] in seen:
+                continue  # 丟掉舊紀錄，以及同一時間重複推入的同一題
+            seen.add(entry[1])
+            popped.append(entry)
+            if entry[0] > now:
+                break
+            result.append(entry[1])
+        for entry in popped:
+            heapq.heappush(self.heap, entry)
+        return result
+
+    def next_due_at(self):
+        while self.heap and not self._valid(self.heap[0]):
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+
+class ReviewScheduler:
+    def __init__(self):
+        self.students = {}
+
+    def student(self, user):
+        if user not in self.students:
+            self.students[user] = StudentSchedule()
+        return self.students[user]
+
+    def record(self, user, qid, correct, now):
+        s = self.student(user)
+        if correct:
+            s.record_correct(qid, now)
+        else:
+            s.record_wrong(qid, now)
+
+    def save(self, path=SCHEDULE_PATH):
+        data = {
+            user: {"items": s.items, "lastApplied": s.last_applied}
+            for user, s in self.students.items()
+            if s.items or s.last_applied is not None
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=SCHEDULE_PATH):
+        scheduler = cls()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for user, entry in json.load(f).items():
+                    if "items" not in entry:  # 舊格式：只有 items
+                        entry = {"items": entry}
+                    scheduler.students[user] = StudentSchedule(entry["items"], entry.get("lastApplied"))
+        return scheduler
+
+    def import_answers(self, path, table="answers", chunk_size=DEFAULT_CHUNK_SIZE):
+        """依 created_at 順序重播 answers 匯出檔，回傳 (重播筆數, 已重播過而略過的筆數, 沒有時間而略過的筆數)"""
+        already = untimed = count = 0
+        # 匯入前各學生已重播到的時間（重播過程中會更新，比對要用匯入前的值）
+        applied = {user: s.last_applied for user, s in self.students.items() if s.last_applied is not None}
+        with tempfile.TemporaryDirectory() as tmp:
+            runs = []
+            for chunk in iter_chunks(path, table, chunk_size):
+                rows = []
+                for row in chunk:
+                    user, qid = row.get("user_id"), row.get("question_id")
+                    if not user or not qid:
+                        continue
+                    if not row.get("created_at"):
+                        untimed += 1
+                        continue
+                    at = parse_time(row["created_at"])
+                    if user in applied and at <= applied[user]:
+                        already += 1
+                        continue
+                    rows.append((at, len(runs), len(rows), user, qid, to_bool(row.get("is_correct"))))
+                if rows:
+                    rows.sort()  # 同一時間的作答依檔案順序（批次編號、批內位置）
+                    run = os.path.join(tmp, f"run-{len(runs)}.jsonl")
+                    with open(run, "w", encoding="utf-8") as f:
+                        f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+                    runs.append(run)
+
+            files = [open(run, "r", encoding="utf-8") for run in runs]
+            try:
+                for at, _, _, user, qid, correct in heapq.merge(*((json.loads(line) for line in f) for f in files)):
+                    self.record(user, qid, correct, at)
+                    self.students[user].last_applied = at
+                    count += 1
+            finally:
+                for f in files:
+                    f.close()
+        return count, already, untimed
+
+
+def parse_time(value):
+    if not value:
+        return time.time()
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="錯題本間隔複習排程")
+    parser.add_argument("--schedule", default=SCHEDULE_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_answers = sub.add_parser("import-answers", help="依時間順序重播 answers 表匯出檔")
+    p_answers.add_argument("input")
+    p_answers.add_argument("--table", default="answers")
+
+    p_progress = sub.add_parser("import-progress", help="匯入 localStorage 的 UserProgress（wrongRecords）")
+    p_progress.add_argument("input")
+
+    p_due = sub.add_parser("due", help="列出到期的錯題")
+    p_due.add_argument("--user", required=True)
+    p_due.add_argument("--limit", type=int, default=10)
+    p_due.add_argument("--at", help="查詢時間（ISO 格式，預設現在）")
+
+    p_review = sub.add_parser("review", help="記錄一次複習結果")
+    p_review.add_argument("--user", required=True)
+    p_review.add_argument("--question", required=True)
+    group = p_review.add_mutually_exclusive_group(required=True)
+    group.add_argument("--correct", action="store_true")
+    group.add_argument("--wrong", action="store_true")
+
+    args = parser.parse_args()
+    scheduler = ReviewScheduler.load(args.schedule)
+
+    if args.command == "import-answers":
+        count, already, untimed = scheduler.import_answers(args.input, args.table)
+        scheduler.save(args.schedule)
+        total = sum(len(s.items) for s in scheduler.students.values())
+        print(f"重播 {count:,} 筆作答，{len(scheduler.students):,} 位學生共 {total:,} 題待複習")
+        if already:
+            print(f"  略過 {already:,} 筆先前已匯入的作答")
+        if untimed:
+            print(f"⚠️ {untimed:,} 筆沒有 created_at，無法排序，已略過")
+
+    elif args.command == "import-progress":
+        with open(args.input, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        progresses = data if isinstance(data, list) else [data]
+        for progress in progresses:
+            s = scheduler.student(progress["odiserId"])
+            for r in progress.get("wrongRecords", []):
+                if r["questionId"] not in s.items:
+                    s.record_wrong(r["questionId"], parse_time(r.get("lastWrongAt")))
+        scheduler.save(args.schedule)
+        print(f"已匯入 {len(progresses)} 位學生的錯題本")
+
+    elif args.command == "due":
+        now = parse_time(args.at)
+        s = scheduler.students.get(args.user)
+        due = s.due(now, args.limit) if s else []
+        print(f"{args.user} 到期錯題 {len(due)} 題：")
+        for qid in due:
+            row = s.items[qid]
+            print(f"  {qid}（答錯 {row[LAPSES]} 次，間隔 {row[INTERVAL]} 天）")
+        if s and not due and s.next_due_at():
+            print(f"下次複習: {datetime.fromtimestamp(s.next_due_at()).isoformat(timespec='minutes')}")
+
+    else:
+        s = scheduler.students.get(args.user)
+        if args.correct and (not s or args.question not in s.items):
+            print(f"{args.question} 不在 {args.user} 的錯題本")
+            return
+        scheduler.record(args.user, args.question, args.correct, time.time())
+        scheduler.save(args.schedule)
+        row = scheduler.student(args.user).items.get(args.question)
+        if row:
+            print(f"{args.question} 下次複習: {datetime.fromtimestamp(row[DUE]).isoformat(timespec='minutes')}")
+        else:
+            print(f"{args.question} 已熟練，移出錯題本")
+
+
+if __name__ == "__main__":
+    main()
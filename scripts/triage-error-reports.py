@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+錯題回報分流 - 串流讀取 error_reports 表匯出檔，依題目與回報內容分組，排出最該先處理的題目
+
+用法：
+  python3 scripts/triage-error-reports.py error_reports.csv
+  python3 scripts/triage-error-reports.py export.db --table error_reports --top 50
+  python3 scripts/triage-error-reports.py error_reports.jsonl --answer-stats scripts/answer-stats.json --rank rate
+  python3 scripts/triage-error-reports.py error_reports.csv --include-resolved --ids-output flagged-ids.txt
+
+分組：
+  - 依題目：回報數、各錯誤類型（wrong_answer / typo …）數、學生建議的正確答案
+  - 依回報內容：說明文字正規化（全半形、大小寫、空白標點）後取雜湊，相同說明只存一份範例
+排序：
+  - volume：回報數
+  - rate：回報數 ÷ 作答數（作答數來自 analyze-answers.py 的 answer-stats.json，作答太少的題目不列入）
+前幾名題目直接用 arith.py、number_theory.py、check-explanation-answers.py 的檢查驗算，
+並比對學生建議的答案是否是另一個選項，結果寫在報告的 checks / suggestedOption。
+每批資料先在批次內計數再合併，記憶體只跟題目數與不同說明數有關，與回報筆數無關。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+
+from arith import check_question as check_arithmetic
+from bank_io import SCRIPTS_DIR, load_bank, load_script, normalize_text
+from export_reader import DEFAULT_CHUNK_SIZE, iter_chunks
+from number_theory import check_question as check_number_theory
+
+REPORT_PATH = os.path.join(SCRIPTS_DIR, "error-triage.json")
+# 視為已處理、預設不計入的狀態
+CLOSED_STATUSES = {"resolved", "rejected", "dismissed", "fixed"}
+MIN_ATTEMPTS = 20
+EXAMPLE_LENGTH = 80
+PUNCTUATION_RE = re.compile(r"[\s\W_]+")
+# 驗算工具回報「有問題」的狀態（skip / ok / 無法判斷的不列出）
+FLAGGED_STATUSES = {"wrong-answer", "no-correct-option", "ambiguous", "mismatch", "letter"}
+VERIFIERS = (
+    ("arith", check_arithmetic),
+    ("numberTheory", check_number_theory),
+    ("explanation", load_script("check-explanation-answers.py").check_question),
+)
+
+
+def normalize_report(text):
+    """回報說明正規化：全形轉半形、小寫、去掉空白與標點"""
+    return PUNCTUATION_RE.sub("", unicodedata.normalize("NFKC", text or "").lower())
+
+
+def text_key(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+class QuestionReports:
+    __slots__ = ("count", "types", "suggested", "texts")
+
+    def __init__(self):
+        self.count = 0
+        self.types = Counter()
+        self.suggested = Counter()
+        self.texts = Counter()
+
+
+def aggregate_chunk(chunk, include_resolved):
+    """批次內先分組計數：{題目: (回報數, 類型, 建議答案, 說明雜湊)}，以及各說明雜湊的範例"""
+    by_question = defaultdict(QuestionReports)
+    examples = {}
+    skipped = 0
+    for row in chunk:
+        qid = row.get("question_id")
+        if not qid:
+            continue
+        if not include_resolved and (row.get("status") or "pending") in CLOSED_STATUSES:
+            skipped += 1
+            continue
+        r = by_question[qid]
+        r.count += 1
+        r.types[row.get("error_type") or "other"] += 1
+        suggested = normalize_text(row.get("correct_answer"))
+        if suggested:
+            r.suggested[suggested] += 1
+        text = normalize_report(row.get("description"))
+        if text:
+            key = text_key(text)
+            r.texts[key] += 1
+            examples.setdefault(key, (row.get("description") or "").strip()[:EXAMPLE_LENGTH])
+    return by_question, examples, skipped
+
+
+def triage(path, table="error_reports", chunk_size=DEFAULT_CHUNK_SIZE, include_resolved=False):
+    questions = defaultdict(QuestionReports)
+    text_totals = Counter()
+    examples = {}
+    total = skipped = 0
+    for chunk in iter_chunks(path, table, chunk_size):
+        total += len(chunk)
+        by_question, chunk_examples, chunk_skipped = aggregate_chunk(chunk, include_resolved)
+        skipped += chunk_skipped
+        for qid, r in by_question.items():
+            q = questions[qid]
+            q.count += r.count
+            q.types.update(r.types)
+            q.suggested.update(r.suggested)
+            q.texts.update(r.texts)
+            text_totals.update(r.texts)
+        for key, example in chunk_examples.items():
+            examples.setdefault(key, example)
+        print(f"  已處理 {total:,} 筆...")
+    return total, skipped, questions, text_totals, examples
+
+
+def load_attempts(path):
+    """answer-stats.json → {題目: 作答數}"""
+    with open(path, "r", encoding="utf-8") as f:
+        return {qid: s["answered"] for qid, s in json.load(f)["questions"].items()}
+
+
+def verify(q, suggested):
+    """用現有的驗算工具檢查題目，並找出學生建議答案對應的選項"""
+    checks = {}
+    for name, check in VERIFIERS:
+        status, _ = check(q)
+        if status in FLAGGED_STATUSES:
+            checks[name] = status
+    options = [normalize_text(o) for o in q.get("options", [])]
+    letters = [chr(ord("A") + i) for i in range(len(options))]
+    for answer, _ in suggested.most_common(3):
+        # 學生可能填選項內容，也可能只填字母
+        if answer in options:
+            index = options.index(answer)
+        elif answer.upper() in letters:
+            index = letters.index(answer.upper())
+        else:
+            continue
+        return checks, (letters[index] if index != q.get("answer") else None)
+    return checks, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="錯題回報分流")
+    parser.add_argument("input", help="error_reports 匯出檔（.csv / .jsonl / .db）")
+    parser.add_argument("--table", default="error_reports", help="SQLite 表名（預設 error_reports）")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--include-resolved", action="store_true", help="已處理的回報也計入")
+    parser.add_argument("--answer-stats", help="analyze-answers.py 的 answer-stats.json（計算回報率用）")
+    parser.add_argument("--rank", choices=["volume", "rate"], default="volume")
+    parser.add_argument("--min-attempts", type=int, default=MIN_ATTEMPTS, help="依回報率排序時最少作答數")
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument("--output", default=REPORT_PATH)
+    parser.add_argument("--ids-output", help="前幾名題目 ID（一行一個）")
+    args = parser.parse_args()
+    if args.rank == "rate" and not args.answer_stats:
+        raise SystemExit("❌ --rank rate 需要 --answer-stats")
+
+    started = time.time()
+    print(f"讀取 {args.input}...")
+    total, skipped, questions, text_totals, examples = triage(
+        args.input, args.table, args.chunk_size, args.include_resolved
+    )
+    attempts = load_attempts(args.answer_stats) if args.answer_stats else {}
+
+    def rate(qid):
+        n = attempts.get(qid, 0)
+        return questions[qid].count / n if n else None
+
+    if args.rank == "rate":
+        candidates = [qid for qid in questions if attempts.get(qid, 0) >= args.min_attempts]
+        ranked = sorted(candidates, key=lambda qid: (-rate(qid), -questions[qid].count, qid))
+    else:
+        ranked = sorted(questions, key=lambda qid: (-questions[qid].count, qid))
+
+    bank = {q["id"]: q for q in load_bank()}
+    top = []
+    for qid in ranked[:args.top]:
+        r = questions[qid]
+        entry = {
+            "id": qid,
+            "reports": r.count,
+            "attempts": attempts.get(qid),
+            "reportRate": round(rate(qid), 4) if rate(qid) is not None else None,
+            "types": dict(r.types.most_common()),
+            "suggestedAnswers": dict(r.suggested.most_common(5)),
+            "topTexts": [{"text": examples[k], "count": n} for k, n in r.texts.most_common(3)],
+        }
+        q = bank.get(qid)
+        if q is None:
+            entry["inBank"] = False
+        else:
+            entry["checks"], entry["suggestedOption"] = verify(q, r.suggested)
+            entry["category"] = q.get("category")
+        top.append(entry)
+
+    report = {
+        "generatedAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source": os.path.basename(args.input),
+        "totalReports": total,
+        "skippedResolved": skipped,
+        "questionsReported": len(questions),
+        "rankedBy": args.rank,
+        "top": top,
+        "commonTexts": [{"text": examples[k], "count": n} for k, n in text_totals.most_common(20)],
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.ids_output:
+        with open(args.ids_output, "w", encoding="utf-8") as f:
+            f.writelines(e["id"] + "\n" for e in top)
+
+    print(f"\n回報 {total:,} 筆（略過已處理 {skipped:,} 筆），涉及 {len(questions)} 題")
+    print(f"依{'回報率' if args.rank == 'rate' else '回報數'}排序前 {len(top)} 題:")
+    for e in top:
+        flags = [f"{k}:{v}" for k, v in e.get("checks", {}).items()]
+        if e.get("suggestedOption"):
+            flags.append(f"建議選項 {e['suggestedOption']}")
+        if e.get("inBank") is False:
+            flags.append("題庫中沒有此題")
+        shown = f"{e['reports']} 筆" + (f"（{e['reportRate']:.1%}）" if e["reportRate"] is not None else "")
+        main_type = next(iter(e["types"]), "")
+        print(f"  {e['id']}: {shown} {main_type} {' '.join(flags)}")
+    print(f"\n已儲存到 {args.output}（{time.time() - started:.1f} 秒）")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,7 @@ import { playCorrectSound, playWrongSound, playStreakSound, playAchievementSound
 import { QuestionImage, hasImage } from '@/components/QuestionImage';
 import { GeometryImage, hasGeometryImage } from '@/components/GeometryImage';
 import ErrorReport from '@/components/ErrorReport';
-import questionsData from '@/data/questions.json';
-import geometryData from '@/data/questions-geometry.json';
+import { loadQuestions } from '@/lib/bank';
 
 interface Question {
   id: string;
@@ -59,6 +58,9 @@ function QuizContent() {
   const [currentQuestionTime, setCurrentQuestionTime] = useState(0);
   const [newAchievements, setNewAchievements] = useState<Achievement[]>([]);
   const [bookmarked, setBookmarked] = useState(false);
+  const [pool, setPool] = useState<Question[]>([]);
+  const [loadError, setLoadError] = useState(false);
+  const [reloadKey, setReloadKey] = useState(0);
 
   // 計時器
   useEffect(() => {
@@ -96,63 +98,73 @@ function QuizContent() {
     setUser(currentUser);
 
     if (questionCount > 0) {
-      // 合併所有題庫（主題庫 + 幾何圖形題）
-      const allQuestions = [...questionsData.questions, ...geometryData.questions];
-      
-      // 篩選題目並隨機排序
+      // 只下載需要的年級（與題型）分包，不把整個題庫打包進頁面
       // 弱點練習時不限年級，一般練習按年級篩選
-      let filtered = focusParam === 'weak' 
-        ? allQuestions.filter((q: Question) => q.grade === 5 || q.grade === 6)
-        : allQuestions.filter((q: Question) => q.grade === grade);
-      
-      // 進階挑戰模式篩選（預設排除進階題目）
-      if (!challengeMode) {
-        filtered = filtered.filter((q: Question) => !q.isAdvanced);
-      }
-      
-      // 難度篩選
-      if (difficulty === 'easy') {
-        filtered = filtered.filter((q: Question) => q.difficulty === 'medium' || q.difficulty === 'easy');
-      } else if (difficulty === 'hard') {
-        filtered = filtered.filter((q: Question) => q.difficulty === 'hard');
-      }
-      
-      // 題型篩選
-      if (categoriesParam) {
-        const allowedCategories = categoriesParam.split(',');
-        filtered = filtered.filter((q: Question) => allowedCategories.includes(q.category));
-      }
-      
-      // 弱點練習：優先選用戶弱點題型的題目
-      if (focusParam === 'weak' && currentUser) {
-        const weakCats = getWeakCategories(currentUser.id, 5); // 取前5個弱點
-        if (weakCats.length > 0) {
-          const weakCatNames = weakCats.map(c => c.category);
-          const weakFiltered = filtered.filter((q: Question) => weakCatNames.includes(q.category));
-          // 如果弱點題目夠多就只用弱點題，不夠就混合
-          if (weakFiltered.length >= questionCount) {
-            filtered = weakFiltered;
-          } else if (weakFiltered.length > 0) {
-            // 弱點題優先，不夠再補其他題
-            const otherFiltered = filtered.filter((q: Question) => !weakCatNames.includes(q.category));
-            filtered = [...weakFiltered, ...otherFiltered.slice(0, questionCount - weakFiltered.length)];
+      const grades = focusParam === 'weak' ? [5, 6] : [grade];
+      const wantedCategories = categoriesParam ? categoriesParam.split(',') : undefined;
+      let cancelled = false;
+      setLoadError(false);
+      Promise.all(grades.map(g => loadQuestions<Question>(g, wantedCategories))).then(parts => {
+        if (cancelled) return;
+        const allQuestions = parts.flat();
+        setPool(allQuestions);
+
+        // 篩選題目並隨機排序
+        let filtered = allQuestions;
+
+        // 進階挑戰模式篩選（預設排除進階題目）
+        if (!challengeMode) {
+          filtered = filtered.filter((q: Question) => !q.isAdvanced);
+        }
+
+        // 難度篩選
+        if (difficulty === 'easy') {
+          filtered = filtered.filter((q: Question) => q.difficulty === 'medium' || q.difficulty === 'easy');
+        } else if (difficulty === 'hard') {
+          filtered = filtered.filter((q: Question) => q.difficulty === 'hard');
+        }
+
+        // 題型篩選
+        if (categoriesParam) {
+          const allowedCategories = categoriesParam.split(',');
+          filtered = filtered.filter((q: Question) => allowedCategories.includes(q.category));
+        }
+
+        // 弱點練習：優先選用戶弱點題型的題目
+        if (focusParam === 'weak' && currentUser) {
+          const weakCats = getWeakCategories(currentUser.id, 5); // 取前5個弱點
+          if (weakCats.length > 0) {
+            const weakCatNames = weakCats.map(c => c.category);
+            const weakFiltered = filtered.filter((q: Question) => weakCatNames.includes(q.category));
+            // 如果弱點題目夠多就只用弱點題，不夠就混合
+            if (weakFiltered.length >= questionCount) {
+              filtered = weakFiltered;
+            } else if (weakFiltered.length > 0) {
+              // 弱點題優先，不夠再補其他題
+              const otherFiltered = filtered.filter((q: Question) => !weakCatNames.includes(q.category));
+              filtered = [...weakFiltered, ...otherFiltered.slice(0, questionCount - weakFiltered.length)];
+            }
           }
         }
-      }
-      
-      const gradeQuestions = filtered
-        .sort(() => Math.random() - 0.5)
-        .slice(0, questionCount);
-      
-      setQuestions(gradeQuestions);
-      setShowCountSelector(false);
-      
-      // 檢查第一題的收藏狀態
-      if (currentUser && gradeQuestions[0]) {
-        setBookmarked(isBookmarked(currentUser.id, gradeQuestions[0].id));
-      }
+
+        const gradeQuestions = filtered
+          .sort(() => Math.random() - 0.5)
+          .slice(0, questionCount);
+
+        setQuestions(gradeQuestions);
+        setShowCountSelector(false);
+
+        // 檢查第一題的收藏狀態
+        if (currentUser && gradeQuestions[0]) {
+          setBookmarked(isBookmarked(currentUser.id, gradeQuestions[0].id));
+        }
+      }).catch(err => {
+        console.error('Load questions error:', err);
+        if (!cancelled) setLoadError(true);
+      });
+      return () => { cancelled = true; };
     }
-  }, [grade, router, questionCount, difficulty, categoriesParam, focusParam, challengeMode]);
+  }, [grade, router, questionCount, difficulty, categoriesParam, focusParam, challengeMode, reloadKey]);
 
   // 儲存排行榜 & 檢查成就（必須在所有條件式 return 之前）
   useEffect(() => {
@@ -199,7 +211,6 @@ function QuizContent() {
 
   const startWithCount = (count: number) => {
     setQuestionCount(count);
-    setShowCountSelector(false);
   };
 
   const currentQuestion = questions[currentIndex];
@@ -292,7 +303,7 @@ function QuizContent() {
 
   const handleRestart = () => {
     // 重新隨機排序題目
-    const gradeQuestions = questionsData.questions
+    const gradeQuestions = pool
       .filter((q: Question) => q.grade === grade)
       .sort(() => Math.random() - 0.5)
       .slice(0, 10);
@@ -314,6 +325,31 @@ function QuizContent() {
     );
   }
 
+  // 題庫分包載入失敗（例如 public/bank/ 尚未產生或網路中斷）
+  if (loadError) {
+    return (
+      <main className="min-h-screen bg-gradient-to-br from-blue-500 to-purple-600 flex items-center justify-center p-4">
+        <div className="bg-white rounded-2xl shadow-xl p-8 w-full max-w-md text-center">
+          <div className="text-5xl mb-4">⚠️</div>
+          <h1 className="text-xl font-bold text-gray-800 mb-2">題目載入失敗</h1>
+          <p className="text-gray-500 mb-6">請檢查網路連線後再試一次</p>
+          <button
+            onClick={() => setReloadKey(k => k + 1)}
+            className="w-full py-3 bg-blue-500 hover:bg-blue-600 text-white rounded-xl font-medium transition"
+          >
+            🔄 重新載入
+          </button>
+          <button
+            onClick={() => router.push('/')}
+            className="w-full mt-3 py-3 text-gray-500 hover:text-gray-700 transition"
+          >
+            ← 返回首頁
+          </button>
+        </div>
+      </main>
+    );
+  }
+
   // 選擇題數和難度
   if (showCountSelector) {
     return (
@@ -2,12 +2,16 @@
 
 /* eslint-disable @typescript-eslint/no-explicit-any */
 import svgParams from '@/data/geometry-svg-params.json';
+import svgManifest from '@/data/geometry-svg-manifest.json';
 
 const paramsMap: Record<string, any> = {};
 (svgParams as any[]).forEach(p => {
   paramsMap[p.id] = p;
 });
 
+// 預先渲染好的靜態 SVG（scripts/prerender-geometry.py 產生）
+const prerendered: Record<string, { src: string; width: number; height: number }> = svgManifest;
+
 export function hasGeometryImage(questionId: string): boolean {
   return questionId in paramsMap;
 }
@@ -16,6 +20,16 @@ export function GeometryImage({ questionId }: { questionId: string }) {
   const data = paramsMap[questionId];
   if (!data) return null;
 
+  const image = prerendered[questionId];
+  if (image) {
+    return (
+      <div className={containerClass}>
+        {/* eslint-disable-next-line @next/next/no-img-element */}
+        <img src={image.src} width={image.width} height={image.height} alt="幾何圖形" />
+      </div>
+    );
+  }
+
   const { type, params } = data;
 
   switch (type) {
@@ -0,0 +1,57 @@
+// 題庫分包載入（分包由 scripts/build-bank-bundles.py 產生於 public/bank/）
+
+export interface BankChunk {
+  grade: number;
+  category: string;
+  count: number;
+  file: string;
+  hash: string;
+  bytes: number;
+  gzipBytes: number;
+  brotliBytes?: number;
+}
+
+export interface BankManifest {
+  version: string;
+  total: number;
+  chunks: BankChunk[];
+}
+
+let manifestPromise: Promise<BankManifest> | null = null;
+const chunkCache = new Map<string, Promise<unknown[]>>();
+
+export function getBankManifest(): Promise<BankManifest> {
+  if (!manifestPromise) {
+    manifestPromise = fetch('/bank/manifest.json').then(res => {
+      if (!res.ok) throw new Error(`manifest 載入失敗: ${res.status}`);
+      return res.json();
+    });
+    manifestPromise.catch(() => { manifestPromise = null; });
+  }
+  return manifestPromise;
+}
+
+function loadChunk(chunk: BankChunk): Promise<unknown[]> {
+  let cached = chunkCache.get(chunk.hash);
+  if (!cached) {
+    cached = fetch(chunk.file)
+      .then(res => {
+        if (!res.ok) throw new Error(`分包載入失敗: ${chunk.file}`);
+        return res.json();
+      })
+      .then(data => data.questions);
+    chunkCache.set(chunk.hash, cached);
+    cached.catch(() => chunkCache.delete(chunk.hash));
+  }
+  return cached;
+}
+
+// 只載入指定年級（與題型）的分包
+export async function loadQuestions<T = unknown>(grade: number, categories?: string[]): Promise<T[]> {
+  const manifest = await getBankManifest();
+  const wanted = manifest.chunks.filter(c =>
+    c.grade === grade && (!categories || categories.length === 0 || categories.includes(c.category))
+  );
+  const parts = await Promise.all(wanted.map(loadChunk));
+  return parts.flat() as T[];
+}